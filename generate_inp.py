@@ -2,29 +2,13 @@
 import re
 import pandas as pd
 
+from utils import read_csv_file
+
 def update_year_in_csv_file(input_file, output_file, target_year):
     """更新CSV文件中的年份到目标年份"""
-    # 尝试多种编码读取CSV文件
-    encodings = ['utf-8', 'gbk', 'gb2312', 'utf-8-sig', 'cp936', 'iso-8859-1']
-    df = None
-    used_encoding = None
-    
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(input_file, na_filter=False, encoding=encoding)
-            used_encoding = encoding
-            print(f"成功使用 {encoding} 编码读取CSV文件")
-            break
-        except UnicodeDecodeError as e:
-            print(f"尝试 {encoding} 编码失败: {e}")
-            continue
-        except Exception as e:
-            print(f"使用 {encoding} 编码读取失败: {e}")
-            continue
-    
-    if df is None:
-        raise Exception(f"无法读取CSV文件，已尝试编码: {', '.join(encodings)}")
-    
+    # 文件只读取、解码一次，所有列按文本读取
+    df, used_encoding = read_csv_file(input_file, na_filter=False, dtype=str)
+    print(f"成功使用 {used_encoding} 编码读取CSV文件")
     
     # 计算当前年份（假设从2024开始）
     current_year = 2024
@@ -8,20 +8,33 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
 import os
+import argparse
+import threading
+import multiprocessing
 from loguru import logger
 
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from models import DatabaseManager
-from utils import get_database_url
-from pages import (
-    InputPage, 
-    InputManagementPage, 
-    DataCrawlPage, 
-    DataManagementPage,
-    BatchImportPage
-)
+# 启动计时从这里开始，之后的导入和页面创建都会计入启动耗时报告
+from utils import get_database_settings, startup_timer
+
+with startup_timer.measure("导入 models"):
+    from models import DatabaseManager, run_maintenance, format_maintenance_report
+
+# 页面模块在打开对应标签页时才导入（见 pages/__init__.py）
+import pages
+from pages.utils.crawl_log import is_crawl_log
+
+
+# 标签页：(页面属性名, 页面类名, 标签文本)，页面在首次切换到该标签页时创建
+PAGE_TABS = [
+    ('input_page', 'InputPage', "输入"),
+    ('input_management_page', 'InputManagementPage', "输入管理"),
+    ('batch_import_page', 'BatchImportPage', "批量导入"),
+    ('data_crawl_page', 'DataCrawlPage', "数据爬取"),
+    ('data_management_page', 'DataManagementPage', "数据管理"),
+]
 
 
 class FootballDataApp:
@@ -30,8 +43,10 @@ class FootballDataApp:
     def __init__(self):
         """初始化应用程序"""
         self.setup_logging()
-        self.setup_database()
-        self.setup_ui()
+        with startup_timer.measure("初始化数据库"):
+            self.setup_database()
+        with startup_timer.measure("创建主窗口"):
+            self.setup_ui()
         
     def setup_logging(self):
         """配置日志系统"""
@@ -41,6 +56,8 @@ class FootballDataApp:
             retention="30 days",
             level="INFO",
             format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+            # 爬取日志单独写入 logs/crawl/（见 pages/utils/crawl_log.py）
+            filter=lambda record: not is_crawl_log(record),
             encoding="utf-8"
         )
         logger.info("应用程序启动")
@@ -48,7 +65,7 @@ class FootballDataApp:
     def setup_database(self):
         """初始化数据库"""
         try:
-            self.db_manager = DatabaseManager(get_database_url())
+            self.db_manager = DatabaseManager(**get_database_settings())
             self.db_manager.create_tables()
             logger.info("数据库初始化成功")
         except Exception as e:
@@ -141,34 +158,55 @@ class FootballDataApp:
         self.db_status_label.pack(side=tk.RIGHT, padx=(0, 5))
         
     def create_notebook(self):
-        """创建标签页容器和各个页面"""
+        """创建标签页容器，页面在首次切换到对应标签页时才创建"""
         # 创建 Notebook 容器
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        # 各标签页先放置空容器
+        self.tab_frames = []
+        for attr_name, _, tab_text in PAGE_TABS:
+            setattr(self, attr_name, None)
+            tab_frame = ttk.Frame(self.notebook)
+            self.notebook.add(tab_frame, text=tab_text, padding=5)
+            self.tab_frames.append(tab_frame)
+        
+        # 绑定标签页切换事件
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        
+        # 创建默认显示的第一个页面
+        self.ensure_page(0)
+        
+    def ensure_page(self, index):
+        """
+        确保标签页对应的页面已创建
+        
+        Returns:
+            tuple: (页面实例, 本次是否新创建)，创建失败时页面为 None
+        """
+        attr_name, class_name, tab_text = PAGE_TABS[index]
+        page = getattr(self, attr_name)
+        if page is not None:
+            return page, False
+        
+        first_record = len(startup_timer.records)
         try:
-            # 创建各个页面
-            self.input_page = InputPage(self.notebook, self.db_manager)
-            self.input_management_page = InputManagementPage(self.notebook, self.db_manager)
-            self.batch_import_page = BatchImportPage(self.notebook, self.db_manager)
-            self.data_crawl_page = DataCrawlPage(self.notebook, self.db_manager)
-            self.data_management_page = DataManagementPage(self.notebook, self.db_manager)
-            
-            # 添加标签页
-            self.notebook.add(self.input_page.frame, text="输入", padding=5)
-            self.notebook.add(self.input_management_page.frame, text="输入管理", padding=5)
-            self.notebook.add(self.batch_import_page.frame, text="批量导入", padding=5)
-            self.notebook.add(self.data_crawl_page.frame, text="数据爬取", padding=5)
-            self.notebook.add(self.data_management_page.frame, text="数据管理", padding=5)
-            
-            # 绑定标签页切换事件
-            self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
-            
-            logger.info("所有页面创建成功")
-            
+            with startup_timer.measure(f"导入 {class_name}"):
+                page_class = getattr(pages, class_name)
+            with startup_timer.measure(f"创建 {tab_text} 页面"):
+                page = page_class(self.tab_frames[index], self.db_manager)
+                # 页面框架直接填满标签页（边距由标签页的 padding 提供）
+                page.frame.pack_configure(padx=0, pady=0)
+            with startup_timer.measure(f"绘制 {tab_text} 页面"):
+                self.root.update_idletasks()
         except Exception as e:
-            logger.error(f"页面创建失败: {e}")
+            logger.error(f"页面创建失败 ({tab_text}): {e}")
             messagebox.showerror("错误", f"页面初始化失败：{str(e)}")
+            return None, False
+        
+        setattr(self, attr_name, page)
+        logger.info(startup_timer.format_report(startup_timer.records[first_record:], title=f"页面 {tab_text} 加载耗时"))
+        return page, True
             
     def on_tab_changed(self, event):
         """标签页切换事件处理"""
@@ -179,18 +217,23 @@ class FootballDataApp:
         try:
             current_tab_index = self.notebook.index(selected_tab)
             
+            # 首次打开的页面在创建时已加载数据，无需再刷新
+            page, created = self.ensure_page(current_tab_index)
+            
             # 根据标签页索引调用相应页面的刷新方法
-            if current_tab_index == 1:  # 输入管理页面
-                if hasattr(self, 'input_management_page') and hasattr(self.input_management_page, 'refresh_data'):
-                    self.input_management_page.refresh_data()
+            if page is None or created:
+                pass
+            elif current_tab_index == 1:  # 输入管理页面
+                if hasattr(page, 'refresh_data'):
+                    page.refresh_data()
                     logger.debug("已刷新输入管理页面任务列表")
             elif current_tab_index == 3:  # 数据爬取页面
-                if hasattr(self, 'data_crawl_page') and hasattr(self.data_crawl_page, 'refresh_task_list'):
-                    self.data_crawl_page.refresh_task_list()
+                if hasattr(page, 'refresh_task_list'):
+                    page.refresh_task_list()
                     logger.debug("已刷新数据爬取页面任务列表")
             elif current_tab_index == 4:  # 数据管理页面
-                if hasattr(self, 'data_management_page') and hasattr(self.data_management_page, 'refresh_task_data'):
-                    self.data_management_page.refresh_task_data()
+                if hasattr(page, 'refresh_task_data'):
+                    page.refresh_task_data()
                     logger.debug("已刷新数据管理页面任务列表")
                     
         except Exception as e:
@@ -223,21 +266,80 @@ class FootballDataApp:
         self.update_status("导出数据")
         
     def database_management(self):
-        """数据库管理"""
-        try:
-            with self.db_manager.get_session() as session:
-                from models import Task, Team
-                
-                task_count = session.query(Task).count()
-                team_count = session.query(Team).count()
-                
-                info_text = f"数据库统计信息:\\n\\n任务数量: {task_count}\\n队伍数量: {team_count}\\n数据库文件: data.db\\n\\n数据库状态: 正常"
-                
-                messagebox.showinfo("数据库管理", info_text)
-                
-        except Exception as e:
-            logger.error(f"数据库管理操作失败: {e}")
-            messagebox.showerror("错误", f"数据库操作失败：{str(e)}")
+        """数据库管理：扫描孤立数据、清理过期快照并整理存储空间"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("数据库管理")
+        dialog.geometry("640x520")
+        dialog.transient(self.root)
+        
+        content = ttk.Frame(dialog, padding=10)
+        content.pack(fill=tk.BOTH, expand=True)
+        
+        report_text = tk.Text(content, wrap=tk.WORD, height=20)
+        scrollbar = ttk.Scrollbar(content, orient=tk.VERTICAL, command=report_text.yview)
+        report_text.configure(yscrollcommand=scrollbar.set)
+        
+        options_frame = ttk.Frame(content)
+        options_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        report_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        full_vacuum_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            options_frame, text="完整 VACUUM（耗时较长，重建整个数据库文件）", variable=full_vacuum_var
+        ).pack(side=tk.LEFT)
+        
+        status_label = ttk.Label(options_frame, text="")
+        buttons = []
+        
+        def show_report(text):
+            report_text.config(state='normal')
+            report_text.delete(1.0, tk.END)
+            report_text.insert(tk.END, text)
+            report_text.config(state='disabled')
+        
+        def update_progress(message):
+            if dialog.winfo_exists():
+                status_label.config(text=message)
+        
+        def finish(text):
+            if not dialog.winfo_exists():
+                return
+            show_report(text)
+            status_label.config(text="")
+            for button in buttons:
+                button.config(state='normal')
+        
+        def worker(dry_run, full_vacuum):
+            try:
+                report = run_maintenance(
+                    self.db_manager, dry_run=dry_run, full_vacuum=full_vacuum,
+                    progress_callback=lambda message: self.root.after(0, lambda: update_progress(message))
+                )
+                report_message = format_maintenance_report(report)
+            except Exception as e:
+                logger.error(f"数据库维护失败: {e}")
+                report_message = f"数据库维护失败：{str(e)}"
+            self.root.after(0, lambda: finish(report_message))
+        
+        def start(dry_run):
+            if not dry_run and not messagebox.askyesno(
+                "确认清理", "将删除孤立数据和过期的原始JS快照，并整理数据库存储空间。\n\n确定继续吗？", parent=dialog
+            ):
+                return
+            for button in buttons:
+                button.config(state='disabled')
+            threading.Thread(target=worker, args=(dry_run, full_vacuum_var.get()), daemon=True).start()
+        
+        buttons.append(ttk.Button(options_frame, text="清理并压缩", command=lambda: start(False)))
+        buttons.append(ttk.Button(options_frame, text="扫描", command=lambda: start(True)))
+        for button in buttons:
+            button.pack(side=tk.RIGHT, padx=(5, 0))
+        status_label.pack(side=tk.RIGHT, padx=10)
+        
+        # 打开时先执行一次扫描
+        show_report("正在扫描数据库...")
+        start(True)
             
     def clean_logs(self):
         """清理日志文件"""
@@ -279,10 +381,17 @@ class FootballDataApp:
             logger.info("应用程序正常退出")
             self.root.destroy()
             
+    def report_startup_time(self):
+        """主循环开始后记录首次绘制时间，输出启动耗时报告"""
+        self.root.update_idletasks()
+        startup_timer.mark("启动到首次绘制")
+        logger.info(startup_timer.format_report())
+        
     def run(self):
         """运行应用程序"""
         try:
             self.update_status("应用程序已启动")
+            self.root.after(0, self.report_startup_time)
             self.root.mainloop()
         except KeyboardInterrupt:
             logger.info("用户中断应用程序")
@@ -293,12 +402,38 @@ class FootballDataApp:
             logger.info("应用程序结束")
 
 
+def run_headless_maintenance(dry_run=False, full_vacuum=False):
+    """无界面执行数据库维护，结果输出到控制台"""
+    db_manager = DatabaseManager(**get_database_settings())
+    db_manager.create_tables()
+    try:
+        report = run_maintenance(db_manager, dry_run=dry_run, full_vacuum=full_vacuum)
+        print(format_maintenance_report(report))
+    finally:
+        db_manager.close_all_connections()
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="足球联赛数据管理系统")
+    parser.add_argument('--maintenance', action='store_true', help="不启动界面，执行数据库维护（清理孤立数据并整理存储空间）")
+    parser.add_argument('--dry-run', action='store_true', help="配合 --maintenance 使用，只扫描统计，不修改数据库")
+    parser.add_argument('--full-vacuum', action='store_true', help="配合 --maintenance 使用，执行完整 VACUUM")
+    return parser.parse_args(argv)
+
+
 def main():
     """主函数"""
+    args = parse_args()
+    
     try:
         # 创建日志目录
         os.makedirs("logs", exist_ok=True)
         
+        if args.maintenance:
+            run_headless_maintenance(dry_run=args.dry_run, full_vacuum=args.full_vacuum)
+            return
+        
         # 创建并运行应用
         app = FootballDataApp()
         app.run()
@@ -309,4 +444,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后的程序中，批量导出的进程池子进程需要从这里进入
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -6,7 +6,14 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # 页面模块在打开标签页时才通过 importlib 导入，需显式声明
+    hiddenimports=[
+        'pages.input_page',
+        'pages.input_management_page',
+        'pages.batch_import_page',
+        'pages.data_crawl_page',
+        'pages.data_management_page',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
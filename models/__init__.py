@@ -10,6 +10,11 @@ from .js_data_raw import JsDataRaw
 from .standings import Standings
 from .match import Match
 from .match_basic import MatchBasic
+from .standings_export import StandingsExport
+from .schema_migration import SchemaMigration
 from .database import DatabaseManager
+from .purge import purge_tasks
+from .maintenance import run_maintenance, format_maintenance_report
 
-__all__ = ['Base', 'Task', 'Team', 'JsDataRaw', 'Standings', 'Match', 'MatchBasic', 'DatabaseManager']
\ No newline at end of file
+__all__ = ['Base', 'Task', 'Team', 'JsDataRaw', 'Standings', 'Match', 'MatchBasic', 'StandingsExport', 'SchemaMigration', 'DatabaseManager', 'purge_tasks',
+           'run_maintenance', 'format_maintenance_report']
\ No newline at end of file
@@ -36,7 +36,6 @@ class JsDataRaw(Base):
     # 索引优化
     __table_args__ = (
         Index('idx_js_data_raw_task_id_link_type', 'task_id', 'link_type'),
-        Index('idx_js_data_raw_created_at', 'created_at'),
     )
     
     def __repr__(self):
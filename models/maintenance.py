@@ -0,0 +1,277 @@
+"""
+数据库维护 - 清理孤立数据和过期的原始JS快照，并整理存储空间
+
+- 孤立数据：所属任务已不存在的关联记录，以及没有对应比赛的比赛基本信息
+- 过期快照：同一任务同一链接类型下已被更新快照取代、且没有队伍/比赛引用的原始JS数据
+- 存储整理：ANALYZE、PRAGMA optimize，以及增量 VACUUM 或完整 VACUUM
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import Integer, and_, cast, exists, func, select
+from loguru import logger
+
+from .base import Base
+from .js_data_raw import JsDataRaw
+from .match import Match
+from .match_basic import MatchBasic
+from .standings import Standings
+from .standings_export import StandingsExport
+from .task import Task
+from .team import Team
+
+# 按任务关联的表（删除顺序：先删除引用 js_data_raw 的记录）
+TASK_CHILD_MODELS = [Match, StandingsExport, Standings, Team, JsDataRaw]
+
+# 每批删除的主键数量（SQLite 默认最多 999 个绑定参数）
+MAINTENANCE_BATCH_SIZE = 500
+
+# 进度回调：progress_callback(当前步骤说明)
+MaintenanceCallback = Optional[Callable[[str], None]]
+
+
+def _primary_key(model):
+    """模型的单列主键"""
+    return model.__mapper__.primary_key[0]
+
+
+def count_table_rows(session) -> Dict[str, int]:
+    """统计各表行数"""
+    return {
+        table_name: session.execute(select(func.count()).select_from(table)).scalar()
+        for table_name, table in Base.metadata.tables.items()
+    }
+
+
+def get_storage_stats(session) -> Dict:
+    """
+    获取存储统计（仅 SQLite）
+
+    Returns:
+        dict: {'database_bytes', 'free_bytes', 'table_bytes': {表名: 字节数}}，
+              SQLite 未编译 dbstat 时 table_bytes 为空
+    """
+    if session.bind.dialect.name != 'sqlite':
+        return {'database_bytes': None, 'free_bytes': None, 'table_bytes': {}}
+
+    connection = session.connection()
+    page_size = connection.exec_driver_sql('PRAGMA page_size').scalar()
+    page_count = connection.exec_driver_sql('PRAGMA page_count').scalar()
+    freelist_count = connection.exec_driver_sql('PRAGMA freelist_count').scalar()
+
+    table_bytes = {}
+    try:
+        # dbstat 按表及其索引统计占用页，索引归入所属表
+        rows = connection.exec_driver_sql(
+            "SELECT COALESCE(m.tbl_name, s.name), SUM(s.pgsize) FROM dbstat s "
+            "LEFT JOIN sqlite_master m ON m.name = s.name GROUP BY 1"
+        ).all()
+        table_bytes = {name: size for name, size in rows if name in Base.metadata.tables}
+    except Exception as e:
+        logger.debug(f"当前 SQLite 不支持 dbstat，跳过按表统计: {e}")
+
+    return {
+        'database_bytes': page_size * page_count,
+        'free_bytes': page_size * freelist_count,
+        'table_bytes': table_bytes,
+    }
+
+
+def find_orphans(session) -> Dict[str, List]:
+    """
+    通过反连接查找孤立记录
+
+    Returns:
+        dict: {表名: 孤立记录主键列表}
+    """
+    orphans = {}
+    for model in TASK_CHILD_MODELS:
+        pk = _primary_key(model)
+        orphans[model.__tablename__] = list(session.scalars(
+            select(pk)
+            .outerjoin(Task, Task.id == model.task_id)
+            .where(Task.id.is_(None))
+        ))
+
+    # 比赛基本信息按比赛ID缓存，对应比赛已删除的记录不再使用
+    # （转换放在 MatchBasic 一侧，Match 按整数主键查找）
+    orphans[MatchBasic.__tablename__] = list(session.scalars(
+        select(MatchBasic.match_id)
+        .where(~exists().where(Match.match_id == cast(MatchBasic.match_id, Integer)))
+    ))
+    return orphans
+
+
+def find_superseded_raw_data(session) -> List[int]:
+    """
+    查找过期的原始JS快照：同一任务同一链接类型存在更新的快照，且没有队伍或比赛引用
+
+    Returns:
+        list: JsDataRaw 主键列表
+    """
+    newer = JsDataRaw.__table__.alias('newer')
+    return list(session.scalars(
+        select(JsDataRaw.id)
+        .where(exists().where(and_(
+            newer.c.task_id == JsDataRaw.task_id,
+            newer.c.link_type == JsDataRaw.link_type,
+            newer.c.id > JsDataRaw.id,
+        )))
+        .where(~exists().where(Team.js_data_id == JsDataRaw.id))
+        .where(~exists().where(Match.js_data_id == JsDataRaw.id))
+    ))
+
+
+def _delete_in_batches(session, model, ids: List) -> int:
+    """按主键分批删除"""
+    pk = _primary_key(model)
+    deleted = 0
+    for start in range(0, len(ids), MAINTENANCE_BATCH_SIZE):
+        batch = ids[start:start + MAINTENANCE_BATCH_SIZE]
+        deleted += session.query(model).filter(pk.in_(batch)).delete(synchronize_session=False)
+    return deleted
+
+
+def compact_database(engine, full_vacuum: bool = False) -> List[str]:
+    """
+    更新统计信息并整理存储空间
+
+    Args:
+        engine: SQLAlchemy 引擎
+        full_vacuum: 是否执行完整 VACUUM（未开启增量 VACUUM 的 SQLite 数据库会同时开启）
+
+    Returns:
+        list: 已执行的操作
+    """
+    steps = []
+    if engine.dialect.name != 'sqlite':
+        with engine.begin() as connection:
+            connection.exec_driver_sql('ANALYZE')
+        steps.append('ANALYZE')
+        return steps
+
+    raw_connection = engine.raw_connection()
+    try:
+        cursor = raw_connection.cursor()
+        cursor.execute('ANALYZE')
+        cursor.execute('PRAGMA optimize')
+        raw_connection.commit()
+        steps.extend(['ANALYZE', 'PRAGMA optimize'])
+
+        auto_vacuum = cursor.execute('PRAGMA auto_vacuum').fetchone()[0]
+        if full_vacuum:
+            if auto_vacuum != 2:
+                # auto_vacuum 的变更在 VACUUM 重建数据库后生效
+                cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                steps.append('PRAGMA auto_vacuum = INCREMENTAL')
+            cursor.execute('VACUUM')
+            steps.append('VACUUM')
+        elif auto_vacuum == 2:
+            cursor.execute('PRAGMA incremental_vacuum').fetchall()
+            raw_connection.commit()
+            steps.append('PRAGMA incremental_vacuum')
+        cursor.close()
+    finally:
+        raw_connection.close()
+
+    return steps
+
+
+def run_maintenance(db_manager, dry_run: bool = False, full_vacuum: bool = False,
+                    progress_callback: MaintenanceCallback = None) -> Dict:
+    """
+    执行数据库维护：扫描并删除孤立数据和过期快照，再整理存储空间
+
+    Args:
+        db_manager: DatabaseManager 实例
+        dry_run: 只扫描统计，不删除也不整理
+        full_vacuum: 是否执行完整 VACUUM（耗时与数据库大小成正比）
+        progress_callback: 每开始一个步骤调用一次
+
+    Returns:
+        dict: {'dry_run', 'rows_before', 'rows_after', 'storage_before', 'storage_after',
+               'orphans': {表名: 数量}, 'superseded_raw': 数量, 'deleted': {表名: 删除行数}, 'steps'}
+    """
+    def report_progress(message):
+        logger.info(f"数据库维护: {message}")
+        if progress_callback:
+            progress_callback(message)
+
+    report = {'dry_run': dry_run, 'deleted': {}, 'steps': []}
+
+    with db_manager.get_session() as session:
+        report_progress("统计表行数和存储空间")
+        report['rows_before'] = count_table_rows(session)
+        report['storage_before'] = get_storage_stats(session)
+
+        report_progress("扫描孤立数据")
+        orphans = find_orphans(session)
+        report['orphans'] = {table: len(ids) for table, ids in orphans.items()}
+
+        report_progress("扫描过期的原始JS快照")
+        superseded_ids = sorted(set(find_superseded_raw_data(session)) - set(orphans[JsDataRaw.__tablename__]))
+        report['superseded_raw'] = len(superseded_ids)
+
+        if dry_run:
+            report['rows_after'] = report['rows_before']
+            report['storage_after'] = report['storage_before']
+            return report
+
+        report_progress("删除孤立数据和过期快照")
+        orphans[JsDataRaw.__tablename__].extend(superseded_ids)
+        for model in TASK_CHILD_MODELS + [MatchBasic]:
+            ids = orphans[model.__tablename__]
+            if ids:
+                report['deleted'][model.__tablename__] = _delete_in_batches(session, model, ids)
+        session.commit()
+
+    report_progress("更新统计信息并整理存储空间")
+    report['steps'] = compact_database(db_manager.engine, full_vacuum=full_vacuum)
+
+    with db_manager.get_session() as session:
+        report['rows_after'] = count_table_rows(session)
+        report['storage_after'] = get_storage_stats(session)
+
+    report_progress("完成")
+    return report
+
+
+def _format_bytes(size: Optional[int]) -> str:
+    """字节数格式化为 KB/MB"""
+    if size is None:
+        return '-'
+    if size >= 1024 * 1024:
+        return f"{size / 1024 / 1024:.2f} MB"
+    return f"{size / 1024:.1f} KB"
+
+
+def format_maintenance_report(report: Dict) -> str:
+    """将维护结果格式化为文本报告"""
+    lines = ["数据库维护（仅扫描）" if report['dry_run'] else "数据库维护完成", ""]
+
+    lines.append("孤立数据:")
+    for table, count in report['orphans'].items():
+        lines.append(f"  {table}: {count} 条")
+    lines.append(f"过期的原始JS快照: {report['superseded_raw']} 条")
+    lines.append("")
+
+    table_bytes_before = report['storage_before']['table_bytes']
+    table_bytes_after = report['storage_after']['table_bytes']
+    lines.append("各表行数（维护前 -> 维护后）:")
+    for table, rows_before in report['rows_before'].items():
+        line = f"  {table}: {rows_before} -> {report['rows_after'].get(table, 0)} 行"
+        if table in table_bytes_before:
+            line += (f"，{_format_bytes(table_bytes_before[table])}"
+                     f" -> {_format_bytes(table_bytes_after.get(table))}")
+        lines.append(line)
+    lines.append("")
+
+    storage_before, storage_after = report['storage_before'], report['storage_after']
+    lines.append(f"数据库大小: {_format_bytes(storage_before['database_bytes'])}"
+                 f" -> {_format_bytes(storage_after['database_bytes'])}")
+    lines.append(f"空闲空间: {_format_bytes(storage_before['free_bytes'])}"
+                 f" -> {_format_bytes(storage_after['free_bytes'])}")
+    if report['steps']:
+        lines.append(f"已执行: {', '.join(report['steps'])}")
+
+    return "\n".join(lines)
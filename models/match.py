@@ -52,6 +52,7 @@ class Match(Base):
         Index('idx_match_league_id', 'league_id'),
         Index('idx_match_teams', 'home_team_code', 'away_team_code'),
         Index('idx_match_time', 'match_time'),
+        Index('idx_match_js_data_id', 'js_data_id'),  # 维护时查找没有比赛引用的原始JS数据
     )
     
     def __repr__(self):
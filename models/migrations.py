@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+数据库迁移 - 对已有用户数据库执行版本化的结构变更
+
+create_all 只会创建缺失的表，不会修改已有表上的索引。
+这里按版本号顺序执行迁移，并记录到 schema_migrations 表中，
+每个迁移在独立事务中执行，且需保证可重复执行（新建库上 create_all 已经建好的索引会被跳过）。
+迁移中的表名、列名直接写在迁移里，不引用当前模型，之后修改模型不会影响已有的迁移。
+"""
+
+from sqlalchemy import inspect, select, text
+from loguru import logger
+
+from .schema_migration import SchemaMigration
+
+
+def _create_index(connection, index_name, table_name, columns):
+    """创建索引（已存在时跳过），SQLite 与 PostgreSQL 语法一致"""
+    connection.execute(text(
+        f'CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({", ".join(columns)})'
+    ))
+
+
+def _drop_index(connection, index_name):
+    """删除索引（不存在时跳过），SQLite 与 PostgreSQL 语法一致"""
+    connection.execute(text(f'DROP INDEX IF EXISTS {index_name}'))
+
+
+def _migration_001_tune_indexes(connection):
+    """
+    按实际查询模式调整索引（通过 EXPLAIN QUERY PLAN 验证）：
+    - 积分榜导出/界面按 (task_id, standings_category, round_num, team_code) 等值查找
+    - 队伍名称按 (task_id, team_code) 查找，覆盖索引直接返回 home_name_cn
+    - 按年份筛选任务、按创建时间排序任务列表
+    - 删除没有查询使用的索引
+    """
+    for index_name in (
+        'idx_standings_rank',
+        'idx_standings_created_at',
+        'idx_standings_round_num',
+        'idx_standings_task_category_division_round',
+        'idx_js_data_raw_created_at',
+        'idx_team_task_id',
+    ):
+        _drop_index(connection, index_name)
+
+    _create_index(connection, 'idx_standings_task_category_round_team', 'standings',
+                  ('task_id', 'standings_category', 'round_num', 'team_code'))
+    _create_index(connection, 'idx_team_task_code_name', 'teams', ('task_id', 'team_code', 'home_name_cn'))
+    _create_index(connection, 'idx_task_year', 'tasks', ('year',))
+    _create_index(connection, 'idx_task_created_at', 'tasks', ('created_at', 'id'))
+
+    # 更新统计信息，让查询优化器立即使用新的索引
+    connection.execute(text('ANALYZE'))
+
+
+def _migration_002_standings_export_built_at(connection):
+    """
+    任务表增加积分榜导出快照生成时间：没有积分榜的任务快照为空，需单独记录已生成，
+    导出时不再每次重新生成；已有快照的任务直接标记为已生成
+    """
+    columns = {column['name'] for column in inspect(connection).get_columns('tasks')}
+    if 'standings_export_built_at' not in columns:
+        connection.execute(text('ALTER TABLE tasks ADD COLUMN standings_export_built_at TIMESTAMP'))
+
+    connection.execute(text(
+        'UPDATE tasks SET standings_export_built_at = CURRENT_TIMESTAMP '
+        'WHERE standings_export_built_at IS NULL AND id IN (SELECT DISTINCT task_id FROM standings_export)'
+    ))
+
+
+def _migration_003_match_js_data_index(connection):
+    """比赛表按 js_data_id 建索引：数据库维护查找没有比赛引用的原始JS数据时按索引查找，不再逐行扫描比赛表"""
+    _create_index(connection, 'idx_match_js_data_id', 'matches', ('js_data_id',))
+
+
+# 迁移列表：(版本号, 说明, 升级函数)，版本号必须递增
+MIGRATIONS = [
+    (1, '按导出与界面查询模式调整索引', _migration_001_tune_indexes),
+    (2, '任务表增加积分榜导出快照生成时间', _migration_002_standings_export_built_at),
+    (3, '比赛表增加 js_data_id 索引', _migration_003_match_js_data_index),
+]
+
+
+def get_applied_versions(engine):
+    """获取已应用的迁移版本号集合"""
+    with engine.connect() as connection:
+        return set(connection.execute(select(SchemaMigration.version)).scalars())
+
+
+def run_migrations(engine):
+    """
+    执行所有未应用的迁移
+    
+    Args:
+        engine: SQLAlchemy 引擎（schema_migrations 表需已创建）
+        
+    Returns:
+        list: 本次应用的迁移版本号
+    """
+    applied_versions = get_applied_versions(engine)
+    newly_applied = []
+
+    for version, description, upgrade in MIGRATIONS:
+        if version in applied_versions:
+            continue
+
+        with engine.begin() as connection:
+            upgrade(connection)
+            connection.execute(
+                SchemaMigration.__table__.insert().values(version=version, description=description)
+            )
+
+        newly_applied.append(version)
+        logger.info(f"数据库迁移 {version} 已应用: {description}")
+
+    return newly_applied
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+任务清除 - 按外键顺序集合化删除任务及其全部关联数据
+"""
+
+from typing import Dict, Iterable
+
+from loguru import logger
+
+from .js_data_raw import JsDataRaw
+from .match import Match
+from .standings import Standings
+from .standings_export import StandingsExport
+from .task import Task
+from .team import Team
+
+# 关联表的删除顺序：先删除引用其他表的记录（matches/teams 引用 js_data_raw），最后删除任务本身
+PURGE_ORDER = [Match, StandingsExport, Standings, Team, JsDataRaw]
+
+# 每条 IN 语句的参数数量上限（SQLite 默认最多 999 个绑定参数）
+PURGE_CHUNK_SIZE = 500
+
+
+def purge_tasks(session, task_ids: Iterable[int]) -> Dict[str, int]:
+    """
+    删除任务及其全部关联数据（在调用方的事务中执行，由调用方提交）
+
+    SQLite 未开启外键约束，Query.delete 也不会触发 ORM 级联，
+    因此这里按外键顺序用 IN 语句逐表删除，避免留下孤立的关联记录。
+
+    Args:
+        session: SQLAlchemy 会话
+        task_ids: 要删除的任务ID
+
+    Returns:
+        dict: {表名: 删除行数}，tasks 为实际删除的任务数
+    """
+    task_ids = sorted(set(task_ids))
+    deleted = {model.__tablename__: 0 for model in PURGE_ORDER + [Task]}
+
+    for start in range(0, len(task_ids), PURGE_CHUNK_SIZE):
+        id_chunk = task_ids[start:start + PURGE_CHUNK_SIZE]
+        for model in PURGE_ORDER:
+            deleted[model.__tablename__] += (
+                session.query(model).filter(model.task_id.in_(id_chunk)).delete(synchronize_session=False)
+            )
+        deleted[Task.__tablename__] += (
+            session.query(Task).filter(Task.id.in_(id_chunk)).delete(synchronize_session=False)
+        )
+
+    logger.info(f"清除任务完成: {deleted}")
+    return deleted
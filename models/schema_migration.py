@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+SchemaMigration 模型定义 - 数据库迁移版本记录表
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, func
+
+from .base import Base
+
+
+class SchemaMigration(Base):
+    """数据库迁移版本记录表 - 记录已应用到当前数据库的迁移"""
+    __tablename__ = 'schema_migrations'
+    
+    # 主键字段
+    version = Column(Integer, primary_key=True, autoincrement=False, comment='迁移版本号')
+    
+    # 迁移信息
+    description = Column(String(200), nullable=False, comment='迁移说明')
+    
+    # 时间戳字段
+    applied_at = Column(DateTime, server_default=func.current_timestamp(), comment='应用时间')
+    
+    def __repr__(self):
+        return f"<SchemaMigration(version={self.version}, description='{self.description}')>"
\ No newline at end of file
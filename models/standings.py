@@ -89,11 +89,8 @@ class Standings(Base):
     
     # 索引优化
     __table_args__ = (
-        Index('idx_standings_task_category_division_round', 'task_id', 'standings_category', 'division_type', 'round_num'),
+        Index('idx_standings_task_category_round_team', 'task_id', 'standings_category', 'round_num', 'team_code'),
         Index('idx_standings_team_code', 'team_code'),
-        Index('idx_standings_rank', 'rank'),
-        Index('idx_standings_round_num', 'round_num'),
-        Index('idx_standings_created_at', 'created_at'),
     )
     
     def __repr__(self):
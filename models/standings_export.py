@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+StandingsExport 模型定义 - 积分榜导出快照表
+"""
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey, Index
+from sqlalchemy.orm import relationship
+
+from .base import Base
+
+
+class StandingsExport(Base):
+    """积分榜导出快照表 - 存储已按 总/主/客 透视好的导出行，任务爬取完成时刷新"""
+    __tablename__ = 'standings_export'
+    
+    # 主键字段
+    id = Column(Integer, primary_key=True, autoincrement=True, comment='快照行唯一标识ID')
+    
+    # 关联字段
+    task_id = Column(Integer, ForeignKey('tasks.id'), nullable=False, comment='关联的任务ID')
+    
+    # 行位置信息
+    position = Column(Integer, nullable=False, comment='任务内的输出顺序')
+    round_num = Column(Integer, nullable=False, comment='截止轮次')
+    is_separator = Column(Boolean, nullable=False, default=False, comment='是否为轮次之间的空行')
+    
+    # 队伍信息
+    team_code = Column(String(20), nullable=True, comment='队伍编码（用于匹配升降级信息）')
+    team_name = Column(String(100), nullable=True, comment='队伍中文名')
+    rank = Column(Integer, nullable=True, comment='总积分榜排名')
+    
+    # 总积分榜指标（为空表示该队没有对应积分榜数据）
+    total_games = Column(Integer, nullable=True, comment='总-赛/轮')
+    total_points = Column(Integer, nullable=True, comment='总-积分')
+    total_win_pct = Column(String(10), nullable=True, comment='总-胜率')
+    total_goals_for = Column(Integer, nullable=True, comment='总-得球数')
+    total_goals_against = Column(Integer, nullable=True, comment='总-失球数')
+    total_goal_diff = Column(Integer, nullable=True, comment='总-净胜球')
+    
+    # 主场积分榜指标
+    home_games = Column(Integer, nullable=True, comment='主-赛/轮')
+    home_points = Column(Integer, nullable=True, comment='主-积分')
+    home_win_pct = Column(String(10), nullable=True, comment='主-胜率')
+    home_goals_for = Column(Integer, nullable=True, comment='主-得球数')
+    home_goals_against = Column(Integer, nullable=True, comment='主-失球数')
+    home_goal_diff = Column(Integer, nullable=True, comment='主-净胜球')
+    
+    # 客场积分榜指标
+    away_games = Column(Integer, nullable=True, comment='客-赛/轮')
+    away_points = Column(Integer, nullable=True, comment='客-积分')
+    away_win_pct = Column(String(10), nullable=True, comment='客-胜率')
+    away_goals_for = Column(Integer, nullable=True, comment='客-得球数')
+    away_goals_against = Column(Integer, nullable=True, comment='客-失球数')
+    away_goal_diff = Column(Integer, nullable=True, comment='客-净胜球')
+    
+    # 时间戳字段
+    created_at = Column(DateTime, server_default=func.current_timestamp(), comment='创建时间')
+    
+    # 关联关系
+    task = relationship("Task", back_populates="standings_export_records")
+    
+    # 索引优化：导出按 (task_id, position) 顺序扫描
+    __table_args__ = (
+        Index('idx_standings_export_task_position', 'task_id', 'position'),
+    )
+    
+    def __repr__(self):
+        return f"<StandingsExport(id={self.id}, task_id={self.task_id}, round={self.round_num}, position={self.position})>"
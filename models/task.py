@@ -31,6 +31,7 @@ class Task(Base):
     
     # 时间戳字段
     last_crawl_time = Column(DateTime, nullable=True, comment='最后一次爬取时间')
+    standings_export_built_at = Column(DateTime, nullable=True, comment='积分榜导出快照生成时间（快照可能为空）')
     created_at = Column(DateTime, server_default=func.current_timestamp(), comment='创建时间')
     updated_at = Column(DateTime, server_default=func.current_timestamp(), onupdate=func.current_timestamp(), comment='更新时间')
     
@@ -39,12 +40,15 @@ class Task(Base):
     js_data_records = relationship("JsDataRaw", back_populates="task", cascade="all, delete-orphan")
     standings_records = relationship("Standings", back_populates="task", cascade="all, delete-orphan")
     match_records = relationship("Match", back_populates="task", cascade="all, delete-orphan")
+    standings_export_records = relationship("StandingsExport", back_populates="task", cascade="all, delete-orphan")
     
     # 索引优化建议和约束
     __table_args__ = (
         Index('idx_country_league_year', 'country', 'league', 'year'),
         Index('idx_last_crawl_time', 'last_crawl_time'),
         Index('idx_type', 'type'),
+        Index('idx_task_year', 'year'),
+        Index('idx_task_created_at', 'created_at', 'id'),
         UniqueConstraint('league', 'year', 'group', name='uk_league_year_group'),
     )
     
@@ -44,7 +44,7 @@ class Team(Base):
     # 索引和约束优化
     __table_args__ = (
         UniqueConstraint('task_id', 'team_code', name='uq_team_task_team_code'),  # task_id + team_code 唯一约束
-        Index('idx_team_task_id', 'task_id'),
+        Index('idx_team_task_code_name', 'task_id', 'team_code', 'home_name_cn'),  # 覆盖按队伍编码取名称的查询
         Index('idx_team_js_data_id', 'js_data_id'),
         Index('idx_team_home_name_cn', 'home_name_cn'),
         Index('idx_team_code', 'team_code'),
@@ -1,20 +1,42 @@
 """
 Pages package for GUI application
 包含所有页面组件
+
+页面模块在首次访问时才导入（PEP 562 模块级 __getattr__），
+主程序只在打开对应标签页时才加载页面及其依赖，缩短启动时间。
 """
 
-from .base_page import BasePage
-from .input_page import InputPage
-from .input_management_page import InputManagementPage
-from .data_crawl_page import DataCrawlPage
-from .data_management_page import DataManagementPage
-from .batch_import_page import BatchImportPage
+import importlib
+
+# 页面类 -> 所在模块
+_PAGE_MODULES = {
+    'BasePage': '.base_page',
+    'InputPage': '.input_page',
+    'InputManagementPage': '.input_management_page',
+    'DataCrawlPage': '.data_crawl_page',
+    'DataManagementPage': '.data_management_page',
+    'BatchImportPage': '.batch_import_page',
+}
 
 __all__ = [
     'BasePage',
-    'InputPage', 
+    'InputPage',
     'InputManagementPage',
     'DataCrawlPage',
     'DataManagementPage',
     'BatchImportPage'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """首次访问页面类时导入对应模块"""
+    module_name = _PAGE_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    page_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = page_class
+    return page_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
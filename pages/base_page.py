@@ -8,7 +8,7 @@ from typing import Optional
 from loguru import logger
 
 from models import DatabaseManager
-from utils import get_database_url
+from utils import get_database_settings
 
 
 class BasePage:
@@ -23,7 +23,7 @@ class BasePage:
             db_manager: 数据库管理器实例
         """
         self.parent = parent
-        self.db_manager = db_manager or DatabaseManager(get_database_url())
+        self.db_manager = db_manager or DatabaseManager(**get_database_settings())
         
         # 创建主框架
         self.frame = ttk.Frame(parent)
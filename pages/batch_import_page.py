@@ -7,15 +7,29 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pandas as pd
 import os
+import json
+import threading
 from datetime import datetime
 
+from utils import read_csv_file
 from .base_page import BasePage
-from models import Task, Team, JsDataRaw, Standings
+from .utils.task_import import DEFAULT_GROUP, import_tasks
+from .utils.task_detail_cache import task_detail_cache
+from .utils.task_stats import task_stats_cache
 
 
 class BatchImportPage(BasePage):
     """批量导入页面 - 任务批量导入功能"""
     
+    # 必填字段
+    REQUIRED_FIELDS = ['level', 'event', 'country', 'league', 'type', 'year']
+    # 允许的赛事类型
+    VALID_TYPES = ["常规", "联二合并", "春秋合并", "东西拆分"]
+    # 每个导入事务处理的行数
+    IMPORT_CHUNK_SIZE = 1000
+    # 每次验证的行数（验证进度按此粒度刷新）
+    VALIDATE_CHUNK_SIZE = 10000
+    
     def setup_scrollable_container(self):
         """设置可滚动的容器"""
         # 创建Canvas和滚动条
@@ -75,6 +89,7 @@ class BatchImportPage(BasePage):
         self.current_data = None
         self.validation_results = []
         self.duplicate_results = []
+        self.cancel_event = threading.Event()
     
     def setup_file_and_import_area(self):
         """设置文件选择和导入控制区域（合并顶部区域）"""
@@ -121,22 +136,22 @@ class BatchImportPage(BasePage):
         button_frame.pack(side=tk.RIGHT)
         
         # 浏览按钮
-        browse_btn = ttk.Button(
+        self.browse_btn = ttk.Button(
             button_frame,
             text="浏览文件",
             command=self.browse_file,
             width=15
         )
-        browse_btn.pack(pady=(0, 8))
+        self.browse_btn.pack(pady=(0, 8))
         
         # 解析按钮
-        parse_btn = ttk.Button(
+        self.parse_btn = ttk.Button(
             button_frame,
             text="解析文件",
             command=self.parse_file,
             width=15
         )
-        parse_btn.pack(pady=(0, 8))
+        self.parse_btn.pack(pady=(0, 8))
         
         # 导入按钮（突出显示）
         self.import_btn = ttk.Button(
@@ -146,7 +161,17 @@ class BatchImportPage(BasePage):
             width=15,
             state='disabled'
         )
-        self.import_btn.pack()
+        self.import_btn.pack(pady=(0, 8))
+        
+        # 取消按钮（解析/导入进行中可用）
+        self.cancel_btn = ttk.Button(
+            button_frame,
+            text="取消",
+            command=self.cancel_job,
+            width=15,
+            state='disabled'
+        )
+        self.cancel_btn.pack()
     
     
     def setup_preview_area(self):
@@ -247,7 +272,7 @@ class BatchImportPage(BasePage):
             self.log_action("选择文件", f"文件路径: {file_path}")
     
     def parse_file(self):
-        """解析导入文件"""
+        """解析导入文件（在后台线程中读取和验证）"""
         file_path = self.file_path_var.get()
         if not file_path:
             self.show_message("提示", "请先选择要导入的文件", "warning")
@@ -257,80 +282,142 @@ class BatchImportPage(BasePage):
             self.show_message("错误", "文件不存在", "error")
             return
         
+        self.cancel_event.clear()
+        self.set_job_running(True)
+        self.status_label.config(text="正在解析文件...", foreground='blue')
+        threading.Thread(target=self._parse_worker, args=(file_path,), daemon=True).start()
+    
+    def read_import_file(self, file_path):
+        """
+        读取导入文件
+        
+        Returns:
+            tuple: (DataFrame, 文件格式说明)
+        """
+        # 根据文件扩展名选择解析方式
+        file_ext = os.path.splitext(file_path)[1].lower()
+        
+        if file_ext in ['.xlsx', '.xls']:
+            return pd.read_excel(file_path), "Excel格式"
+        
+        if file_ext == '.csv':
+            # 文件只读取、解码一次；所有列按文本读取，跳过类型推断（level 在标准化列名后再转换）
+            try:
+                df, encoding = read_csv_file(file_path, dtype=str)
+            except ValueError as e:
+                raise ValueError(f"无法读取CSV文件: {e}。\n请检查文件编码或将文件转换为UTF-8编码。")
+            self.logger.info(f"成功使用 {encoding} 编码读取CSV文件")
+            return df, f"CSV格式 ({encoding}编码)"
+        
+        raise ValueError("不支持的文件格式，仅支持Excel(.xlsx/.xls)和CSV(.csv)文件")
+    
+    def convert_level_column(self, df):
+        """
+        将 level 列转换为整数类型（可空），存在无法转换的值时保留原文本，交给验证报告
+        """
+        if 'level' not in df.columns or pd.api.types.is_numeric_dtype(df['level']):
+            return df
+        
+        level = df['level']
+        converted = pd.to_numeric(level, errors='coerce')
+        if converted.notna().sum() != level.notna().sum() or not (converted.dropna() % 1 == 0).all():
+            return df
+        
+        df = df.copy()
+        df['level'] = converted.astype('Int64')
+        return df
+    
+    def _parse_worker(self, file_path):
+        """后台解析工作线程：读取文件并分块验证"""
         try:
-            # 根据文件扩展名选择解析方式
-            file_ext = os.path.splitext(file_path)[1].lower()
-            
-            if file_ext in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_path)
-                separator_used = "Excel格式"
-            elif file_ext == '.csv':
-                # 尝试多种编码读取CSV文件
-                encodings = ['utf-8', 'gbk', 'gb2312', 'utf-8-sig', 'cp936', 'iso-8859-1']
-                df = None
-                used_encoding = None
-                
-                for encoding in encodings:
-                    try:
-                        df = pd.read_csv(file_path, encoding=encoding)
-                        used_encoding = encoding
-                        self.logger.info(f"成功使用 {encoding} 编码读取CSV文件")
-                        break
-                    except UnicodeDecodeError as e:
-                        self.logger.debug(f"尝试 {encoding} 编码失败: {e}")
-                        continue
-                    except Exception as e:
-                        self.logger.debug(f"使用 {encoding} 编码读取失败: {e}")
-                        continue
-                
-                if df is None:
-                    self.show_message("错误", 
-                        f"无法读取CSV文件，已尝试编码: {', '.join(encodings)}。\\n请检查文件编码或将文件转换为UTF-8编码。", 
-                        "error")
-                    return
-                
-                separator_used = f"CSV格式 ({used_encoding}编码)"
-            else:
-                self.show_message("错误", "不支持的文件格式，仅支持Excel(.xlsx/.xls)和CSV(.csv)文件", "error")
-                return
+            df, separator_used = self.read_import_file(file_path)
             
             # 标准化列名
             df = self.normalize_column_names(df)
+            df = self.convert_level_column(df)
+            
+            # 分块验证数据，逐块报告进度
+            validation_results = []
+            total_rows = len(df)
+            for start in range(0, max(total_rows, 1), self.VALIDATE_CHUNK_SIZE):
+                if self.cancel_event.is_set():
+                    self.frame.after(0, lambda: self._job_cancelled("已取消解析"))
+                    return
+                
+                chunk_results = self.validate_data(df.iloc[start:start + self.VALIDATE_CHUNK_SIZE])
+                validation_results.extend(chunk_results)
+                if chunk_results and 'row' not in chunk_results[0]:
+                    break  # 缺少必需列，无需继续验证
+                
+                done = min(start + self.VALIDATE_CHUNK_SIZE, total_rows)
+                self.frame.after(0, lambda done=done: self.status_label.config(
+                    text=f"正在验证 {done}/{total_rows} 行...", foreground='blue'
+                ))
             
-            # 验证数据
-            self.current_data = df
-            validation_results = self.validate_data(df)
-            
-            # 检测重复数据
-            duplicate_results = self.detect_duplicates_in_file(df)
-            self.duplicate_results = duplicate_results
-            
-            # 显示预览
-            self.display_preview(df)
-            self.display_validation_results(validation_results, duplicate_results)
-            
-            # 启用导入按钮
-            if all(result['valid'] for result in validation_results):
-                self.import_btn.config(state='normal')
-                self.status_label.config(
-                    text=f"✅ 数据验证通过，共 {len(df)} 条记录 ({separator_used})，可以导入",
-                    foreground='green'
-                )
-            else:
-                self.import_btn.config(state='disabled')
-                self.status_label.config(
-                    text="❌ 数据验证失败，请检查错误信息",
-                    foreground='red'
-                )
+            # 检测重复数据（缺少必需列时无法检测）
+            missing_columns = bool(validation_results) and 'row' not in validation_results[0]
+            duplicate_results = [] if missing_columns else self.detect_duplicates_in_file(df)
             
-            self.log_action("解析文件", f"成功解析 {len(df)} 条记录，使用{separator_used}")
+            self.frame.after(0, lambda: self._parse_completed(df, separator_used, validation_results, duplicate_results))
             
         except Exception as e:
             self.logger.error(f"解析文件失败: {e}")
-            self.show_message("错误", f"解析失败: {str(e)}", "error")
-            self.status_label.config(text="文件解析失败")
+            error_message = str(e)
+            self.frame.after(0, lambda: self._job_failed("解析失败", error_message, "文件解析失败"))
+    
+    def _parse_completed(self, df, separator_used, validation_results, duplicate_results):
+        """解析完成后的UI更新（在主线程中调用）"""
+        self.set_job_running(False)
+        
+        self.current_data = df
+        self.duplicate_results = duplicate_results
+        
+        # 显示预览
+        self.display_preview(df)
+        self.display_validation_results(validation_results, duplicate_results)
+        
+        # 启用导入按钮（验证结果只包含失败项）
+        if not validation_results:
+            self.import_btn.config(state='normal')
+            self.status_label.config(
+                text=f"✅ 数据验证通过，共 {len(df)} 条记录 ({separator_used})，可以导入",
+                foreground='green'
+            )
+        else:
+            self.import_btn.config(state='disabled')
+            self.status_label.config(
+                text="❌ 数据验证失败，请检查错误信息",
+                foreground='red'
+            )
+        
+        self.log_action("解析文件", f"成功解析 {len(df)} 条记录，使用{separator_used}")
+    
+    def set_job_running(self, running):
+        """切换后台任务运行状态下的按钮可用性"""
+        state = 'disabled' if running else 'normal'
+        self.browse_btn.config(state=state)
+        self.parse_btn.config(state=state)
+        self.cancel_btn.config(state='normal' if running else 'disabled')
+        if running:
+            self.import_btn.config(state='disabled')
+    
+    def cancel_job(self):
+        """取消正在执行的解析或导入（在当前分块完成后停止）"""
+        self.cancel_event.set()
+        self.cancel_btn.config(state='disabled')
+        self.status_label.config(text="正在取消，等待当前分块完成...", foreground='orange')
+    
+    def _job_cancelled(self, message):
+        """后台任务取消后的UI更新（在主线程中调用）"""
+        self.set_job_running(False)
+        self.status_label.config(text=message, foreground='orange')
+    
+    def _job_failed(self, title, error_message, status_text):
+        """后台任务失败后的UI更新（在主线程中调用）"""
+        self.set_job_running(False)
+        self.show_message("错误", f"{title}: {error_message}", "error")
+        self.status_label.config(text=status_text, foreground='red')
 
-    # 保持原有的其他方法不变
     def download_excel_sample(self):
         """下载Excel样例文件"""
         try:
@@ -392,55 +479,63 @@ class BatchImportPage(BasePage):
     
     
     def validate_data(self, df):
-        """验证导入数据"""
-        results = []
-        required_fields = ['level', 'event', 'country', 'league', 'type', 'year']
+        """
+        验证导入数据（按列向量化计算错误掩码）
         
+        Returns:
+            list: 仅包含验证失败的结果，空列表表示全部通过
+        """
         # 检查必需列是否存在（已经过列名标准化处理）
-        missing_columns = [col for col in required_fields if col not in df.columns]
+        missing_columns = [col for col in self.REQUIRED_FIELDS if col not in df.columns]
         if missing_columns:
-            results.append({
+            return [{
                 'valid': False,
                 'message': f"缺少必需列: {', '.join(missing_columns)}"
-            })
-            return results
+            }]
         
-        # 逐行验证数据
-        for index, row in df.iterrows():
-            row_errors = []
-            
-            # 检查必填字段
-            for field in required_fields:
-                if pd.isna(row[field]) or str(row[field]).strip() == '':
-                    row_errors.append(f"{field}为空")
-            
-            # 验证级别为数字
-            try:
-                if not pd.isna(row['level']):
-                    int(row['level'])
-            except (ValueError, TypeError):
-                row_errors.append("level必须为数字")
-            
-            # 验证类型是否在允许范围内
-            valid_types = ["常规", "联二合并", "春秋合并", "东西拆分"]
-            if not pd.isna(row['type']) and str(row['type']) not in valid_types:
-                row_errors.append(f"type必须为: {', '.join(valid_types)}")
-            
-            # 记录验证结果
-            if row_errors:
-                results.append({
-                    'valid': False,
-                    'row': index + 1,
-                    'message': f"第{index + 1}行错误: {'; '.join(row_errors)}"
-                })
-            else:
-                results.append({
-                    'valid': True,
-                    'row': index + 1,
-                    'message': f"第{index + 1}行验证通过"
-                })
-        
-        return results
+        # (错误掩码, 错误信息)，顺序即错误信息的拼接顺序
+        checks = []
+        
+        # 检查必填字段
+        for field in self.REQUIRED_FIELDS:
+            column = df[field]
+            empty_mask = column.isna() | column.astype(str).str.strip().eq('')
+            checks.append((empty_mask, f"{field}为空"))
+        
+        # 验证级别为数字（数值类型直接通过，文本需为整数格式）
+        level = df['level']
+        if pd.api.types.is_numeric_dtype(level):
+            level_invalid = pd.Series(False, index=df.index)
+        else:
+            is_text = level.map(lambda value: isinstance(value, str))
+            text_ok = is_text & level.astype(str).str.fullmatch(r'\s*[+-]?\d+\s*')
+            number_ok = ~is_text & pd.to_numeric(level.where(~is_text), errors='coerce').notna()
+            level_invalid = level.notna() & ~(text_ok | number_ok)
+        checks.append((level_invalid, "level必须为数字"))
+        
+        # 验证类型是否在允许范围内
+        type_invalid = df['type'].notna() & ~df['type'].astype(str).isin(self.VALID_TYPES)
+        checks.append((type_invalid, f"type必须为: {', '.join(self.VALID_TYPES)}"))
+        
+        # 只为失败的行拼接错误信息
+        failed_mask = pd.concat([mask for mask, _ in checks], axis=1).any(axis=1)
+        if not failed_mask.any():
+            return []
+        
+        failed_index = df.index[failed_mask]
+        messages = pd.Series('', index=failed_index)
+        for mask, message in checks:
+            row_mask = mask.loc[failed_index]
+            messages = messages.mask(row_mask, messages + message + '; ')
+        
+        return [
+            {
+                'valid': False,
+                'row': index + 1,
+                'message': f"第{index + 1}行错误: {message[:-2]}"
+            }
+            for index, message in messages.items()
+        ]
     
     def display_preview(self, df):
         """显示数据预览"""
@@ -475,10 +570,14 @@ class BatchImportPage(BasePage):
         self.validation_text.config(state='normal')
         self.validation_text.delete(1.0, tk.END)
         
-        # 统计
-        total_rows = len(results)
-        valid_rows = len([r for r in results if r['valid']])
-        invalid_rows = total_rows - valid_rows
+        # 统计（验证结果只包含失败项，总行数取自当前数据）
+        total_rows = len(self.current_data) if self.current_data is not None else len(results)
+        if any('row' not in result for result in results):
+            # 缺少必需列时整份数据都无法导入
+            invalid_rows = total_rows
+        else:
+            invalid_rows = len(results)
+        valid_rows = total_rows - invalid_rows
         
         # 显示统计信息
         summary = f"验证结果: 总计 {total_rows} 行，通过 {valid_rows} 行，失败 {invalid_rows} 行\n"
@@ -543,203 +642,163 @@ class BatchImportPage(BasePage):
         if hasattr(self, 'canvas'):
             self.canvas.configure(scrollregion=self.canvas.bbox("all"))
     
-    def has_core_field_changes(self, existing_task, new_data):
-        """检测是否有核心字段变更"""
-        core_fields = ['level', 'event', 'country', 'league', 'type', 'year', 'group', 'link', 'link_second']
-        changes = []
-        
-        for field in core_fields:
-            # 获取新值
-            if field == 'level':
-                new_value = int(new_data['level'])
-            elif field in ['link', 'link_second']:
-                new_value = str(new_data.get(field, '')) if not pd.isna(new_data.get(field)) else None
-                # 处理空字符串
-                if new_value == '':
-                    new_value = None
-            else:
-                new_value = str(new_data[field]) if not pd.isna(new_data[field]) else None
-            
-            # 获取现有值
-            existing_value = getattr(existing_task, field)
-            
-            # 比较值
-            if existing_value != new_value:
-                changes.append(f"{field}: '{existing_value}' -> '{new_value}'")
-        
-        return len(changes) > 0, changes
-    
-    def clear_related_data(self, session, task_id):
-        """清空指定任务的关联数据"""
-        try:
-            # 删除 teams 数据
-            session.query(Team).filter_by(task_id=task_id).delete()
-            # 删除 js_data_raw 数据
-            session.query(JsDataRaw).filter_by(task_id=task_id).delete()
-            # 删除 standings 数据
-            session.query(Standings).filter_by(task_id=task_id).delete()
-            
-            self.logger.info(f"已清空任务 {task_id} 的关联数据")
-        except Exception as e:
-            self.logger.error(f"清空任务 {task_id} 关联数据失败: {e}")
-            raise
-    
-    def update_task_fields(self, existing_task, new_data, group):
-        """更新任务字段"""
-        existing_task.level = int(new_data['level'])
-        existing_task.event = str(new_data['event'])
-        existing_task.country = str(new_data['country'])
-        existing_task.league = str(new_data['league'])
-        existing_task.type = str(new_data['type'])
-        existing_task.year = str(new_data['year'])
-        existing_task.group = str(group)
-        
-        # 处理 link 字段
-        link_value = str(new_data.get('link', '')) if not pd.isna(new_data.get('link')) else None
-        existing_task.link = link_value if link_value != '' else None
-        
-        # 处理 link_second 字段
-        link_second_value = str(new_data.get('link_second', '')) if not pd.isna(new_data.get('link_second')) else None
-        existing_task.link_second = link_second_value if link_second_value != '' else None
-        
-        # updated_at 会自动更新
-
     def execute_import(self):
-        """执行批量导入（支持更新模式）"""
+        """执行批量导入（支持更新模式，在后台线程中分块提交）"""
         if self.current_data is None:
             self.show_message("提示", "请先选择并解析文件", "warning")
             return
         
-        # 再次验证
-        if not all(result['valid'] for result in self.validation_results):
+        # 再次验证（存在失败项时不允许导入）
+        if self.validation_results:
             self.show_message("错误", "数据验证失败，无法导入", "error")
             return
         
+        # 计算文件内重复统计
+        file_duplicate_count = 0
+        if self.duplicate_results:
+            file_duplicate_count = sum(dup['count'] for dup in self.duplicate_results) - len(self.duplicate_results)
+            # 减去每组保留的最后一条，剩下的就是被覆盖的数量
+        
+        self.cancel_event.clear()
+        self.set_job_running(True)
+        self.status_label.config(text="正在导入...", foreground='blue')
+        threading.Thread(
+            target=self._import_worker,
+            args=(self.current_data, self.file_path_var.get(), file_duplicate_count),
+            daemon=True
+        ).start()
+    
+    def _import_worker(self, df, file_path, file_duplicate_count):
+        """
+        后台导入工作线程：每 IMPORT_CHUNK_SIZE 行一个事务，
+        单个分块失败只回滚该分块，取消时在当前分块提交后停止
+        """
+        summary = {
+            'file_path': file_path,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'total_rows': len(df),
+            'processed_rows': 0,
+            'cancelled': False,
+            'file_duplicate_count': file_duplicate_count,
+            'insert_details': [],
+            'major_update_details': [],
+            'minor_update_details': [],
+            'error_details': [],
+        }
+        
         try:
-            insert_count = 0  # 新增记录数
-            major_update_count = 0  # 重要更新数（清空关联数据）
-            minor_update_count = 0  # 一般更新数（仅更新字段）
-            error_count = 0
-            
-            # 记录详细信息
-            insert_details = []  # 新增记录详情
-            major_update_details = []  # 重要更新详情
-            minor_update_details = []  # 一般更新详情
-            error_details = []  # 错误详情
-            
-            # 计算文件内重复统计
-            file_duplicate_count = 0
-            if self.duplicate_results:
-                file_duplicate_count = sum(dup['count'] for dup in self.duplicate_results) - len(self.duplicate_results)
-                # 减去每组保留的最后一条，剩下的就是被覆盖的数量
-            
-            with self.get_db_session() as session:
-                for index, row in self.current_data.iterrows():
-                    try:
-                        # 处理 group 字段默认值
-                        group = row.get('group', '默认组')
-                        if pd.isna(group) or str(group).strip() == '':
-                            group = '默认组'
-                        
-                        # 查找现有记录
-                        existing_task = session.query(Task).filter_by(
-                            league=str(row['league']),
-                            year=str(row['year']),
-                            group=str(group)
-                        ).first()
-                        
-                        if existing_task:
-                            # 检查是否有核心字段变更
-                            has_changes, change_details = self.has_core_field_changes(existing_task, row)
-                            
-                            if has_changes:
-                                # 清空关联数据
-                                self.clear_related_data(session, existing_task.id)
-                                # 更新任务字段
-                                self.update_task_fields(existing_task, row, group)
-                                major_update_count += 1
-                                major_update_details.append({
-                                    'row': index + 1,
-                                    'league': row['league'],
-                                    'year': row['year'],
-                                    'group': group,
-                                    'changes': change_details
-                                })
-                                self.logger.info(f"第{index + 1}行重要更新: {row['league']}-{row['year']}-{group}, 变更: {'; '.join(change_details)}")
-                            else:
-                                # 只是一般更新
-                                self.update_task_fields(existing_task, row, group)
-                                minor_update_count += 1
-                                minor_update_details.append({
-                                    'row': index + 1,
-                                    'league': row['league'],
-                                    'year': row['year'],
-                                    'group': group
-                                })
-                                self.logger.debug(f"第{index + 1}行一般更新: {row['league']}-{row['year']}-{group}")
-                        else:
-                            # 创建新任务
-                            new_task = Task(
-                                level=int(row['level']),
-                                event=str(row['event']),
-                                country=str(row['country']),
-                                league=str(row['league']),
-                                type=str(row['type']),
-                                year=str(row['year']),
-                                group=str(group),
-                                link=str(row.get('link', '')) if not pd.isna(row.get('link')) and str(row.get('link', '')) != '' else None,
-                                link_second=str(row.get('link_second', '')) if not pd.isna(row.get('link_second')) and str(row.get('link_second', '')) != '' else None
-                            )
-                            session.add(new_task)
-                            insert_count += 1
-                            insert_details.append({
-                                'row': index + 1,
-                                'league': row['league'],
-                                'year': row['year'],
-                                'group': group
-                            })
-                            self.logger.info(f"第{index + 1}行新增: {row['league']}-{row['year']}-{group}")
-                        
-                    except Exception as e:
-                        error_count += 1
-                        error_details.append({
-                            'row': index + 1,
-                            'league': row.get('league', '未知'),
-                            'year': row.get('year', '未知'),
-                            'group': group,
+            for start in range(0, len(df), self.IMPORT_CHUNK_SIZE):
+                if self.cancel_event.is_set():
+                    summary['cancelled'] = True
+                    break
+                
+                chunk = df.iloc[start:start + self.IMPORT_CHUNK_SIZE]
+                try:
+                    # 一次加载已有任务，在内存中分类后批量写入
+                    with self.get_db_session() as session:
+                        chunk_result = import_tasks(session, chunk)
+                    for key in ('insert_details', 'major_update_details', 'minor_update_details', 'error_details'):
+                        summary[key].extend(chunk_result[key])
+                except Exception as e:
+                    # 该分块已回滚，整块记为错误后继续处理后续分块
+                    self.logger.error(f"第{start + 1}-{start + len(chunk)}行导入失败: {e}")
+                    summary['error_details'].extend(
+                        {
+                            'row': int(index) + 1,
+                            'league': str(row.get('league', '未知')),
+                            'year': str(row.get('year', '未知')),
+                            'group': str(row.get('group', '')),
                             'error': str(e)
-                        })
-                        self.logger.error(f"第{index + 1}行处理失败: {e}")
+                        }
+                        for index, row in chunk.iterrows()
+                    )
                 
-                # 提交事务
-                session.commit()
-            
-            # 在验证结果文本框中显示导入详情
-            self.display_import_results(insert_details, major_update_details, minor_update_details, error_details, file_duplicate_count)
-            
-            # 显示简化的结果消息
-            result_parts = [f"新增: {insert_count}条", f"重要更新: {major_update_count}条", f"一般更新: {minor_update_count}条"]
-            if file_duplicate_count > 0:
-                result_parts.append(f"文件内重复: {file_duplicate_count}条")
-            if error_count > 0:
-                result_parts.append(f"错误: {error_count}条")
+                summary['processed_rows'] = start + len(chunk)
+                self.frame.after(0, lambda done=summary['processed_rows']: self.status_label.config(
+                    text=f"正在导入 {done}/{len(df)} 行...", foreground='blue'
+                ))
             
-            result_msg = ", ".join(result_parts)
-            self.show_message("导入完成", f"批量导入完成！{result_msg}\n\n详细信息请查看下方验证结果区域。", "info" if error_count == 0 else "warning")
-            self.status_label.config(text=f"导入完成！{result_msg}", foreground='green')
-            
-            # 记录日志
-            log_parts = [f"新增{insert_count}条", f"重要更新{major_update_count}条", f"一般更新{minor_update_count}条"]
-            if file_duplicate_count > 0:
-                log_parts.append(f"文件内重复{file_duplicate_count}条")
-            if error_count > 0:
-                log_parts.append(f"错误{error_count}条")
-            
-            self.log_action("批量导入", "，".join(log_parts))
+            summary['finished_at'] = datetime.now().isoformat(timespec='seconds')
+            summary_path = self.save_import_summary(summary)
+            self.frame.after(0, lambda: self._import_completed(summary, summary_path))
             
         except Exception as e:
             self.logger.error(f"批量导入失败: {e}")
-            self.show_message("错误", f"导入失败: {str(e)}", "error")
+            error_message = str(e)
+            self.frame.after(0, lambda: self._job_failed("导入失败", error_message, "导入失败"))
+        
+        finally:
+            # 已提交的分块会改变任务数据（包括取消或失败时），重要更新还会清空任务的队伍和积分榜
+            task_stats_cache.invalidate()
+            task_detail_cache.invalidate()
+    
+    def save_import_summary(self, summary):
+        """
+        保存导入摘要到日志目录，便于事后核对
+        
+        Returns:
+            str: 摘要文件路径，保存失败时返回 None
+        """
+        try:
+            os.makedirs("logs", exist_ok=True)
+            summary_path = os.path.join("logs", f"import_summary_{datetime.now():%Y%m%d_%H%M%S_%f}.json")
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+            return summary_path
+        except Exception as e:
+            self.logger.error(f"保存导入摘要失败: {e}")
+            return None
+    
+    def _import_completed(self, summary, summary_path):
+        """导入完成后的UI更新（在主线程中调用）"""
+        self.set_job_running(False)
+        
+        insert_details = summary['insert_details']
+        major_update_details = summary['major_update_details']
+        minor_update_details = summary['minor_update_details']
+        error_details = summary['error_details']
+        file_duplicate_count = summary['file_duplicate_count']
+        
+        for detail in major_update_details:
+            self.logger.info(f"第{detail['row']}行重要更新: {detail['league']}-{detail['year']}-{detail['group']}, 变更: {'; '.join(detail['changes'])}")
+        
+        # 在验证结果文本框中显示导入详情
+        self.display_import_results(insert_details, major_update_details, minor_update_details, error_details, file_duplicate_count)
+        
+        # 显示简化的结果消息
+        result_parts = [f"新增: {len(insert_details)}条", f"重要更新: {len(major_update_details)}条", f"一般更新: {len(minor_update_details)}条"]
+        if file_duplicate_count > 0:
+            result_parts.append(f"文件内重复: {file_duplicate_count}条")
+        if error_details:
+            result_parts.append(f"错误: {len(error_details)}条")
+        result_msg = ", ".join(result_parts)
+        
+        title = "导入完成"
+        if summary['cancelled']:
+            title = "导入已取消"
+            result_msg = f"已处理 {summary['processed_rows']}/{summary['total_rows']} 行（已处理部分已保存），{result_msg}"
+        summary_note = f"\n\n导入摘要已保存到: {summary_path}" if summary_path else ""
+        
+        self.show_message(
+            title,
+            f"批量导入{'已取消' if summary['cancelled'] else '完成'}！{result_msg}\n\n详细信息请查看下方验证结果区域。{summary_note}",
+            "info" if not error_details and not summary['cancelled'] else "warning"
+        )
+        self.status_label.config(
+            text=f"{title}！{result_msg}",
+            foreground='orange' if summary['cancelled'] else 'green'
+        )
+        
+        # 记录日志
+        log_parts = [f"新增{len(insert_details)}条", f"重要更新{len(major_update_details)}条", f"一般更新{len(minor_update_details)}条"]
+        if file_duplicate_count > 0:
+            log_parts.append(f"文件内重复{file_duplicate_count}条")
+        if error_details:
+            log_parts.append(f"错误{len(error_details)}条")
+        if summary['cancelled']:
+            log_parts.append(f"已取消（处理{summary['processed_rows']}/{summary['total_rows']}行）")
+        
+        self.log_action("批量导入", "，".join(log_parts))
     
     def clear_import_data(self, clear_file_path=False):
         """清空导入数据"""
@@ -806,52 +865,45 @@ class BatchImportPage(BasePage):
         return df_renamed
     
     def detect_duplicates_in_file(self, df):
-        """检测文件内重复数据"""
-        duplicates = []
-        
-        # 标准化处理数据（模拟导入时的逻辑）
-        df_processed = df.copy()
-        
-        # 处理 group 字段默认值
-        df_processed['group_processed'] = df_processed.apply(
-            lambda row: '默认组' if (pd.isna(row.get('group')) or str(row.get('group', '')).strip() == '') 
-                        else str(row.get('group')), axis=1
-        )
+        """
+        检测文件内重复数据（按导入时的 (league, year, group) 组合判断）
+        
+        Returns:
+            list: 每个重复组合一项 {'league', 'year', 'group', 'row_numbers', 'count', 'rows_data'}
+        """
+        # 只构造组合键所需的列，分组为空时使用导入时的默认分组
+        if 'group' in df.columns:
+            group_text = df['group'].astype(str)
+            group_empty = df['group'].isna() | group_text.str.strip().eq('')
+            group_text = group_text.mask(group_empty, DEFAULT_GROUP)
+        else:
+            group_text = pd.Series(DEFAULT_GROUP, index=df.index)
         
-        # 创建唯一键
-        df_processed['unique_key'] = (
-            df_processed['league'].astype(str) + '-' + 
-            df_processed['year'].astype(str) + '-' + 
-            df_processed['group_processed'].astype(str)
-        )
+        keys = pd.DataFrame({
+            'league': df['league'].astype(str),
+            'year': df['year'].astype(str),
+            'group': group_text,
+        }, index=df.index)
         
-        # 查找重复项
-        duplicate_keys = df_processed['unique_key'].duplicated(keep=False)
+        duplicate_mask = keys.duplicated(subset=['league', 'year', 'group'], keep=False)
+        if not duplicate_mask.any():
+            return []
         
-        if duplicate_keys.any():
-            # 按唯一键分组，找出重复组合
-            grouped = df_processed[duplicate_keys].groupby('unique_key')
-            
-            for unique_key, group in grouped:
-                if len(group) > 1:
-                    # 解析唯一键
-                    key_parts = unique_key.split('-')
-                    if len(key_parts) >= 3:
-                        league = key_parts[0]
-                        year = '-'.join(key_parts[1:-1])  # 处理年份中可能包含的'-'
-                        group_name = key_parts[-1]
-                        
-                        # 记录重复信息
-                        row_numbers = [idx + 1 for idx in group.index]  # 转换为1基索引
-                        duplicates.append({
-                            'league': league,
-                            'year': year, 
-                            'group': group_name,
-                            'unique_key': unique_key,
-                            'row_numbers': row_numbers,
-                            'count': len(row_numbers),
-                            'rows_data': group[['league', 'year', 'group_processed', 'event', 'country']].to_dict('records')
-                        })
+        duplicate_keys = keys[duplicate_mask]
+        duplicates = []
+        for (league, year, group_name), group in duplicate_keys.groupby(['league', 'year', 'group'], sort=True):
+            row_numbers = [idx + 1 for idx in group.index]  # 转换为1基索引
+            rows_data = df.loc[group.index, ['event', 'country']].assign(
+                league=league, year=year, group_processed=group_name
+            )
+            duplicates.append({
+                'league': league,
+                'year': year,
+                'group': group_name,
+                'row_numbers': row_numbers,
+                'count': len(row_numbers),
+                'rows_data': rows_data[['league', 'year', 'group_processed', 'event', 'country']].to_dict('records')
+            })
         
         return duplicates
     
@@ -11,10 +11,21 @@ import tkinter as tk
 from datetime import datetime
 from tkinter import scrolledtext, ttk
 
-import requests
-
 from models import JsDataRaw, Match, MatchBasic, Standings, Task, Team
 from .base_page import BasePage
+from .utils.crawl_log import CRAWL_LOG_LEVELS, CrawlLogBuffer
+from .utils.format_output import refresh_standings_export
+from .utils.task_detail_cache import task_detail_cache
+from .utils.task_stats import task_stats_cache
+from .utils.ui_event_bus import UIEventBus
+from .utils.virtual_task_list import VirtualTaskList
+
+
+# 日志级别对应的颜色标签
+LOG_LEVEL_TAGS = {"ERROR": "error", "SUCCESS": "success"}
+
+# 日志级别筛选选项
+LOG_FILTER_ALL = "全部"
 
 
 class DataCrawlPage(BasePage):
@@ -34,6 +45,9 @@ class DataCrawlPage(BasePage):
         # 日志显示区域
         self.create_log_display()
 
+        # 界面事件总线：爬取线程只投递事件，由主线程按固定帧率批量渲染
+        self.create_ui_event_bus()
+
         # 初始化状态
         self.is_crawling = False
         self.crawl_thread = None
@@ -132,8 +146,14 @@ class DataCrawlPage(BasePage):
         )
         help_label.pack(side=tk.RIGHT)
         
-        # 初始化完整项目列表（用于搜索状态管理）
-        self.all_task_items = []
+        # 分页加载任务列表（搜索在数据库中过滤）
+        task_columns = [Task.id, Task.league, Task.year, Task.country, Task.type, Task.group]
+        self.task_list = VirtualTaskList(
+            self.task_tree, task_scrollbar_y, self.get_db_session,
+            columns=task_columns,
+            format_row=lambda row: (row.id, row.league, row.year, row.country, row.type, row.group),
+            search_columns=task_columns
+        )
         
         # 绑定选择事件以更新统计信息
         self.task_tree.bind('<<TreeviewSelect>>', self.on_task_selection_changed)
@@ -226,6 +246,11 @@ class DataCrawlPage(BasePage):
         log_frame = ttk.LabelFrame(self.frame, text="爬取日志", padding=10)
         log_frame.pack(fill=tk.BOTH, expand=True)
 
+        # 界面只显示最近的日志，完整日志写入日志文件
+        self.log_buffer = CrawlLogBuffer()
+        # 是否正在显示日志文件的筛选结果（此时新日志只进入缓冲，不追加到界面）
+        self.log_filter_active = False
+
         # 日志文本区域
         self.log_text = scrolledtext.ScrolledText(
             log_frame,
@@ -246,30 +271,70 @@ class DataCrawlPage(BasePage):
         save_log_btn = ttk.Button(log_control_frame, text="保存日志", command=self.save_log)
         save_log_btn.pack(side=tk.LEFT, padx=(10, 0))
 
+        # 日志筛选：按级别和内容搜索完整日志文件
+        ttk.Label(log_control_frame, text="级别:").pack(side=tk.LEFT, padx=(20, 5))
+        self.log_level_var = tk.StringVar(value=LOG_FILTER_ALL)
+        log_level_combo = ttk.Combobox(
+            log_control_frame,
+            textvariable=self.log_level_var,
+            values=[LOG_FILTER_ALL] + list(CRAWL_LOG_LEVELS),
+            state='readonly',
+            width=10
+        )
+        log_level_combo.pack(side=tk.LEFT)
+
+        self.log_search_var = tk.StringVar()
+        log_search_entry = ttk.Entry(log_control_frame, textvariable=self.log_search_var, width=25)
+        log_search_entry.pack(side=tk.LEFT, padx=(10, 0))
+        log_search_entry.bind('<Return>', lambda event: self.filter_logs())
+
+        self.log_filter_btn = ttk.Button(log_control_frame, text="筛选", command=self.filter_logs)
+        self.log_filter_btn.pack(side=tk.LEFT, padx=(5, 0))
+
+        show_latest_btn = ttk.Button(log_control_frame, text="显示最新", command=self.show_latest_logs)
+        show_latest_btn.pack(side=tk.LEFT, padx=(5, 0))
+
+        self.log_status_label = ttk.Label(log_control_frame, text="", foreground='gray')
+        self.log_status_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        # 日志颜色标签只需配置一次
+        self.log_text.tag_config("error", foreground="red")
+        self.log_text.tag_config("success", foreground="green")
+
+    def create_ui_event_bus(self):
+        """创建界面事件总线并注册各类事件的渲染函数"""
+        self.ui_events = UIEventBus(self.frame)
+        self.ui_events.register('log', self.render_logs)
+        self.ui_events.register('overall_progress', self.render_overall_progress, coalesce=True)
+        self.ui_events.register('current_task', self.render_current_task, coalesce=True)
+        self.ui_events.register('crawl_stats', self.render_crawl_stats, coalesce=True)
+        self.ui_events.start()
+
+    def render_overall_progress(self, value):
+        """渲染整体进度"""
+        self.overall_progress['value'] = value
+
+    def render_current_task(self, state):
+        """渲染当前任务：state 为 (文本, 是否正在爬取)"""
+        text, running = state
+        self.current_task_label.config(text=text)
+        if running:
+            self.current_progress.start()
+        else:
+            self.current_progress.stop()
+
+    def render_crawl_stats(self, state):
+        """渲染统计信息：state 为 (统计文本, 用时文本)"""
+        stats_text, time_text = state
+        self.stats_label.config(text=stats_text)
+        self.time_label.config(text=time_text)
+
     def refresh_task_list(self):
         """刷新任务列表"""
         try:
-            # 清空现有数据和完整项目列表
-            for item in self.task_tree.get_children():
-                self.task_tree.delete(item)
-            self.all_task_items = []
-
-            with self.get_db_session() as session:
-                tasks = session.query(Task).order_by(Task.created_at.desc()).all()
-
-                for task in tasks:
-                    item_id = self.task_tree.insert('', 'end', values=(
-                        task.id,
-                        task.league,
-                        task.year,
-                        task.country,
-                        task.type,
-                        task.group
-                    ))
-                    # 保存到完整项目列表
-                    self.all_task_items.append(item_id)
-
-            self.add_log(f"加载了 {len(tasks)} 个任务")
+            # 只加载第一页，滚动到底部时继续加载
+            matched_count = self.task_list.refresh()
+            self.add_log(f"加载了 {self.task_list.loaded_count}/{matched_count} 个任务")
         except Exception as e:
             self.logger.error(f"刷新任务列表失败: {e}")
             self.add_log(f"刷新任务列表失败: {e}", "ERROR")
@@ -277,15 +342,20 @@ class DataCrawlPage(BasePage):
         # 更新统计信息
         self.update_stats()
     
-    def update_stats(self):
-        """更新统计信息显示"""
+    def update_stats(self, cached_only=False):
+        """
+        更新统计信息显示
+        
+        Args:
+            cached_only: 只读取统计缓存（选择变化时使用，不访问数据库）
+        """
         try:
-            # 获取数据库总数
-            with self.get_db_session() as session:
-                total_count = session.query(Task).count()
+            # 获取任务总数（统计缓存在任务数据写入后失效）
+            stats = task_stats_cache.peek() if cached_only else task_stats_cache.get(self.get_db_session)
+            total_count = stats['total'] if stats else '-'
             
-            # 获取当前显示数量
-            visible_count = len(self.task_tree.get_children())
+            # 获取当前显示数量（匹配搜索的任务数，包含尚未加载的）
+            visible_count = self.task_list.matched_count
             
             # 获取选中数量
             selected_count = len(self.task_tree.selection())
@@ -300,12 +370,13 @@ class DataCrawlPage(BasePage):
     
     def on_task_selection_changed(self, event=None):
         """任务选择变化事件处理"""
-        self.update_stats()
+        self.update_stats(cached_only=True)
 
     def select_all_tasks(self):
         """全选所有可见任务"""
         try:
-            # 获取所有可见项目（考虑搜索过滤）
+            # 获取所有可见项目（考虑搜索过滤，先加载剩余页）
+            self.task_list.load_all()
             all_items = self.task_tree.get_children()
             if all_items:
                 # 检查当前是否全选
@@ -330,7 +401,8 @@ class DataCrawlPage(BasePage):
     def invert_selection(self):
         """反选任务"""
         try:
-            # 获取当前选中项目和所有可见项目
+            # 获取当前选中项目和所有可见项目（先加载剩余页）
+            self.task_list.load_all()
             current_selection = set(self.task_tree.selection())
             all_items = set(self.task_tree.get_children())
             
@@ -384,13 +456,11 @@ class DataCrawlPage(BasePage):
                 self.add_log(f"未找到年份包含 '{year_input}' 的任务", "INFO")
                 return
             
-            # 在当前显示的项目中查找匹配的任务并选中
-            new_selections = []
-            for item in self.task_tree.get_children():
-                values = self.task_tree.item(item)['values']
-                task_id = values[0]  # ID在第一列
-                if task_id in matching_task_ids:
-                    new_selections.append(item)
+            # 在当前显示的项目中查找匹配的任务并选中（先加载剩余页）
+            self.task_list.load_all()
+            new_selections = [
+                item for item in map(self.task_list.get_item, matching_task_ids) if item is not None
+            ]
             
             # 增量选中：保持现有选择 + 新增匹配项目
             final_selection = current_selection.union(set(new_selections))
@@ -428,40 +498,12 @@ class DataCrawlPage(BasePage):
             return []
 
     def on_search_change(self, *args):
-        """搜索框内容变化事件"""
-        search_text = self.search_var.get().lower()
-        
-        # 首先重新显示所有项目（解决搜索状态管理问题）
-        for item in self.all_task_items:
-            try:
-                self.task_tree.reattach(item, '', 'end')
-            except tk.TclError:
-                # 如果项目已经被删除或不存在，跳过
-                pass
-        
-        # 如果搜索框为空，显示所有项目
-        if not search_text:
-            self.update_stats()
-            return
-        
-        # 过滤显示匹配的项目，使用完整项目列表确保所有数据都参与搜索
-        for item in self.all_task_items:
-            try:
-                values = self.task_tree.item(item)['values']
-                # 在所有字段中搜索：ID、联赛名称、年份、国家、类型、分组
-                if any(search_text in str(value).lower() for value in values):
-                    self.task_tree.reattach(item, '', 'end')
-                else:
-                    self.task_tree.detach(item)
-            except tk.TclError:
-                # 如果项目已经被删除或不存在，跳过
-                pass
-        
-        # 更新统计信息
-        self.update_stats()
+        """搜索框内容变化事件：防抖后在内存搜索索引中过滤，只更新列表差异"""
+        self.task_list.search(self.search_var.get(), on_applied=self.update_stats)
 
     def start_crawl_all(self):
         """全量爬取"""
+        self.task_list.load_all()
         all_items = self.task_tree.get_children()
         if not all_items:
             self.show_message("提示", "没有可爬取的任务", "warning")
@@ -471,18 +513,7 @@ class DataCrawlPage(BasePage):
         self.task_tree.selection_set(all_items)
         selected_items = self.task_tree.selection()
 
-        self.is_crawling = True
-        self.exception_tasks = []  # 清空异常任务列表
-        self.start_all_btn.config(state=tk.DISABLED)
-        self.start_btn.config(state=tk.DISABLED)
-        self.pause_btn.config(state=tk.NORMAL)
-        self.stop_btn.config(state=tk.NORMAL)
-
-        # 启动爬取线程
-        self.crawl_thread = threading.Thread(target=self.crawl_worker, args=(selected_items,))
-        self.crawl_thread.daemon = True
-        self.crawl_thread.start()
-
+        self.begin_crawl(selected_items)
         self.add_log(f"开始全量爬取 {len(selected_items)} 个任务")
         self.log_action("全量爬取", f"任务数: {len(selected_items)}")
 
@@ -493,6 +524,22 @@ class DataCrawlPage(BasePage):
             self.show_message("提示", "请选择要爬取的任务", "warning")
             return
 
+        self.begin_crawl(selected_items)
+        self.add_log(f"开始爬取选中 {len(selected_items)} 个任务")
+        self.log_action("爬取选中", f"任务数: {len(selected_items)}")
+
+    def begin_crawl(self, selected_items):
+        """在主线程读取任务信息和爬取设置，然后启动爬取线程"""
+        crawl_tasks = []
+        for item in selected_items:
+            row = self.task_list.get_row(item)
+            crawl_tasks.append((row.id, f"[{row.id}] {row.league} ({row.year}) - {row.country}"))
+
+        # 爬取线程不读取 Tk 变量，启动时保存设置
+        self.crawl_delay = self.delay_var.get()
+        self.crawl_basic_info = self.crawl_basic_info_var.get()
+        self.basic_info_delay = self.basic_info_delay_var.get()
+
         self.is_crawling = True
         self.exception_tasks = []  # 清空异常任务列表
         self.start_all_btn.config(state=tk.DISABLED)
@@ -501,12 +548,16 @@ class DataCrawlPage(BasePage):
         self.stop_btn.config(state=tk.NORMAL)
 
         # 启动爬取线程
-        self.crawl_thread = threading.Thread(target=self.crawl_worker, args=(selected_items,))
+        self.crawl_thread = threading.Thread(target=self.crawl_worker, args=(crawl_tasks,))
         self.crawl_thread.daemon = True
         self.crawl_thread.start()
 
-        self.add_log(f"开始爬取选中 {len(selected_items)} 个任务")
-        self.log_action("爬取选中", f"任务数: {len(selected_items)}")
+    def finish_crawl(self):
+        """爬取线程结束后恢复按钮状态（主线程）"""
+        self.start_all_btn.config(state=tk.NORMAL)
+        self.start_btn.config(state=tk.NORMAL)
+        self.pause_btn.config(state=tk.DISABLED)
+        self.stop_btn.config(state=tk.DISABLED)
 
     def pause_crawl(self):
         """暂停爬取"""
@@ -516,49 +567,33 @@ class DataCrawlPage(BasePage):
     def stop_crawl(self):
         """停止爬取"""
         self.is_crawling = False
-        self.start_all_btn.config(state=tk.NORMAL)
-        self.start_btn.config(state=tk.NORMAL)
-        self.pause_btn.config(state=tk.DISABLED)
-        self.stop_btn.config(state=tk.DISABLED)
-
-        self.current_task_label.config(text="已停止")
-        self.current_progress.stop()
+        self.finish_crawl()
+        self.ui_events.post('current_task', ("已停止", False))
 
         self.add_log("爬取已停止")
         self.log_action("停止爬取")
 
-    def crawl_worker(self, selected_items):
-        """爬取工作线程"""
+    def crawl_worker(self, crawl_tasks):
+        """爬取工作线程（界面更新全部通过事件总线投递到主线程）"""
         start_time = time.time()
-        total_tasks = len(selected_items)
+        total_tasks = len(crawl_tasks)
         success_count = 0
         failed_count = 0
 
         try:
-            for i, item in enumerate(selected_items):
+            for i, (task_id, task_text) in enumerate(crawl_tasks):
                 if not self.is_crawling:
                     break
 
-                # 更新整体进度
-                progress_value = (i / total_tasks) * 100
-                self.overall_progress['value'] = progress_value
-
-                # 获取任务信息
-                values = self.task_tree.item(item)['values']
-                task_id = values[0]
-                league_name = values[1]
-                year = values[2]
-                country = values[3]
-                task_text = f"[{task_id}] {league_name} ({year}) - {country}"
-
-                # 更新当前任务显示
-                self.current_task_label.config(text=f"正在爬取: {task_text}")
-                self.current_progress.start()
+                # 更新整体进度和当前任务显示
+                self.ui_events.post('overall_progress', (i / total_tasks) * 100)
+                self.ui_events.post('current_task', (f"正在爬取: {task_text}", True))
 
                 self.add_log(f"开始爬取任务 {task_id}: {task_text}")
 
-                # 执行真实爬取过程
+                # 执行真实爬取过程（爬取会改写该任务的赛程和积分榜，移除其详情缓存）
                 crawl_success = self.crawl_task(task_id)
+                task_detail_cache.invalidate([task_id])
 
                 if crawl_success:
                     success_count += 1
@@ -570,29 +605,27 @@ class DataCrawlPage(BasePage):
                 # 更新统计信息
                 elapsed_time = time.time() - start_time
                 time_str = time.strftime('%H:%M:%S', time.gmtime(elapsed_time))
-                self.stats_label.config(text=f"成功: {success_count} | 失败: {failed_count} | 总计: {i + 1}/{total_tasks}")
-                self.time_label.config(text=f"用时: {time_str}")
+                self.ui_events.post('crawl_stats', (
+                    f"成功: {success_count} | 失败: {failed_count} | 总计: {i + 1}/{total_tasks}",
+                    f"用时: {time_str}"
+                ))
 
                 # 延迟
-                time.sleep(self.delay_var.get())
+                time.sleep(self.crawl_delay)
 
         finally:
-            # 完成爬取
-            self.overall_progress['value'] = 100
-            self.current_progress.stop()
-            self.current_task_label.config(text="爬取完成")
-
-            self.start_all_btn.config(state=tk.NORMAL)
-            self.start_btn.config(state=tk.NORMAL)
-            self.pause_btn.config(state=tk.DISABLED)
-            self.stop_btn.config(state=tk.DISABLED)
+            # 完成爬取（爬取会更新任务的最后爬取时间）
+            task_stats_cache.invalidate()
+            self.ui_events.post('overall_progress', 100)
+            self.ui_events.post('current_task', ("爬取完成", False))
+            self.ui_events.call(self.finish_crawl)
 
             total_time = time.time() - start_time
             time_str = time.strftime('%H:%M:%S', time.gmtime(total_time))
             self.add_log(f"爬取完成! 成功: {success_count}, 失败: {failed_count}, 总用时: {time_str}")
-            
-            # 处理异常任务
-            self.handle_exception_tasks()
+
+            # 处理异常任务（会弹出提示框，需在主线程执行）
+            self.ui_events.call(self.handle_exception_tasks)
 
     def crawl_task(self, task_id):
         """执行真实的任务爬取"""
@@ -618,6 +651,8 @@ class DataCrawlPage(BasePage):
 
                 if success:
                     task.last_crawl_time = datetime.now()
+                    # 刷新积分榜导出快照，与爬取结果在同一事务中提交
+                    refresh_standings_export(session, task.id)
                     session.commit()
                     self.logger.info(f"任务 {task_id} 爬取成功")
                 else:
@@ -791,6 +826,9 @@ class DataCrawlPage(BasePage):
 
     def fetch_html(self, url):
         """获取HTML页面内容"""
+        # requests 只在实际发起请求时导入，缩短程序启动时间
+        import requests
+
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36'
@@ -819,6 +857,8 @@ class DataCrawlPage(BasePage):
 
     def fetch_js_data(self, js_url, version, max_retries=3, retry_delay_min=5, retry_delay_max=10):
         """获取JS数据内容，支持443错误重试"""
+        import requests
+
         params = {"version": version}
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36'
@@ -1068,84 +1108,62 @@ class DataCrawlPage(BasePage):
         return result
 
     def save_team_data(self, team_data, task, js_data_id, session):
-        """保存球队数据，采用覆盖式更新"""
-        updated_count = 0
-        created_count = 0
-
+        """保存球队数据，采用覆盖式更新（按 task_id + team_code 唯一键 upsert）"""
+        team_rows = []
         for team_info in team_data:
-            # 检查是否已存在（task_id + team_code 复合主键）
-            existing_team = session.query(Team).filter(
-                Team.task_id == task.id,
-                Team.team_code == team_info["team_code"]
-            ).first()
-
-            if existing_team:
-                # 覆盖式更新现有记录
-                existing_team.js_data_id = js_data_id
-                existing_team.home_name_cn = team_info.get("home_name_cn")
-                existing_team.home_name_tw = team_info.get("home_name_tw")
-                existing_team.home_name_en = team_info.get("home_name_en")
-                existing_team.image_path = team_info.get("image_path")
-                existing_team.group_id = team_info.get("group_id")
-                # round_num、sclass_id 统一转为字符串以匹配模型定义（SQLite 宽类型会导致混用）
-                rnd = team_info.get("round_num")
-                existing_team.round_num = str(rnd) if rnd is not None else None
-                scls = team_info.get("sclass_id")
-                existing_team.sclass_id = str(scls) if scls is not None else None
-                existing_team.unknown1 = team_info.get("unknown1")
-                updated_count += 1
-            else:
-                # 新建记录
-                team = Team(
-                    task_id=task.id,
-                    team_code=team_info["team_code"],
-                    js_data_id=js_data_id,
-                    home_name_cn=team_info.get("home_name_cn"),
-                    home_name_tw=team_info.get("home_name_tw"),
-                    home_name_en=team_info.get("home_name_en"),
-                    image_path=team_info.get("image_path"),
-                    group_id=team_info.get("group_id"),
-                    round_num=(str(team_info.get("round_num")) if team_info.get("round_num") is not None else None),
-                    sclass_id=(str(team_info.get("sclass_id")) if team_info.get("sclass_id") is not None else None),
-                    unknown1=team_info.get("unknown1")
-                )
-                session.add(team)
-                created_count += 1
-
-        self.logger.info(f"球队数据处理完成: 新建 {created_count} 个，更新 {updated_count} 个")
+            # round_num、sclass_id 统一转为字符串以匹配模型定义（SQLite 宽类型会导致混用）
+            rnd = team_info.get("round_num")
+            scls = team_info.get("sclass_id")
+            team_rows.append({
+                'task_id': task.id,
+                'team_code': team_info["team_code"],
+                'js_data_id': js_data_id,
+                'home_name_cn': team_info.get("home_name_cn"),
+                'home_name_tw': team_info.get("home_name_tw"),
+                'home_name_en': team_info.get("home_name_en"),
+                'image_path': team_info.get("image_path"),
+                'group_id': team_info.get("group_id"),
+                'round_num': str(rnd) if rnd is not None else None,
+                'sclass_id': str(scls) if scls is not None else None,
+                'unknown1': team_info.get("unknown1"),
+            })
+
+        saved_count = self.db_manager.upsert(
+            session, Team, team_rows,
+            index_elements=['task_id', 'team_code'],
+            update_columns=['js_data_id', 'home_name_cn', 'home_name_tw', 'home_name_en', 'image_path',
+                            'group_id', 'round_num', 'sclass_id', 'unknown1'],
+        )
+
+        self.logger.info(f"球队数据处理完成: 写入 {saved_count} 个")
 
     def save_match_data(self, match_data, task, js_data_id, session):
-        """保存比赛数据到Match表"""
+        """保存比赛数据到Match表（已存在的比赛保持不变）"""
         if not match_data:
             return
 
-        saved_count = 0
+        match_rows = []
         for round_num, matches in match_data.items():
             for match_info in matches:
-                # 检查是否已存在该比赛记录
-                existing_match = session.query(Match).filter(
-                    Match.match_id == match_info['match_id']
-                ).first()
+                match_rows.append({
+                    'match_id': match_info['match_id'],
+                    'task_id': task.id,
+                    'js_data_id': js_data_id,
+                    'league_id': match_info['league_id'],
+                    'round_num': match_info['round_num'],
+                    'match_time': str(match_info['match_time']) if match_info['match_time'] else None,
+                    'home_team_code': str(match_info['home_team_code']),
+                    'away_team_code': str(match_info['away_team_code']),
+                    'full_score': str(match_info['full_score']) if match_info['full_score'] else None,
+                    'half_score': str(match_info['half_score']) if match_info['half_score'] else None,
+                    'home_team_rank': match_info['home_team_rank'],
+                    'away_team_rank': match_info['away_team_rank'],
+                })
 
-                if not existing_match:
-                    match_record = Match(
-                        match_id=match_info['match_id'],
-                        task_id=task.id,
-                        js_data_id=js_data_id,
-                        league_id=match_info['league_id'],
-                        round_num=match_info['round_num'],
-                        match_time=str(match_info['match_time']) if match_info['match_time'] else None,
-                        home_team_code=str(match_info['home_team_code']),
-                        away_team_code=str(match_info['away_team_code']),
-                        full_score=str(match_info['full_score']) if match_info['full_score'] else None,
-                        half_score=str(match_info['half_score']) if match_info['half_score'] else None,
-                        home_team_rank=match_info['home_team_rank'],
-                        away_team_rank=match_info['away_team_rank']
-                    )
-                    session.add(match_record)
-                    saved_count += 1
+        # 冲突时忽略，保持“已存在则跳过”的语义
+        saved_count = self.db_manager.upsert(session, Match, match_rows, index_elements=['match_id'])
 
-        self.logger.info(f"保存了 {saved_count} 场比赛数据")
+        self.logger.info(f"提交了 {saved_count} 场比赛数据（已存在的比赛自动跳过）")
 
     def save_structured_standings(self, standings_data, task, session):
         """保存结构化积分榜数据到Standings表"""
@@ -1427,7 +1445,7 @@ class DataCrawlPage(BasePage):
     def crawl_match_basic_info(self, match_data, session):
         """爬取比赛基本信息数据"""
         # 检查是否启用基本信息爬取
-        if not self.crawl_basic_info_var.get():
+        if not self.crawl_basic_info:
             self.logger.info("基本信息爬取已禁用，跳过")
             return
             
@@ -1472,7 +1490,7 @@ class DataCrawlPage(BasePage):
                     self.add_log(f"爬取比赛 {match_id} 基本信息失败", "ERROR")
 
                 # 添加基本数据专用延迟，避免请求过快
-                basic_delay = self.basic_info_delay_var.get()
+                basic_delay = self.basic_info_delay
                 if basic_delay > 0:
                     time.sleep(basic_delay)
 
@@ -1480,6 +1498,8 @@ class DataCrawlPage(BasePage):
 
     def fetch_match_basic_info(self, match_id):
         """爬取单个比赛的基本信息"""
+        import requests
+
         try:
             # 移除可能的cn后缀
             formatted_match_id = str(match_id)
@@ -1608,6 +1628,8 @@ class DataCrawlPage(BasePage):
 
     def fetch_match_score_info(self, match_id, headers):
         """获取比赛比分信息"""
+        import requests
+
         try:
             url = "https://zq.titan007.com/default/getScheduleInfo"
             params = {
@@ -1650,36 +1672,91 @@ class DataCrawlPage(BasePage):
         return team_name.strip()
 
     def add_log(self, message, level="INFO"):
-        """添加日志信息"""
+        """添加日志信息（可在任意线程调用，写入日志文件后由事件总线批量渲染）"""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        log_entry = f"[{timestamp}] [{level}] {message}\n"
+        self.ui_events.post('log', self.log_buffer.append(message, level, timestamp))
+
+    def render_logs(self, entries):
+        """一次插入本帧的全部日志，并只滚动一次；界面超过缓冲容量时删除最早的行"""
+        if self.log_filter_active:
+            return
+        self.write_log_entries(entries[-self.log_buffer.capacity:])
+
+    def write_log_entries(self, entries, replace=False):
+        """向日志控件写入日志条目，保持不超过缓冲容量"""
+        insert_args = []
+        for log_entry, level in entries:
+            insert_args.append(log_entry)
+            insert_args.append(LOG_LEVEL_TAGS.get(level, ()))
 
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, log_entry)
-
-        # 设置颜色
-        if level == "ERROR":
-            start_line = self.log_text.index(tk.END + "-2l linestart")
-            end_line = self.log_text.index(tk.END + "-1l lineend")
-            self.log_text.tag_add("error", start_line, end_line)
-            self.log_text.tag_config("error", foreground="red")
-        elif level == "SUCCESS":
-            start_line = self.log_text.index(tk.END + "-2l linestart")
-            end_line = self.log_text.index(tk.END + "-1l lineend")
-            self.log_text.tag_add("success", start_line, end_line)
-            self.log_text.tag_config("success", foreground="green")
+        if replace:
+            self.log_text.delete(1.0, tk.END)
+        if insert_args:
+            self.log_text.insert(tk.END, *insert_args)
+
+        # 文本末尾总有一个换行，实际行数为最后索引的行号减一
+        excess = int(self.log_text.index('end-1c').split('.')[0]) - 1 - self.log_buffer.capacity
+        if excess > 0:
+            self.log_text.delete(1.0, f"{excess + 1}.0")
 
         self.log_text.config(state=tk.DISABLED)
         self.log_text.see(tk.END)
 
+    def filter_logs(self):
+        """在完整日志文件中按级别和内容筛选（后台线程读取文件）"""
+        level = self.log_level_var.get()
+        level = None if level == LOG_FILTER_ALL else level
+        search_text = self.log_search_var.get()
+        if level is None and not search_text.strip():
+            self.show_latest_logs()
+            return
+
+        self.log_filter_btn.config(state=tk.DISABLED)
+        self.log_status_label.config(text="正在搜索日志文件...")
+
+        def worker():
+            try:
+                entries, total = self.log_buffer.search(level, search_text)
+                self.ui_events.call(self.show_filtered_logs, entries, total)
+            except Exception as e:
+                self.logger.error(f"搜索爬取日志失败: {e}")
+                self.ui_events.call(self.show_filtered_logs, [], 0, str(e))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def show_filtered_logs(self, entries, total, error_message=None):
+        """显示日志文件的筛选结果"""
+        self.log_filter_btn.config(state=tk.NORMAL)
+        if error_message:
+            self.log_status_label.config(text="")
+            self.show_message("错误", f"搜索日志失败: {error_message}", "error")
+            return
+
+        self.log_filter_active = True
+        self.write_log_entries(entries, replace=True)
+        if total > len(entries):
+            self.log_status_label.config(text=f"匹配 {total} 行，显示最近 {len(entries)} 行")
+        else:
+            self.log_status_label.config(text=f"匹配 {total} 行")
+
+    def show_latest_logs(self):
+        """退出筛选，显示缓冲中的最近日志"""
+        self.log_filter_active = False
+        self.log_status_label.config(text="")
+        self.write_log_entries(self.log_buffer.entries(), replace=True)
+
     def clear_log(self):
-        """清空日志"""
+        """清空界面日志（日志文件保留，仍可筛选和保存）"""
+        self.log_buffer.clear()
+        self.log_filter_active = False
+        self.log_status_label.config(text="")
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
 
     def save_log(self):
-        """保存日志到文件"""
+        """保存完整日志（从日志文件复制）"""
         from tkinter import filedialog
 
         filename = filedialog.asksaveasfilename(
@@ -1689,9 +1766,12 @@ class DataCrawlPage(BasePage):
         )
 
         if filename:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(self.log_text.get(1.0, tk.END))
-            self.show_message("成功", f"日志已保存到: {filename}", "info")
+            try:
+                line_count = self.log_buffer.export(filename)
+                self.show_message("成功", f"日志已保存到: {filename}\n共 {line_count} 行", "info")
+            except Exception as e:
+                self.logger.error(f"保存日志失败: {e}")
+                self.show_message("错误", f"保存日志失败: {e}", "error")
 
     def handle_exception_tasks(self):
         """处理异常任务，保存到文件并提示用户"""
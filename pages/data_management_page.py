@@ -5,14 +5,17 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from datetime import datetime
-from sqlalchemy import func
 import webbrowser
 import threading
 
 from .base_page import BasePage
-from models import Task, Team, Match, Standings
-from .utils.format_output import format_output, validate_year_format
-from .utils.format_match_output import format_match_output as format_match_csv
+from models import Task, Match
+from .utils.format_output import export_output, validate_year_format
+from .utils.format_match_output import export_match_output
+from .utils.export_jobs import EXPORT_KINDS, get_available_formats, run_export_job
+from .utils.task_detail import STANDINGS_CATEGORIES, DetailLoadCancelled, load_task_detail
+from .utils.task_stats import task_stats_cache
+from .utils.virtual_task_list import VirtualTaskList
 
 
 class DataManagementPage(BasePage):
@@ -33,9 +36,12 @@ class DataManagementPage(BasePage):
         self.create_statistics_panel()
         
         # 初始化数据
-        self.all_task_items = []
         self.current_task_id = None
         self.current_round = None
+        # 任务详情加载代次，用于丢弃过期的后台加载结果
+        self.detail_generation = 0
+        # 当前任务的详情数据（切换轮次和积分榜类型时在其中过滤）
+        self.current_detail = None
         self.refresh_task_data()
         
     def create_task_search_area(self):
@@ -70,6 +76,10 @@ class DataManagementPage(BasePage):
         export_match_btn = ttk.Button(right_buttons, text="导出赛程表", command=self.export_match_data_by_year, width=10)
         export_match_btn.pack(side=tk.LEFT, padx=(0, 10))
 
+        # 批量导出按钮（多年份、多格式）
+        batch_export_btn = ttk.Button(right_buttons, text="批量导出", command=self.open_batch_export_dialog, width=10)
+        batch_export_btn.pack(side=tk.LEFT, padx=(0, 10))
+
         # 刷新按钮
         refresh_btn = ttk.Button(right_buttons, text="刷新任务", command=self.refresh_task_data, width=10)
         refresh_btn.pack(side=tk.LEFT)
@@ -131,6 +141,14 @@ class DataManagementPage(BasePage):
         # 绑定选择事件
         self.task_tree.bind('<<TreeviewSelect>>', self.on_task_selected)
         
+        # 分页加载任务列表（搜索在数据库中过滤）
+        self.task_list = VirtualTaskList(
+            self.task_tree, task_scrollbar, self.get_db_session,
+            columns=[Task.id, Task.league, Task.country, Task.year, Task.type, Task.group, Task.last_crawl_time],
+            format_row=self.format_task_row,
+            search_columns=[Task.id, Task.league, Task.country, Task.year, Task.type, Task.group]
+        )
+        
         # 统计信息栏
         stats_frame = ttk.Frame(search_frame)
         stats_frame.pack(fill=tk.X, pady=(10, 0))
@@ -424,33 +442,16 @@ class DataManagementPage(BasePage):
     
     # ========== 新的事件处理方法 ==========
     
+    def format_task_row(self, row):
+        """任务列表行显示内容"""
+        last_crawl = row.last_crawl_time.strftime('%m-%d %H:%M') if row.last_crawl_time else '未爬取'
+        return (row.id, row.league, row.country, row.year, row.type, row.group, last_crawl)
+    
     def refresh_task_data(self):
-        """刷新任务数据"""
+        """刷新任务数据（只加载第一页，滚动到底部时继续加载）"""
         try:
-            # 清空任务树
-            for item in self.task_tree.get_children():
-                self.task_tree.delete(item)
-            self.all_task_items.clear()
-            
-            # 从数据库加载任务
-            with self.get_db_session() as session:
-                tasks = session.query(Task).order_by(Task.created_at.desc()).all()
-                
-                for task in tasks:
-                    last_crawl = task.last_crawl_time.strftime('%m-%d %H:%M') if task.last_crawl_time else '未爬取'
-                    
-                    item_id = self.task_tree.insert('', 'end', values=(
-                        task.id,
-                        task.league,
-                        task.country, 
-                        task.year,
-                        task.type,
-                        task.group,
-                        last_crawl
-                    ))
-                    self.all_task_items.append(item_id)
-                
-            self.logger.info(f"加载了 {len(tasks)} 个任务")
+            matched_count = self.task_list.refresh()
+            self.logger.info(f"加载了 {self.task_list.loaded_count}/{matched_count} 个任务")
             
         except Exception as e:
             self.logger.error(f"刷新任务数据失败: {e}")
@@ -459,15 +460,20 @@ class DataManagementPage(BasePage):
         # 更新统计信息
         self.update_stats()
     
-    def update_stats(self):
-        """更新统计信息显示"""
+    def update_stats(self, cached_only=False):
+        """
+        更新统计信息显示
+        
+        Args:
+            cached_only: 只读取统计缓存（选择变化时使用，不访问数据库）
+        """
         try:
-            # 获取数据库总数
-            with self.get_db_session() as session:
-                total_count = session.query(Task).count()
+            # 获取任务总数（统计缓存在任务数据写入后失效）
+            stats = task_stats_cache.peek() if cached_only else task_stats_cache.get(self.get_db_session)
+            total_count = stats['total'] if stats else '-'
             
-            # 获取当前显示数量
-            visible_count = len(self.task_tree.get_children())
+            # 获取当前显示数量（匹配搜索的任务数，包含尚未加载的）
+            visible_count = self.task_list.matched_count
             
             # 获取选中数量
             selected_count = len(self.task_tree.selection())
@@ -481,35 +487,8 @@ class DataManagementPage(BasePage):
             self.stats_label.config(text="统计信息加载失败")
     
     def on_task_search_change(self, *args):
-        """任务搜索框内容变化事件"""
-        search_text = self.search_var.get().lower()
-        
-        # 重新显示所有项目
-        for item in self.all_task_items:
-            try:
-                self.task_tree.reattach(item, '', 'end')
-            except tk.TclError:
-                pass
-        
-        # 如果搜索框为空，显示所有项目
-        if not search_text:
-            self.update_stats()
-            return
-        
-        # 过滤显示匹配的项目
-        for item in self.all_task_items:
-            try:
-                values = self.task_tree.item(item)['values']
-                # 在所有字段中搜索
-                if any(search_text in str(value).lower() for value in values):
-                    self.task_tree.reattach(item, '', 'end')
-                else:
-                    self.task_tree.detach(item)
-            except tk.TclError:
-                pass
-        
-        # 更新统计信息
-        self.update_stats()
+        """搜索框内容变化事件：防抖后在内存搜索索引中过滤，只更新列表差异"""
+        self.task_list.search(self.search_var.get(), on_applied=self.update_stats)
     
     def on_task_selected(self, event=None):
         """任务选择事件处理"""
@@ -523,35 +502,21 @@ class DataManagementPage(BasePage):
         item = self.task_tree.item(selection[0])
         self.current_task_id = item['values'][0]
         
-        # 加载轮次选择
-        self.load_rounds_for_task(self.current_task_id)
+        # 重置为全部轮次，轮次列表随详情一起加载
+        self.current_round = None
+        self.current_detail = None
+        self.round_combo['values'] = ['全部轮次']
+        self.round_combo.set('全部轮次')
+        
+        # 清空上一个任务的赛程和积分榜，等待新任务加载
+        self.render_match_data()
+        self.render_standings_data()
         
-        # 加载数据
-        self.load_match_and_standings_data()
+        # 后台加载赛程、积分榜和统计信息
+        self.load_task_detail_async()
         
         # 更新统计信息
-        self.update_stats()
-    
-    def load_rounds_for_task(self, task_id):
-        """为选定任务加载轮次选择"""
-        try:
-            with self.get_db_session() as session:
-                # 查询该任务的所有轮次
-                rounds = session.query(Match.round_num).filter(
-                    Match.task_id == task_id
-                ).distinct().order_by(Match.round_num).all()
-                
-                round_values = ['全部轮次'] + [f"第{r[0]}轮" for r in rounds if r[0]]
-                self.round_combo['values'] = round_values
-                
-                if round_values:
-                    self.round_combo.set(round_values[0])
-                    self.current_round = None  # 全部轮次
-                    
-        except Exception as e:
-            self.logger.error(f"加载轮次失败: {e}")
-            self.round_combo['values'] = ['全部轮次']
-            self.round_combo.set('全部轮次')
+        self.update_stats(cached_only=True)
     
     def on_round_selected(self, event=None):
         """轮次选择事件处理"""
@@ -564,232 +529,96 @@ class DataManagementPage(BasePage):
             match = re.search(r'第(\d+)轮', round_text)
             self.current_round = int(match.group(1)) if match else None
         
-        # 重新加载数据
-        self.load_match_and_standings_data()
+        # 在已加载的任务详情中过滤
+        self.render_match_data()
+        self.render_standings_data()
     
     def on_standings_type_changed(self, event=None):
         """积分榜类型变化事件处理"""
-        # 重新加载积分榜数据
-        self.load_standings_data()
-    
-    def load_match_and_standings_data(self):
-        """加载赛程和积分榜数据"""
-        if not self.current_task_id:
-            return
+        self.groups_label.config(text=f"积分榜类型: {self.standings_type_var.get()}")
+        self.render_standings_data()
 
-        self.load_match_data()
-        self.load_standings_data()
-        self.update_statistics_new()
-
-    def calculate_round_dates(self, matches):
+    def load_task_detail_async(self):
         """
-        计算每个轮次的"大致日期"（出现次数最多的日期）
-
-        Args:
-            matches: 查询到的所有Match对象列表
+        在后台线程中加载当前任务的详情，完成后一次性填充界面
 
-        Returns:
-            dict: {轮次号: 大致日期} 的映射
+        每次请求递增加载代次，快速切换任务时旧的加载在下一步查询前退出，其结果也不会应用到界面。
         """
-        round_date_count = {}
-        round_approximate_date = {}
-
-        for match_data, home_name, _, league, year in matches:
-            round_num = match_data.round_num
-            if not round_num:
-                continue
+        if not self.current_task_id:
+            return
 
-            # 提取日期部分（从 "08-07 22:00" 提取 "08-07"）
-            if match_data.match_time and isinstance(match_data.match_time, str):
-                try:
-                    # 处理 "08-07 22:00" 格式
-                    date_part = match_data.match_time.split()[0]
-                except:
-                    date_part = None
-            else:
-                date_part = None
+        self.detail_generation += 1
+        generation = self.detail_generation
+        task_id = self.current_task_id
 
-            if date_part:
-                # 统计每个轮次的日期出现次数
-                if round_num not in round_date_count:
-                    round_date_count[round_num] = {}
-                round_date_count[round_num][date_part] = round_date_count[round_num].get(date_part, 0) + 1
+        def is_cancelled():
+            return generation != self.detail_generation
 
-        # 找出每个轮次出现次数最多的日期
-        for round_num, date_counts in round_date_count.items():
-            if date_counts:
-                # 按出现次数排序，取最多
-                most_common_date = max(date_counts.items(), key=lambda x: x[1])[0]
-                round_approximate_date[round_num] = most_common_date
+        def worker():
+            try:
+                with self.get_db_session() as session:
+                    summary, detail = load_task_detail(session, task_id, is_cancelled=is_cancelled)
+            except DetailLoadCancelled:
+                return
+            except Exception as e:
+                self.logger.error(f"加载任务 {task_id} 详情失败: {e}")
+                error_message = str(e)
+                self.frame.after(0, lambda: self._task_detail_failed(generation, error_message))
+                return
+            self.frame.after(0, lambda: self._apply_task_detail(generation, summary, detail))
 
-        return round_approximate_date
+        threading.Thread(target=worker, daemon=True).start()
 
-    def load_match_data(self):
-        """加载赛程数据"""
-        try:
-            # 清空赛程表
-            for item in self.match_tree.get_children():
-                self.match_tree.delete(item)
-            
-            with self.get_db_session() as session:
-                # 构建查询，添加 Task 表的联接以获取 league 和 year 字段
-                query = session.query(Match, Team.home_name_cn.label('home_name'), Team.home_name_cn.label('away_name'), Task.league, Task.year).join(
-                    Team, (Match.home_team_code == Team.team_code) & (Match.task_id == Team.task_id)
-                ).join(
-                    Task, Match.task_id == Task.id
-                ).filter(Match.task_id == self.current_task_id)
-                
-                # 如果选择了特定轮次
-                if self.current_round:
-                    query = query.filter(Match.round_num == self.current_round)
-                
-                matches = query.order_by(Match.round_num, Match.match_time).all()
+    def _apply_task_detail(self, generation, summary, detail):
+        """将加载结果填充到界面（主线程，过期的结果直接丢弃）"""
+        if generation != self.detail_generation:
+            return
 
-                # 计算每个轮次的"大致日期"
-                round_approximate_dates = self.calculate_round_dates(matches)
+        self.current_detail = detail
+        rounds = detail.rounds if detail else []
+        self.round_combo['values'] = ['全部轮次'] + [f"第{round_num}轮" for round_num in rounds]
 
-                # 需要获取客队名称
-                for match_data, home_name, _, league, year in matches:
-                    # 获取客队名称
-                    away_team = session.query(Team).filter(
-                        Team.team_code == match_data.away_team_code,
-                        Team.task_id == self.current_task_id
-                    ).first()
-                    away_name = away_team.home_name_cn if away_team else f"队伍{match_data.away_team_code}"
-                    
-                    # 格式化比分 - 拆分为主分和客分
-                    if match_data.full_score:
-                        try:
-                            # 解析比分格式 "5-2"
-                            if '-' in match_data.full_score:
-                                home_score, away_score = match_data.full_score.split('-', 1)
-                                home_score = home_score.strip()
-                                away_score = away_score.strip()
-                            else:
-                                home_score = match_data.full_score
-                                away_score = match_data.full_score
-                        except:
-                            home_score = match_data.full_score
-                            away_score = match_data.full_score
-                    else:
-                        home_score = ""
-                        away_score = ""
-                    
-                    # 格式化时间（match_time是字符串格式）
-                    if match_data.match_time:
-                        # 如果是字符串格式 "2023-08-25 23:59"，提取月日时分
-                        try:
-                            if isinstance(match_data.match_time, str) and len(match_data.match_time) >= 16:
-                                # 从 "2023-08-25 23:59" 提取 "08-25 23:59"
-                                match_time = match_data.match_time[5:]  # 去掉年份部分
-                            else:
-                                match_time = str(match_data.match_time)
-                        except:
-                            match_time = str(match_data.match_time)
-                    else:
-                        match_time = '待定'
-                    
-                    # 状态判断
-                    status = "已结束" if match_data.full_score else "未开始"
+        self.render_match_data()
+        self.render_standings_data()
+        self.update_statistics_new(summary)
 
-                    # 获取该轮次的"大致日期"
-                    approximate_date = round_approximate_dates.get(match_data.round_num, "")
+    def _task_detail_failed(self, generation, error_message):
+        """详情加载失败（主线程）"""
+        if generation != self.detail_generation:
+            return
+        self.current_detail = None
+        self.render_match_data()
+        self.render_standings_data()
+        self.show_message("错误", f"加载任务数据失败: {error_message}", "error")
+
+    def render_match_data(self):
+        """按当前轮次填充赛程表"""
+        self.match_tree.delete(*self.match_tree.get_children())
+        if self.current_detail is None:
+            return
+        for values in self.current_detail.match_values(self.current_round):
+            self.match_tree.insert('', 'end', values=values)
 
-                    self.match_tree.insert('', 'end', values=(
-                        str(match_data.match_id),  # ID - 比赛ID
-                        league or "",  # 联赛
-                        str(year) if year else "",  # 赛季年份
-                        str(match_data.round_num),  # 轮次改为纯数字
-                        approximate_date,  # 大致日期
-                        match_time,  # 时间
-                        home_name or f"队伍{match_data.home_team_code}",
-                        home_score,  # 主分
-                        away_score,  # 客分
-                        away_name,
-                        status
-                    ))
-                    
-        except Exception as e:
-            self.logger.error(f"加载赛程数据失败: {e}")
-            self.show_message("错误", f"加载赛程失败: {str(e)}", "error")
-    
-    def load_standings_data(self):
-        """加载积分榜数据"""
-        try:
-            # 清空积分榜
-            for item in self.standings_tree.get_children():
-                self.standings_tree.delete(item)
-            
-            if not self.current_task_id:
-                return
-            
-            # 获取积分榜类型映射
-            type_mapping = {
-                "总积分榜": "total",
-                "主场积分榜": "home", 
-                "客场积分榜": "away"
-            }
-            standings_category = type_mapping.get(self.standings_type_var.get(), "total")
-            
-            with self.get_db_session() as session:
-                # 构建查询，添加 Task 表的联接以获取 league 和 year 字段
-                query = session.query(Standings, Team.home_name_cn, Task.league, Task.year).join(
-                    Team, (Standings.team_code == Team.team_code) & (Standings.task_id == Team.task_id)
-                ).join(
-                    Task, Standings.task_id == Task.id
-                ).filter(
-                    Standings.task_id == self.current_task_id,
-                    Standings.standings_category == standings_category
-                )
-                
-                # 如果选择了特定轮次
-                if self.current_round:
-                    query = query.filter(Standings.round_num == self.current_round)
-                else:
-                    # 选择最新轮次的数据
-                    latest_round = session.query(
-                        func.max(Standings.round_num)
-                    ).filter(
-                        Standings.task_id == self.current_task_id,
-                        Standings.standings_category == standings_category
-                    ).scalar()
-                    
-                    if latest_round:
-                        query = query.filter(Standings.round_num == latest_round)
-                
-                standings_data = query.order_by(Standings.points.desc(), Standings.goal_diff.desc()).all()
-                
-                # 填充积分榜
-                for rank, (standing, team_name, league, year) in enumerate(standings_data, 1):
-                    self.standings_tree.insert('', 'end', values=(
-                        league or "",  # 联赛
-                        str(year) if year else "",  # 赛季年份
-                        rank,
-                        team_name or f"队伍{standing.team_code}",
-                        standing.games,
-                        standing.wins,
-                        standing.draws,
-                        standing.losses,
-                        standing.goals_for,
-                        standing.goals_against,
-                        standing.goal_diff,
-                        standing.points,
-                        standing.win_pct
-                    ))
-                    
-        except Exception as e:
-            self.logger.error(f"加载积分榜数据失败: {e}")
-            self.show_message("错误", f"加载积分榜失败: {str(e)}", "error")
+    def render_standings_data(self):
+        """按当前轮次和积分榜类型填充积分榜（全部轮次时显示最新轮次）"""
+        self.standings_tree.delete(*self.standings_tree.get_children())
+        if self.current_detail is None:
+            return
+        standings_category = STANDINGS_CATEGORIES.get(self.standings_type_var.get(), "total")
+        for values in self.current_detail.standings_values(standings_category, self.current_round):
+            self.standings_tree.insert('', 'end', values=values)
     
     def clear_data_displays(self):
         """清空数据显示"""
+        # 丢弃尚未完成的详情加载
+        self.detail_generation += 1
+        self.current_detail = None
+        
         # 清空赛程表
-        for item in self.match_tree.get_children():
-            self.match_tree.delete(item)
+        self.match_tree.delete(*self.match_tree.get_children())
         
         # 清空积分榜
-        for item in self.standings_tree.get_children():
-            self.standings_tree.delete(item)
+        self.standings_tree.delete(*self.standings_tree.get_children())
         
         # 清空轮次选择
         self.round_combo['values'] = []
@@ -798,57 +627,26 @@ class DataManagementPage(BasePage):
         # 清空链接按钮
         self.clear_link_buttons()
     
-    def update_statistics_new(self):
-        """更新统计信息"""
-        if not self.current_task_id:
-            self.total_teams_label.config(text="总队伍数: 0")
-            self.cn_names_label.config(text="比赛场次: 0")
-            self.en_names_label.config(text="已完成: 0")
-            self.groups_label.config(text="积分榜类型: 未选择")
-            self.last_update_label.config(text="最后更新: 未知")
-            self.clear_link_buttons()
-            return
+    def update_statistics_new(self, summary):
+        """
+        更新统计信息
         
-        try:
-            with self.get_db_session() as session:
-                # 获取当前任务信息
-                current_task = session.query(Task).filter(Task.id == self.current_task_id).first()
-                
-                # 统计队伍数
-                team_count = session.query(Team).filter(Team.task_id == self.current_task_id).count()
-                
-                # 统计比赛场次
-                match_count = session.query(Match).filter(Match.task_id == self.current_task_id).count()
-                
-                # 统计已完成比赛
-                finished_count = session.query(Match).filter(
-                    Match.task_id == self.current_task_id,
-                    Match.full_score.isnot(None)
-                ).count()
-                
-                # 获取最后更新时间
-                last_update = session.query(func.max(Match.updated_at)).filter(
-                    Match.task_id == self.current_task_id
-                ).scalar()
-                
-                last_update_str = last_update.strftime('%Y-%m-%d %H:%M:%S') if last_update else '未知'
-                
-                # 在会话内提取链接值，避免DetachedInstanceError
-                main_link = current_task.link if current_task else None
-                second_link = current_task.link_second if current_task else None
-                
-                # 更新显示
-                self.total_teams_label.config(text=f"总队伍数: {team_count}")
-                self.cn_names_label.config(text=f"比赛场次: {match_count}")
-                self.en_names_label.config(text=f"已完成: {finished_count}")
-                self.groups_label.config(text=f"积分榜类型: {self.standings_type_var.get()}")
-                self.last_update_label.config(text=f"最后更新: {last_update_str}")
-                
-                # 更新链接按钮（传递字符串而不是对象）
-                self.update_link_buttons(main_link, second_link)
-                
-        except Exception as e:
-            self.logger.error(f"更新统计信息失败: {e}")
+        Args:
+            summary: query_task_summary 的结果，任务不存在时为 None
+        """
+        summary = summary or {}
+        last_update = summary.get('last_update')
+        last_update_str = last_update.strftime('%Y-%m-%d %H:%M:%S') if last_update else '未知'
+        
+        # 更新显示
+        self.total_teams_label.config(text=f"总队伍数: {summary.get('team_count', 0)}")
+        self.cn_names_label.config(text=f"比赛场次: {summary.get('match_count', 0)}")
+        self.en_names_label.config(text=f"已完成: {summary.get('finished_count', 0)}")
+        self.groups_label.config(text=f"积分榜类型: {self.standings_type_var.get()}")
+        self.last_update_label.config(text=f"最后更新: {last_update_str}")
+        
+        # 更新链接按钮
+        self.update_link_buttons(summary.get('link'), summary.get('link_second'))
     
     # ========== 数据导出功能 ==========
     
@@ -929,20 +727,16 @@ class DataManagementPage(BasePage):
     def _export_worker(self, year: str, file_path: str):
         """后台导出工作线程"""
         try:
-            # 执行数据格式化（由工具函数内部管理数据库会话）
-            csv_content = format_output(year)
+            # 边查询边写入文件（由工具函数内部管理数据库会话）
+            row_count = export_output(year, file_path, progress_callback=self._report_export_progress)
             
-            if not csv_content:
+            if not row_count:
                 # 在主线程中更新UI
                 self.frame.after(0, lambda: self._export_completed(
                     False, f"未找到{year}年的数据或数据为空"
                 ))
                 return
             
-            # 保存文件
-            with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
-                f.write(csv_content)
-            
             # 在主线程中更新UI - 成功
             self.frame.after(0, lambda: self._export_completed(True, file_path))
             
@@ -951,10 +745,23 @@ class DataManagementPage(BasePage):
             # 在主线程中更新UI - 失败
             self.frame.after(0, lambda: self._export_completed(False, str(e)))
     
+    def _report_export_progress(self, done: int, total: int, message: str):
+        """导出进度回调（在导出线程中调用，转到主线程更新UI）"""
+        self.frame.after(0, lambda: self._update_export_progress(done, total, message))
+
+    def _update_export_progress(self, done: int, total: int, message: str):
+        """更新导出进度条和状态（在主线程中调用）"""
+        if str(self.export_progress['mode']) != 'determinate':
+            self.export_progress.stop()
+            self.export_progress.config(mode='determinate', maximum=total)
+        self.export_progress.config(value=done)
+        self.export_status_label.config(text=f"正在导出 {done}/{total}：{message}", foreground='blue')
+
     def _export_completed(self, success: bool, message: str):
         """导出完成后的UI更新（在主线程中调用）"""
-        # 停止并隐藏进度条
+        # 停止并隐藏进度条（恢复为未知进度模式，供下次导出使用）
         self.export_progress.stop()
+        self.export_progress.config(mode='indeterminate', value=0)
         self.export_progress.pack_forget()
 
         if success:
@@ -1036,20 +843,16 @@ class DataManagementPage(BasePage):
     def _export_match_worker(self, year: str, file_path: str):
         """后台赛程表导出工作线程"""
         try:
-            # 执行数据格式化（由工具函数内部管理数据库会话）
-            csv_content = format_match_csv(year)
+            # 边查询边写入文件（由工具函数内部管理数据库会话）
+            row_count = export_match_output(year, file_path, progress_callback=self._report_export_progress)
 
-            if not csv_content:
+            if not row_count:
                 # 在主线程中更新UI
                 self.frame.after(0, lambda: self._export_completed(
                     False, f"未找到{year}年的赛程数据或数据为空"
                 ))
                 return
 
-            # 保存文件
-            with open(file_path, 'w', encoding='utf-8-sig', newline='') as f:
-                f.write(csv_content)
-
             # 在主线程中更新UI - 成功
             self.frame.after(0, lambda: self._export_completed(True, file_path))
 
@@ -1057,3 +860,126 @@ class DataManagementPage(BasePage):
             self.logger.error(f"赛程表导出工作线程失败: {e}")
             # 在主线程中更新UI - 失败
             self.frame.after(0, lambda: self._export_completed(False, str(e)))
+
+    # ========== 批量导出功能 ==========
+
+    def open_batch_export_dialog(self):
+        """打开批量导出对话框（年份范围、导出类型、导出格式）"""
+        dialog = tk.Toplevel(self.frame)
+        dialog.title("批量导出")
+        dialog.resizable(False, False)
+        dialog.transient(self.frame.winfo_toplevel())
+        dialog.grab_set()
+
+        content = ttk.Frame(dialog, padding=15)
+        content.pack(fill=tk.BOTH, expand=True)
+
+        # 年份范围
+        current_year = datetime.now().year
+        start_year_var = tk.StringVar(value=str(current_year - 1))
+        end_year_var = tk.StringVar(value=str(current_year))
+        ttk.Label(content, text="起始年份:").grid(row=0, column=0, sticky=tk.W, pady=3)
+        ttk.Entry(content, textvariable=start_year_var, width=10).grid(row=0, column=1, sticky=tk.W, pady=3)
+        ttk.Label(content, text="结束年份:").grid(row=1, column=0, sticky=tk.W, pady=3)
+        ttk.Entry(content, textvariable=end_year_var, width=10).grid(row=1, column=1, sticky=tk.W, pady=3)
+
+        # 导出类型
+        ttk.Label(content, text="导出内容:").grid(row=2, column=0, sticky=tk.W, pady=3)
+        kind_vars = {}
+        kind_frame = ttk.Frame(content)
+        kind_frame.grid(row=2, column=1, sticky=tk.W, pady=3)
+        for kind, (label, _, _) in EXPORT_KINDS.items():
+            kind_vars[kind] = tk.BooleanVar(value=True)
+            ttk.Checkbutton(kind_frame, text=label, variable=kind_vars[kind]).pack(side=tk.LEFT, padx=(0, 10))
+
+        # 导出格式（Parquet 需本地安装 pyarrow 或 fastparquet）
+        ttk.Label(content, text="导出格式:").grid(row=3, column=0, sticky=tk.W, pady=3)
+        available_formats = get_available_formats()
+        format_vars = {}
+        format_frame = ttk.Frame(content)
+        format_frame.grid(row=3, column=1, sticky=tk.W, pady=3)
+        for fmt in ('csv', 'xlsx', 'parquet'):
+            format_vars[fmt] = tk.BooleanVar(value=(fmt == 'csv'))
+            checkbox = ttk.Checkbutton(format_frame, text=fmt.upper(), variable=format_vars[fmt])
+            if fmt not in available_formats:
+                checkbox.config(state=tk.DISABLED)
+            checkbox.pack(side=tk.LEFT, padx=(0, 10))
+
+        combined_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            content, text="合并为一个 Excel 工作簿（每种数据每个年份一个工作表）", variable=combined_var
+        ).grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=3)
+
+        def on_confirm():
+            try:
+                start_year = start_year_var.get().strip()
+                end_year = end_year_var.get().strip()
+                if not validate_year_format(start_year) or not validate_year_format(end_year):
+                    self.show_message("错误", "年份格式不正确！请输入4位数字年份（如：2022）", "error")
+                    return
+                if int(start_year) > int(end_year):
+                    self.show_message("错误", "起始年份不能大于结束年份", "error")
+                    return
+
+                kinds = [kind for kind, var in kind_vars.items() if var.get()]
+                formats = [fmt for fmt, var in format_vars.items() if var.get() and fmt in available_formats]
+                if not kinds:
+                    self.show_message("错误", "请至少选择一种导出内容", "error")
+                    return
+                if not formats and not combined_var.get():
+                    self.show_message("错误", "请至少选择一种导出格式", "error")
+                    return
+
+                output_dir = filedialog.askdirectory(title="选择导出目录", parent=dialog)
+                if not output_dir:
+                    return
+
+                dialog.destroy()
+                self.start_batch_export_process(
+                    int(start_year), int(end_year), kinds, formats, output_dir, combined_var.get()
+                )
+            except Exception as e:
+                self.logger.error(f"批量导出失败: {e}")
+                self.show_message("错误", f"批量导出失败: {str(e)}", "error")
+
+        button_frame = ttk.Frame(content)
+        button_frame.grid(row=5, column=0, columnspan=2, pady=(10, 0))
+        ttk.Button(button_frame, text="开始导出", command=on_confirm).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="取消", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
+
+    def start_batch_export_process(self, start_year: int, end_year: int, kinds: list, formats: list,
+                                   output_dir: str, combined_workbook: bool):
+        """开始批量导出过程（显示进度并在后台执行）"""
+        self.export_progress.pack(side=tk.LEFT, padx=(10, 0))
+        self.export_progress.start()
+        self.export_status_label.config(text=f"正在批量导出 {start_year}-{end_year}...", foreground='blue')
+
+        export_thread = threading.Thread(
+            target=self._batch_export_worker,
+            args=(start_year, end_year, kinds, formats, output_dir, combined_workbook),
+            daemon=True
+        )
+        export_thread.start()
+
+    def _batch_export_worker(self, start_year: int, end_year: int, kinds: list, formats: list,
+                             output_dir: str, combined_workbook: bool):
+        """后台批量导出工作线程（导出单元在进程池中并行执行）"""
+        try:
+            files = run_export_job(
+                start_year, end_year, kinds, formats, output_dir,
+                combined_workbook=combined_workbook,
+                progress_callback=self._report_export_progress
+            )
+
+            if not files:
+                self.frame.after(0, lambda: self._export_completed(
+                    False, f"未找到{start_year}-{end_year}年的数据"
+                ))
+                return
+
+            self.frame.after(0, lambda: self._export_completed(True, f"{output_dir}\n共 {len(files)} 个文件"))
+
+        except Exception as e:
+            self.logger.error(f"批量导出工作线程失败: {e}")
+            error_message = str(e)
+            self.frame.after(0, lambda: self._export_completed(False, error_message))
\ No newline at end of file
@@ -7,10 +7,14 @@ from tkinter import ttk, messagebox, filedialog, simpledialog
 from datetime import datetime
 import re
 import os
-from openpyxl import Workbook
+import threading
+from sqlalchemy import select
 
 from .base_page import BasePage
-from models import Task
+from .utils.task_detail_cache import task_detail_cache
+from .utils.task_stats import task_stats_cache
+from .utils.virtual_task_list import VirtualTaskList
+from models import Task, purge_tasks
 
 
 class InputManagementPage(BasePage):
@@ -67,13 +71,13 @@ class InputManagementPage(BasePage):
         invert_btn.pack(side=tk.LEFT, padx=5)
         
         # 导出按钮
-        export_btn = ttk.Button(
+        self.export_btn = ttk.Button(
             toolbar_frame,
             text="导出Excel",
             command=self.export_to_excel,
             width=12
         )
-        export_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self.export_btn.pack(side=tk.LEFT, padx=(10, 0))
         
         # 生成其他年份按钮
         generate_year_btn = ttk.Button(
@@ -121,9 +125,6 @@ class InputManagementPage(BasePage):
         # 详情区域
         self.create_detail_panel()
         
-        # 初始化完整项目列表（用于搜索状态管理）
-        self.all_task_items = []
-        
         # 加载数据
         self.refresh_data()
         
@@ -180,6 +181,20 @@ class InputManagementPage(BasePage):
         self.task_tree.bind('<<TreeviewSelect>>', self.on_task_select)
         self.task_tree.bind('<Double-1>', self.on_double_click)
         
+        # 分页加载任务列表（搜索在数据库中过滤）
+        self.task_list = VirtualTaskList(
+            self.task_tree, scrollbar_y, self.get_db_session,
+            columns=[
+                Task.id, Task.level, Task.event, Task.league, Task.country, Task.year, Task.type, Task.group,
+                Task.link, Task.link_second, Task.last_crawl_time, Task.created_at
+            ],
+            format_row=self.format_task_row,
+            search_columns=[
+                Task.id, Task.level, Task.event, Task.league, Task.country, Task.year, Task.type, Task.group,
+                Task.link, Task.link_second
+            ]
+        )
+        
         # 初始化编辑状态变量
         self.edit_item = None
         self.edit_column = None
@@ -208,39 +223,30 @@ class InputManagementPage(BasePage):
         detail_frame.grid_rowconfigure(0, weight=1)
         detail_frame.grid_columnconfigure(0, weight=1)
         
+    def format_task_row(self, row):
+        """任务列表行显示内容"""
+        created_time = row.created_at.strftime('%Y-%m-%d %H:%M') if row.created_at else ''
+        last_crawl_time = row.last_crawl_time.strftime('%Y-%m-%d %H:%M') if row.last_crawl_time else '从未爬取'
+        return (
+            row.id,
+            row.level,
+            row.event,
+            row.league,
+            row.country,
+            row.year,
+            row.type,
+            row.group,
+            row.link or '',
+            row.link_second or '',
+            last_crawl_time,
+            created_time
+        )
+    
     def refresh_data(self):
-        """刷新任务数据"""
+        """刷新任务数据（只加载第一页，滚动到底部时继续加载）"""
         try:
-            # 清空现有数据和完整项目列表
-            for item in self.task_tree.get_children():
-                self.task_tree.delete(item)
-            self.all_task_items = []
-            
-            # 从数据库加载数据
-            with self.get_db_session() as session:
-                tasks = session.query(Task).order_by(Task.created_at.desc()).all()
-                
-                for task in tasks:
-                    created_time = task.created_at.strftime('%Y-%m-%d %H:%M') if task.created_at else ''
-                    last_crawl_time = task.last_crawl_time.strftime('%Y-%m-%d %H:%M') if task.last_crawl_time else '从未爬取'
-                    item_id = self.task_tree.insert('', 'end', values=(
-                        task.id,
-                        task.level,
-                        task.event,
-                        task.league,
-                        task.country,
-                        task.year,
-                        task.type,
-                        task.group,
-                        task.link or '',
-                        task.link_second or '',
-                        last_crawl_time,
-                        created_time
-                    ))
-                    # 保存到完整项目列表
-                    self.all_task_items.append(item_id)
-            
-            self.log_action("刷新任务列表", f"加载了 {len(tasks)} 条记录")
+            matched_count = self.task_list.refresh()
+            self.log_action("刷新任务列表", f"加载了 {self.task_list.loaded_count}/{matched_count} 条记录")
             
             # 更新统计信息
             self.update_stats()
@@ -254,7 +260,7 @@ class InputManagementPage(BasePage):
         selection = self.task_tree.selection()
         if not selection:
             self.clear_detail()
-            self.update_stats()
+            self.update_stats(cached_only=True)
             return
             
         # 获取选中的任务ID
@@ -265,7 +271,7 @@ class InputManagementPage(BasePage):
         self.load_task_detail(task_id)
         
         # 更新统计信息
-        self.update_stats()
+        self.update_stats(cached_only=True)
     
     def load_task_detail(self, task_id):
         """加载任务详情"""
@@ -329,53 +335,70 @@ class InputManagementPage(BasePage):
         if not messagebox.askyesno("确认删除", confirm_message):
             return
         
-        # 批量删除任务
-        deleted_count = 0
-        failed_tasks = []
+        # 批量删除任务及其关联数据
+        task_ids = [task_id for task_id, _ in tasks_to_delete]
         
         try:
             with self.get_db_session() as session:
-                for task_id, league_name in tasks_to_delete:
-                    try:
-                        task = session.query(Task).filter(Task.id == task_id).first()
-                        if task:
-                            session.delete(task)
-                            deleted_count += 1
-                        else:
-                            failed_tasks.append(f"{league_name} (ID: {task_id}) - 任务不存在")
-                    except Exception as e:
-                        failed_tasks.append(f"{league_name} (ID: {task_id}) - {str(e)}")
-                
+                existing_ids = set(session.scalars(select(Task.id).where(Task.id.in_(task_ids))))
+                deleted = purge_tasks(session, existing_ids)
                 session.commit()
-                
-                # 显示删除结果
-                if failed_tasks:
-                    result_message = f"删除完成！成功删除 {deleted_count} 个任务"
-                    if failed_tasks:
-                        result_message += f"\n\n失败的任务：\n" + "\n".join(failed_tasks)
-                    self.show_message("删除结果", result_message, "warning")
-                else:
-                    self.show_message("成功", f"成功删除 {deleted_count} 个任务", "info")
-                
-                # 记录日志
-                task_names = ", ".join([league for _, league in tasks_to_delete[:3]])
-                if len(tasks_to_delete) > 3:
-                    task_names += f" 等{len(tasks_to_delete)}个任务"
-                self.log_action("批量删除任务", f"成功删除 {deleted_count} 个任务: {task_names}")
-                
-                # 刷新界面
-                self.refresh_data()
-                self.clear_detail()
-                self.update_stats()
+            task_stats_cache.invalidate()
+            task_detail_cache.invalidate(existing_ids)
+            
+            deleted_count = deleted['tasks']
+            failed_tasks = [
+                f"{league_name} (ID: {task_id}) - 任务不存在"
+                for task_id, league_name in tasks_to_delete
+                if task_id not in existing_ids
+            ]
+            reclaimed_text = self.reclaim_deleted_space()
+            
+            # 显示删除结果
+            if failed_tasks:
+                result_message = f"删除完成！成功删除 {deleted_count} 个任务{reclaimed_text}"
+                result_message += f"\n\n失败的任务：\n" + "\n".join(failed_tasks)
+                self.show_message("删除结果", result_message, "warning")
+            else:
+                self.show_message("成功", f"成功删除 {deleted_count} 个任务{reclaimed_text}", "info")
+            
+            # 记录日志
+            task_names = ", ".join([league for _, league in tasks_to_delete[:3]])
+            if len(tasks_to_delete) > 3:
+                task_names += f" 等{len(tasks_to_delete)}个任务"
+            self.log_action("批量删除任务", f"成功删除 {deleted_count} 个任务: {task_names}")
+            
+            # 刷新界面
+            self.refresh_data()
+            self.clear_detail()
+            self.update_stats()
                     
         except Exception as e:
             self.logger.error(f"批量删除任务失败: {e}")
             self.show_message("错误", f"删除失败: {str(e)}", "error")
     
+    def reclaim_deleted_space(self):
+        """
+        删除后回收数据库空间
+        
+        Returns:
+            str: 用于结果提示的回收空间说明，未回收时为空字符串
+        """
+        try:
+            reclaimed = self.db_manager.reclaim_space()
+        except Exception as e:
+            self.logger.warning(f"回收数据库空间失败: {e}")
+            return ""
+        
+        if reclaimed <= 0:
+            return ""
+        return f"，回收空间 {reclaimed / 1024 / 1024:.2f} MB"
+    
     def select_all(self):
         """全选所有可见任务"""
         try:
-            # 获取所有可见项目（考虑搜索过滤）
+            # 获取所有可见项目（考虑搜索过滤，先加载剩余页）
+            self.task_list.load_all()
             all_items = self.task_tree.get_children()
             if all_items:
                 # 选中所有可见项目
@@ -391,7 +414,8 @@ class InputManagementPage(BasePage):
     def invert_selection(self):
         """反选任务"""
         try:
-            # 获取当前选中项目和所有可见项目
+            # 获取当前选中项目和所有可见项目（先加载剩余页）
+            self.task_list.load_all()
             current_selection = set(self.task_tree.selection())
             all_items = set(self.task_tree.get_children())
             
@@ -415,37 +439,8 @@ class InputManagementPage(BasePage):
             self.show_message("错误", f"反选失败: {str(e)}", "error")
     
     def on_search_change(self, *args):
-        """搜索框内容变化事件"""
-        search_text = self.search_var.get().lower()
-        
-        # 首先重新显示所有项目（解决搜索状态管理问题）
-        for item in self.all_task_items:
-            try:
-                self.task_tree.reattach(item, '', 'end')
-            except tk.TclError:
-                # 如果项目已经被删除或不存在，跳过
-                pass
-        
-        # 如果搜索框为空，显示所有项目
-        if not search_text:
-            self.update_stats()
-            return
-        
-        # 过滤显示匹配的项目，使用完整项目列表确保所有数据都参与搜索
-        for item in self.all_task_items:
-            try:
-                values = self.task_tree.item(item)['values']
-                # 在所有字段中搜索：ID、赛事级别、赛事名称、联赛名称、国家、年份、类型、分组、最后爬取、创建时间
-                if any(search_text in str(value).lower() for value in values):
-                    self.task_tree.reattach(item, '', 'end')
-                else:
-                    self.task_tree.detach(item)
-            except tk.TclError:
-                # 如果项目已经被删除或不存在，跳过
-                pass
-        
-        # 更新统计信息
-        self.update_stats()
+        """搜索框内容变化事件：防抖后在内存搜索索引中过滤，只更新列表差异"""
+        self.task_list.search(self.search_var.get(), on_applied=self.update_stats)
     
     def on_double_click(self, event):
         """处理双击事件"""
@@ -557,6 +552,8 @@ class InputManagementPage(BasePage):
                         setattr(task, field_name, new_value if new_value else None)
                         task.updated_at = datetime.now()
                         session.commit()
+                        task_stats_cache.invalidate()
+                        task_detail_cache.invalidate([int(task_id)])
                         
                         # 刷新显示
                         self.refresh_data()
@@ -622,81 +619,129 @@ class InputManagementPage(BasePage):
         
         return True
     
+    # Excel 导出列：(表头, 列宽, 任务字段)
+    EXCEL_EXPORT_COLUMNS = [
+        ('赛事级别', 10, Task.level),
+        ('赛事名称', 20, Task.event),
+        ('国家/地区', 15, Task.country),
+        ('联赛名称', 25, Task.league),
+        ('赛事类型', 12, Task.type),
+        ('主要链接', 40, Task.link),
+        ('第二链接', 40, Task.link_second),
+        ('赛事年份', 12, Task.year),
+        ('分组信息', 15, Task.group),
+    ]
+
+    # 导出进度刷新间隔（行数）
+    EXCEL_EXPORT_PROGRESS_STEP = 5000
+
     def export_to_excel(self):
-        """导出任务数据到Excel文件"""
+        """导出任务数据到Excel文件（在后台线程中流式写入）"""
         try:
-            # 从数据库查询所有任务数据
+            # 只检查是否存在任务，不加载任务数据
             with self.get_db_session() as session:
-                tasks = session.query(Task).order_by(Task.created_at.desc()).all()
-                
-                if not tasks:
-                    self.show_message("提示", "暂无任务数据可导出", "info")
-                    return
-                
-                # 让用户选择保存位置
-                file_path = filedialog.asksaveasfilename(
-                    title="保存Excel文件",
-                    defaultextension=".xlsx",
-                    filetypes=[("Excel文件", "*.xlsx"), ("所有文件", "*.*")],
-                    initialfile="任务数据导出.xlsx"
-                )
-                
-                if not file_path:
-                    return  # 用户取消了保存
-                
-                # 创建工作簿和工作表
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "任务数据"
-                
-                # 设置表头
-                headers = ['赛事级别', '赛事名称', '国家/地区', '联赛名称', '赛事类型', '主要链接', '第二链接', '赛事年份', '分组信息']
-                ws.append(headers)
-                
-                # 添加数据行
-                for task in tasks:
-                    row_data = [
-                        task.level,
-                        task.event or '',
-                        task.country or '',
-                        task.league or '',
-                        task.type or '',
-                        task.link or '',
-                        task.link_second or '',
-                        task.year or '',
-                        task.group or ''
-                    ]
-                    ws.append(row_data)
-                
-                # 调整列宽
-                column_widths = [10, 20, 15, 25, 12, 40, 40, 12, 15]
-                for i, width in enumerate(column_widths, 1):
-                    ws.column_dimensions[ws.cell(row=1, column=i).column_letter].width = width
-                
-                # 设置表头样式
-                for cell in ws[1]:
-                    cell.font = cell.font.copy(bold=True)
-                
-                # 保存文件
-                wb.save(file_path)
-                
-                # 显示成功消息
-                self.show_message("成功", f"成功导出 {len(tasks)} 条任务数据到:\n{os.path.basename(file_path)}", "info")
-                self.log_action("导出Excel", f"成功导出 {len(tasks)} 条任务数据到 {file_path}")
-                
+                has_tasks = session.query(Task.id).first() is not None
+
+            if not has_tasks:
+                self.show_message("提示", "暂无任务数据可导出", "info")
+                return
+
+            # 让用户选择保存位置
+            file_path = filedialog.asksaveasfilename(
+                title="保存Excel文件",
+                defaultextension=".xlsx",
+                filetypes=[("Excel文件", "*.xlsx"), ("所有文件", "*.*")],
+                initialfile="任务数据导出.xlsx"
+            )
+
+            if not file_path:
+                return  # 用户取消了保存
+
+            self.export_btn.config(state=tk.DISABLED, text="导出中...")
+            threading.Thread(target=self._export_excel_worker, args=(file_path,), daemon=True).start()
+
         except Exception as e:
             self.logger.error(f"导出Excel失败: {e}")
             self.show_message("错误", f"导出失败: {str(e)}", "error")
+
+    def _export_excel_worker(self, file_path):
+        """
+        后台导出工作线程：只读取需要的列，使用只写模式逐行写入工作簿，
+        内存占用与任务数量无关
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
+        temp_path = f"{file_path}.part"
+        try:
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet(title="任务数据")
+
+            # 只写模式下列宽需在写入数据前设置
+            for i, (_, width, _) in enumerate(self.EXCEL_EXPORT_COLUMNS, 1):
+                ws.column_dimensions[get_column_letter(i)].width = width
+
+            # 设置表头（加粗）
+            header_cells = []
+            for header, _, _ in self.EXCEL_EXPORT_COLUMNS:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.font = Font(bold=True)
+                header_cells.append(cell)
+            ws.append(header_cells)
+
+            # 按创建时间倒序分批读取任务
+            statement = (
+                select(*[column for _, _, column in self.EXCEL_EXPORT_COLUMNS])
+                .order_by(Task.created_at.desc())
+                .execution_options(yield_per=1000)
+            )
+            row_count = 0
+            with self.db_manager.engine.connect() as connection:
+                for level, *text_values in connection.execute(statement):
+                    ws.append([level] + [value or '' for value in text_values])
+                    row_count += 1
+                    if row_count % self.EXCEL_EXPORT_PROGRESS_STEP == 0:
+                        self.frame.after(0, lambda count=row_count: self.export_btn.config(text=f"已导出 {count}"))
+
+            # 先写入临时文件，完成后替换，避免失败时留下损坏的文件
+            wb.save(temp_path)
+            os.replace(temp_path, file_path)
+
+            self.frame.after(0, lambda: self._export_excel_completed(True, file_path, row_count))
+
+        except Exception as e:
+            self.logger.error(f"导出Excel失败: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            error_message = str(e)
+            self.frame.after(0, lambda: self._export_excel_completed(False, error_message, 0))
+
+    def _export_excel_completed(self, success, message, row_count):
+        """Excel 导出完成后的UI更新（在主线程中调用）"""
+        self.export_btn.config(state=tk.NORMAL, text="导出Excel")
+
+        if success:
+            self.show_message("成功", f"成功导出 {row_count} 条任务数据到:\n{os.path.basename(message)}", "info")
+            self.log_action("导出Excel", f"成功导出 {row_count} 条任务数据到 {message}")
+        else:
+            self.show_message("错误", f"导出失败: {message}", "error")
     
-    def update_stats(self):
-        """更新统计信息显示"""
+    def update_stats(self, cached_only=False):
+        """
+        更新统计信息显示
+        
+        Args:
+            cached_only: 只读取统计缓存（选择变化时使用，不访问数据库）
+        """
         try:
-            # 获取数据库总数
-            with self.get_db_session() as session:
-                total_count = session.query(Task).count()
+            # 获取任务总数（统计缓存在任务数据写入后失效）
+            stats = task_stats_cache.peek() if cached_only else task_stats_cache.get(self.get_db_session)
+            total_count = stats['total'] if stats else '-'
             
-            # 获取当前显示数量
-            visible_count = len(self.task_tree.get_children())
+            # 获取当前显示数量（匹配搜索的任务数，包含尚未加载的）
+            visible_count = self.task_list.matched_count
             
             # 获取选中数量
             selected_count = len(self.task_tree.selection())
@@ -732,22 +777,29 @@ class InputManagementPage(BasePage):
             
             target_year = int(year_input)
             
+            # 预览：只统计数量，不写入
+            preview = self.generate_tasks_for_year(target_year, dry_run=True)
+            if not preview['total']:
+                self.show_message("生成结果", "当前没有任何任务，无法生成其他年份数据", "warning")
+                return
+            
             # 确认操作
             confirm_msg = (f"确定要为年份 {target_year} 生成新的任务数据吗？\n\n"
-                          f"系统将基于现有所有任务生成对应的 {target_year} 年份数据\n"
-                          f"跨年格式将生成为 {target_year}-{target_year + 1}")
+                          f"系统将基于现有 {preview['total']} 条任务生成对应的 {target_year} 年份数据\n"
+                          f"跨年格式将生成为 {target_year}-{target_year + 1}\n\n"
+                          f"预计新增: {preview['insert_count']} 条，已存在跳过: {preview['skip_count']} 条")
             
             if not messagebox.askyesno("确认生成", confirm_msg):
                 return
             
             # 执行批量生成
-            success_count, skip_count, error_count = self.generate_tasks_for_year(target_year)
+            result = self.generate_tasks_for_year(target_year)
+            success_count = result['insert_count']
             
             # 显示结果
             result_msg = (f"年份 {target_year} 数据生成完成！\n\n"
                          f"✓ 成功生成: {success_count} 条新任务\n"
-                         f"⚠ 已存在跳过: {skip_count} 条任务\n"
-                         f"✗ 处理失败: {error_count} 条任务")
+                         f"⚠ 已存在跳过: {result['skip_count']} 条任务")
             
             if success_count > 0:
                 self.show_message("生成成功", result_msg, "info")
@@ -780,108 +832,33 @@ class InputManagementPage(BasePage):
         
         return True, ""
     
-    def transform_year_field(self, original_year, target_year):
-        """转换year字段的年份"""
-        if not original_year:
-            return str(target_year)
-        
-        original_str = str(original_year).strip()
-        
-        # 匹配单年格式 "2023"
-        if re.match(r'^\d{4}$', original_str):
-            return str(target_year)
-        
-        # 匹配跨年格式 "2022-2023"
-        elif re.match(r'^\d{4}-\d{4}$', original_str):
-            return f"{target_year}-{target_year + 1}"
-        
-        # 其他格式保持不变
-        else:
-            return original_str
-    
-    def transform_url_year(self, original_url, target_year):
-        """转换URL中的年份"""
-        if not original_url or not original_url.strip():
-            return original_url
-        
-        url = original_url.strip()
-        
-        # 匹配单年格式：/2023/
-        pattern1 = r'/(\d{4})/'
-        if re.search(pattern1, url):
-            return re.sub(pattern1, f'/{target_year}/', url)
-        
-        # 匹配跨年格式：/2022-2023/
-        pattern2 = r'/(\d{4})-(\d{4})/'
-        if re.search(pattern2, url):
-            return re.sub(pattern2, f'/{target_year}-{target_year + 1}/', url)
-        
-        # 无匹配则保持不变
-        return url
-    
-    def check_task_exists(self, session, league, year, group):
-        """检查任务是否已存在（基于uk_league_year_group约束）"""
-        existing = session.query(Task).filter(
-            Task.league == league,
-            Task.year == year,
-            Task.group == group
-        ).first()
-        return existing is not None
-    
-    def generate_tasks_for_year(self, target_year):
-        """为指定年份生成任务"""
-        success_count = 0
-        skip_count = 0
-        error_count = 0
+    def generate_tasks_for_year(self, target_year, dry_run=False):
+        """
+        为指定年份生成任务
         
+        Args:
+            target_year: 目标年份
+            dry_run: 只统计数量（用于预览），不写入数据库
+            
+        Returns:
+            dict: {'total': 现有任务数, 'insert_count': 新增数量, 'skip_count': 已存在跳过数量}
+        """
+        # 年份滚动依赖 pandas，只在生成任务时导入
+        from .utils.task_rollover import rollover_tasks
+
         try:
             with self.get_db_session() as session:
-                # 读取所有现有任务
-                original_tasks = session.query(Task).all()
-                
-                if not original_tasks:
-                    return 0, 0, 0
-                
-                for original_task in original_tasks:
-                    try:
-                        # 生成新任务数据
-                        new_year = self.transform_year_field(original_task.year, target_year)
-                        new_link = self.transform_url_year(original_task.link, target_year)
-                        new_link_second = self.transform_url_year(original_task.link_second, target_year)
-                        
-                        # 检查是否已存在（基于uk_league_year_group约束）
-                        if self.check_task_exists(session, original_task.league, new_year, original_task.group):
-                            skip_count += 1
-                            continue
-                        
-                        # 创建新任务
-                        new_task = Task(
-                            level=original_task.level,
-                            event=original_task.event,
-                            country=original_task.country,
-                            league=original_task.league,
-                            type=original_task.type,
-                            year=new_year,
-                            group=original_task.group,
-                            link=new_link,
-                            link_second=new_link_second
-                        )
-                        
-                        session.add(new_task)
-                        success_count += 1
-                        
-                    except Exception as e:
-                        error_count += 1
-                        self.logger.error(f"处理任务 {original_task.id} 失败: {e}")
-                
-                # 提交所有更改
-                session.commit()
+                result = rollover_tasks(session, target_year, dry_run=dry_run)
+                if dry_run:
+                    session.rollback()
+                else:
+                    session.commit()
+                    task_stats_cache.invalidate()
+                return result
                 
         except Exception as e:
             self.logger.error(f"批量生成任务失败: {e}")
             raise
-        
-        return success_count, skip_count, error_count
     
     def delete_year(self):
         """删除指定年份的所有任务数据"""
@@ -1030,17 +1007,23 @@ class InputManagementPage(BasePage):
                 # 提取所有要删除的任务ID
                 task_ids = [task_info['id'] for task_info in tasks_to_delete]
                 
-                # 使用批量删除SQL语句，避免页面阻塞
-                # 这里使用SQLAlchemy的bulk delete功能
-                deleted_count = session.query(Task).filter(Task.id.in_(task_ids)).delete(synchronize_session=False)
+                # 按外键顺序集合化删除任务及其关联数据，避免留下孤立记录
+                deleted = purge_tasks(session, task_ids)
+                deleted_count = deleted['tasks']
                 
                 # 提交删除操作
                 session.commit()
+                task_stats_cache.invalidate()
+                task_detail_cache.invalidate(task_ids)
+                
+                related_count = sum(count for table, count in deleted.items() if table != 'tasks')
+                reclaimed_text = self.reclaim_deleted_space()
                 
                 # 显示结果
                 expected_count = len(tasks_to_delete)
                 result_msg = f"年份 {target_year} 批量删除操作完成！\n\n"
                 result_msg += f"✓ 成功删除: {deleted_count} 条任务\n"
+                result_msg += f"✓ 同时删除关联数据: {related_count} 条{reclaimed_text}\n"
                 
                 # 检查是否有未删除的任务
                 if deleted_count < expected_count:
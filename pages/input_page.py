@@ -7,6 +7,7 @@ from tkinter import ttk
 from datetime import datetime
 
 from .base_page import BasePage
+from .utils.task_stats import task_stats_cache
 from models import Task
 
 
@@ -171,6 +172,7 @@ class InputPage(BasePage):
                 session.add(task)
                 session.commit()
                 task_id = task.id
+            task_stats_cache.invalidate()
             
             self.show_message("成功", f"任务保存成功！任务ID: {task_id}", "info")
             self.log_action("保存任务", f"ID: {task_id}, 联赛: {task.league}")
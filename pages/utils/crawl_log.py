@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+爬取日志缓冲 - 界面只保留最近 N 行，完整日志通过 loguru 写入轮转的日志文件
+
+全季爬取时每场比赛都会产生日志，全部放在 Text 控件中会使内存和重绘开销持续增长。
+这里用固定容量的环形缓冲保存界面显示的最近日志，完整日志写入 logs/crawl/ 下的轮转文件，
+按级别筛选、搜索和保存日志都直接读取日志文件。
+"""
+
+import os
+import re
+import threading
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+
+# 界面显示的最大日志行数
+CRAWL_LOG_CAPACITY = 2000
+
+# 完整日志文件（单独目录，不受“清理日志”影响）
+CRAWL_LOG_DIR = os.path.join('logs', 'crawl')
+CRAWL_LOG_FILE = os.path.join(CRAWL_LOG_DIR, 'crawl.log')
+CRAWL_LOG_ROTATION = '10 MB'
+CRAWL_LOG_RETENTION = 5
+CRAWL_LOG_FORMAT = "[{time:YYYY-MM-DD HH:mm:ss}] [{level}] {message}"
+
+# 爬取日志使用的级别（与 loguru 内置级别同名）
+CRAWL_LOG_LEVELS = ('INFO', 'SUCCESS', 'ERROR')
+
+# 从日志文件行中解析级别
+LOG_LINE_PATTERN = re.compile(r'^\[[^\]]*\] \[(\w+)\] ')
+
+# 日志条目：(显示文本, 级别)
+LogEntry = Tuple[str, str]
+
+_sink_lock = threading.Lock()
+_sink_id: Optional[int] = None
+
+
+def is_crawl_log(record) -> bool:
+    """loguru 过滤器：是否为爬取日志记录"""
+    return record['extra'].get('crawl_log', False)
+
+
+def ensure_crawl_log_sink():
+    """注册爬取日志文件输出（进程内只注册一次）"""
+    global _sink_id
+    with _sink_lock:
+        if _sink_id is None:
+            _sink_id = logger.add(
+                CRAWL_LOG_FILE,
+                rotation=CRAWL_LOG_ROTATION,
+                retention=CRAWL_LOG_RETENTION,
+                level='INFO',
+                format=CRAWL_LOG_FORMAT,
+                filter=is_crawl_log,
+                encoding='utf-8'
+            )
+
+
+class CrawlLogBuffer:
+    """
+    爬取日志的环形缓冲（线程安全）
+
+    Args:
+        capacity: 缓冲保留的最大行数
+    """
+
+    def __init__(self, capacity: int = CRAWL_LOG_CAPACITY):
+        self.capacity = capacity
+        self._entries: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._logger = logger.bind(crawl_log=True)
+        ensure_crawl_log_sink()
+
+    def append(self, message: str, level: str = 'INFO', timestamp: str = '') -> LogEntry:
+        """
+        记录一条日志：写入日志文件，并保存到缓冲
+
+        Returns:
+            tuple: (显示文本, 级别)
+        """
+        if level not in CRAWL_LOG_LEVELS:
+            level = 'INFO'
+        self._logger.log(level, message)
+
+        entry = (f"[{timestamp}] [{level}] {message}\n", level)
+        with self._lock:
+            self._entries.append(entry)
+        return entry
+
+    def entries(self) -> List[LogEntry]:
+        """缓冲中的日志（从旧到新）"""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        """清空缓冲（日志文件保留）"""
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def log_files() -> List[str]:
+        """日志文件列表（从旧到新，包含已轮转的文件）"""
+        if not os.path.isdir(CRAWL_LOG_DIR):
+            return []
+        current_name = os.path.basename(CRAWL_LOG_FILE)
+        names = [name for name in os.listdir(CRAWL_LOG_DIR) if name.startswith('crawl') and name.endswith('.log')]
+        # 轮转后的文件名带有时间戳（crawl.YYYY-MM-DD_HH-MM-SS_ffffff.log），按名称排序即按时间排序；当前文件最新
+        names.sort(key=lambda name: (name == current_name, name))
+        return [os.path.join(CRAWL_LOG_DIR, name) for name in names]
+
+    def iter_file_lines(self) -> Iterator[str]:
+        """逐行读取全部日志文件"""
+        for path in self.log_files():
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                yield from f
+
+    def search(self, level: Optional[str] = None, text: str = '', limit: Optional[int] = None) -> Tuple[List[LogEntry], int]:
+        """
+        在日志文件中按级别和内容筛选
+
+        Args:
+            level: 日志级别，None 表示全部级别
+            text: 搜索内容（不区分大小写），为空时不按内容过滤
+            limit: 最多返回的行数（保留最新的），默认为缓冲容量
+
+        Returns:
+            tuple: (匹配的日志条目（从旧到新）, 匹配总数)
+        """
+        query = text.strip().lower()
+        matches: deque = deque(maxlen=limit or self.capacity)
+        total = 0
+
+        for line in self.iter_file_lines():
+            match = LOG_LINE_PATTERN.match(line)
+            line_level = match.group(1) if match else 'INFO'
+            if level and line_level != level:
+                continue
+            if query and query not in line.lower():
+                continue
+            matches.append((line if line.endswith('\n') else line + '\n', line_level))
+            total += 1
+
+        return list(matches), total
+
+    def export(self, target_path: str) -> int:
+        """
+        将全部日志文件按时间顺序合并保存到指定文件
+
+        Returns:
+            int: 保存的行数
+        """
+        line_count = 0
+        with open(target_path, 'w', encoding='utf-8') as target:
+            for line in self.iter_file_lines():
+                target.write(line)
+                line_count += 1
+        return line_count
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+流式 CSV 写入工具 - 导出行边生成边写入目标文件，内存占用与导出规模无关
+"""
+
+import csv
+import os
+from typing import Callable, Iterable, Optional
+
+# 进度回调：progress_callback(已完成任务数, 任务总数, 当前任务说明)，在导出线程中调用
+ProgressCallback = Optional[Callable[[int, int, str], None]]
+
+
+def write_csv_rows(file_path: str, rows: Iterable[list], encoding: str = 'utf-8-sig') -> int:
+    """
+    将行迭代器流式写入 CSV 文件。
+
+    - 先写入同目录下的临时文件（.part），完成后原子替换目标文件，
+      导出失败时不会留下半截文件，也不会覆盖已有文件
+    - 首行数据到达时才创建文件，没有任何行时不创建文件
+    - 默认 utf-8-sig 编码（带 BOM），方便 Excel 直接打开
+
+    Args:
+        file_path: 目标文件路径
+        rows: 行迭代器（每行为列表，空列表表示空行）
+        encoding: 文件编码
+
+    Returns:
+        int: 写入的行数（包含表头和空行），0 表示没有数据
+    """
+    temp_path = f"{file_path}.part"
+    csv_file: Optional[object] = None
+    row_count = 0
+
+    try:
+        for row in rows:
+            if csv_file is None:
+                csv_file = open(temp_path, 'w', encoding=encoding, newline='')
+                writer = csv.writer(csv_file, lineterminator='\n')
+            writer.writerow(row)
+            row_count += 1
+
+        if csv_file is None:
+            return 0
+
+        csv_file.close()
+        os.replace(temp_path, file_path)
+        return row_count
+
+    except BaseException:
+        if csv_file is not None:
+            csv_file.close()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
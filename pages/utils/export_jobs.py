@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+批量导出任务 - 按年份范围、多种格式导出积分榜/赛程表
+
+每个 (导出类型, 年份) 作为一个导出单元，在进程池中并行执行，
+各进程使用独立的只读数据库连接，导出行边生成边写入 CSV/XLSX/Parquet，
+XLSX 和 Parquet 中的数值保持为数值类型。
+"""
+
+import csv
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from models import DatabaseManager
+from utils import get_database_settings
+from .csv_export import ProgressCallback
+from .format_match_output import iter_match_output_rows
+from .format_output import ensure_standings_export, get_year_tasks, iter_output_rows
+
+
+# 导出类型：{类型: (名称, 文件名前缀, 行生成函数)}
+EXPORT_KINDS = {
+    'standings': ('积分榜', 'football_data', iter_output_rows),
+    'matches': ('赛程表', 'football_matches', iter_match_output_rows),
+}
+
+# 支持的导出格式
+FORMAT_CSV = 'csv'
+FORMAT_XLSX = 'xlsx'
+FORMAT_PARQUET = 'parquet'
+EXPORT_FORMATS = (FORMAT_CSV, FORMAT_XLSX, FORMAT_PARQUET)
+
+# Parquet 需要本地已安装的列式存储库（任选其一）
+PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+
+# 积分榜三组指标（总/主场/客场）的列名相同，Parquet 列名按出现顺序加前缀区分
+METRIC_GROUP_PREFIXES = ('总', '主场', '客场')
+
+
+def get_available_formats() -> List[str]:
+    """获取当前环境可用的导出格式（Parquet 需安装 pyarrow 或 fastparquet）"""
+    formats = [FORMAT_CSV, FORMAT_XLSX]
+    if any(importlib.util.find_spec(engine) for engine in PARQUET_ENGINES):
+        formats.append(FORMAT_PARQUET)
+    return formats
+
+
+class _CsvSink:
+    """CSV 输出：先写入 .part 临时文件，完成后原子替换目标文件（与 write_csv_rows 一致）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.temp_path = f"{path}.part"
+        self._file = open(self.temp_path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file, lineterminator='\n')
+
+    def append(self, row: list):
+        self._writer.writerow(row)
+
+    def finish(self) -> str:
+        self._file.close()
+        os.replace(self.temp_path, self.path)
+        return self.path
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+class _XlsxSink:
+    """XLSX 输出（只写模式，内存占用与行数无关，数值保持为数值单元格）"""
+
+    def __init__(self, path: str, sheet_title: str):
+        from openpyxl import Workbook
+
+        self.path = path
+        self._workbook = Workbook(write_only=True)
+        self._worksheet = self._workbook.create_sheet(title=sheet_title)
+
+    def append(self, row: list):
+        self._worksheet.append(row)
+
+    def finish(self) -> str:
+        self._workbook.save(self.path)
+        return self.path
+
+    def discard(self):
+        pass
+
+
+class _ParquetSink:
+    """Parquet 输出：首行为表头，跳过分隔空行，结束时一次写出"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._header: Optional[list] = None
+        self._rows: List[list] = []
+
+    def append(self, row: list):
+        if self._header is None:
+            self._header = row
+        elif row:
+            self._rows.append(row)
+
+    def finish(self) -> str:
+        _write_parquet(self._header, self._rows, self.path)
+        return self.path
+
+    def discard(self):
+        self._rows.clear()
+
+
+class _RowsSink:
+    """合并工作簿使用的中间文件：每行一条 JSON，保留数值类型"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def append(self, row: list):
+        self._file.write(json.dumps(row, ensure_ascii=False, default=str))
+        self._file.write('\n')
+
+    def finish(self) -> str:
+        self._file.close()
+        return self.path
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _parquet_columns(header: list) -> List[str]:
+    """
+    Parquet 列名（需唯一）：积分榜三组指标列名相同，按出现顺序加上 总/主场/客场 前缀，
+    其他重复列名加序号后缀
+    """
+    seen = Counter(header)
+    occurrences = Counter()
+    columns = []
+    for name in header:
+        index = occurrences[name]
+        occurrences[name] += 1
+        if seen[name] == 1:
+            columns.append(name)
+        elif seen[name] == len(METRIC_GROUP_PREFIXES):
+            columns.append(f"{METRIC_GROUP_PREFIXES[index]}{name}")
+        else:
+            columns.append(f"{name}_{index + 1}")
+    return columns
+
+
+def _write_parquet(header: list, rows: List[list], parquet_path: str):
+    """将导出行写出为 Parquet（空字符串写为空值，混合类型的列写为字符串）"""
+    import pandas as pd
+
+    df = pd.DataFrame(
+        [[None if value == "" else value for value in row] for row in rows],
+        columns=_parquet_columns(header),
+        dtype=object
+    )
+    for column in df.columns:
+        if df[column].dropna().map(type).nunique() > 1:
+            df[column] = df[column].map(lambda value: None if value is None else str(value))
+    df.convert_dtypes().to_parquet(parquet_path, index=False)
+
+
+def _append_rows_sheet(workbook, rows_path: str, sheet_title: str):
+    """将中间文件中的行追加为工作簿中的一个工作表"""
+    worksheet = workbook.create_sheet(title=sheet_title)
+    with open(rows_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            worksheet.append(json.loads(line))
+
+
+def _export_unit(database_settings: Dict, kind: str, year: str, formats: List[str],
+                 output_dir: str, rows_dir: Optional[str] = None) -> Dict:
+    """
+    导出单元（在子进程中执行）：导出一个年份的一种数据
+
+    查询结果只遍历一次，每行同时写入所选格式的输出，XLSX/Parquet 直接使用原始类型的值。
+
+    Args:
+        database_settings: 数据库连接设置（get_database_settings 的返回值）
+        kind: 导出类型（standings/matches）
+        year: 四位年份字符串
+        formats: 需要单独输出文件的格式
+        output_dir: 输出目录
+        rows_dir: 合并工作簿使用的中间文件目录，None 表示不需要
+
+    Returns:
+        dict: {'kind', 'year', 'row_count', 'files', 'rows_path'}
+    """
+    label, file_prefix, iter_rows = EXPORT_KINDS[kind]
+    base_name = f"{file_prefix}_{year}"
+
+    sinks = []
+    rows_sink = None
+    try:
+        if FORMAT_CSV in formats:
+            sinks.append(_CsvSink(os.path.join(output_dir, f"{base_name}.csv")))
+        if FORMAT_XLSX in formats:
+            sinks.append(_XlsxSink(os.path.join(output_dir, f"{base_name}.xlsx"), f"{label}{year}"))
+        if FORMAT_PARQUET in formats:
+            sinks.append(_ParquetSink(os.path.join(output_dir, f"{base_name}.parquet")))
+        if rows_dir is not None:
+            rows_sink = _RowsSink(os.path.join(rows_dir, f"{base_name}.jsonl"))
+            sinks.append(rows_sink)
+
+        row_count = 0
+        db_manager = DatabaseManager(**database_settings, read_only=True)
+        try:
+            with db_manager.get_session() as session:
+                for row in iter_rows(session, year):
+                    for sink in sinks:
+                        sink.append(row)
+                    row_count += 1
+        finally:
+            db_manager.engine.dispose()
+    except BaseException:
+        for sink in sinks:
+            sink.discard()
+        raise
+
+    result = {'kind': kind, 'year': year, 'row_count': row_count, 'files': [], 'rows_path': None}
+    if not row_count:
+        # 没有数据时不生成文件
+        for sink in sinks:
+            sink.discard()
+        return result
+
+    for sink in sinks:
+        path = sink.finish()
+        if sink is rows_sink:
+            result['rows_path'] = path
+        else:
+            result['files'].append(path)
+    return result
+
+
+def run_export_job(start_year: int, end_year: int, kinds: List[str], formats: List[str], output_dir: str,
+                   combined_workbook: bool = False, progress_callback: ProgressCallback = None,
+                   max_workers: Optional[int] = None) -> List[str]:
+    """
+    按年份范围批量导出（阻塞执行，界面中应在后台线程调用）
+
+    Args:
+        start_year: 起始年份（包含）
+        end_year: 结束年份（包含）
+        kinds: 导出类型列表（standings/matches）
+        formats: 导出格式列表（csv/xlsx/parquet），合并工作簿时 xlsx 输出为一个文件
+        output_dir: 输出目录
+        combined_workbook: 是否将所有年份/类型合并为一个 XLSX 工作簿（每个 (类型, 年份) 一个工作表）
+        progress_callback: 每完成一个导出单元调用一次
+        max_workers: 进程数，None 表示按 CPU 核数
+
+    Returns:
+        list: 生成的文件路径列表
+    """
+    if start_year > end_year:
+        raise ValueError(f"起始年份 {start_year} 不能大于结束年份 {end_year}")
+    unknown_kinds = [kind for kind in kinds if kind not in EXPORT_KINDS]
+    if unknown_kinds or not kinds:
+        raise ValueError(f"导出类型无效: {unknown_kinds or kinds}")
+    unavailable_formats = [fmt for fmt in formats if fmt not in get_available_formats()]
+    if unavailable_formats:
+        raise ValueError(f"当前环境不支持导出格式: {', '.join(unavailable_formats)}")
+    if not formats and not combined_workbook:
+        raise ValueError("请至少选择一种导出格式")
+
+    database_settings = get_database_settings()
+    if 'standings' in kinds:
+        # 子进程使用只读连接，缺失的积分榜导出快照需先在主进程中生成
+        db_manager = DatabaseManager(**database_settings)
+        try:
+            with db_manager.get_session() as session:
+                for year in range(start_year, end_year + 1):
+                    ensure_standings_export(session, [task.id for task in get_year_tasks(session, str(year))])
+        finally:
+            db_manager.engine.dispose()
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 合并工作簿时 XLSX 不再单独按年份输出
+    unit_formats = [fmt for fmt in formats if not (combined_workbook and fmt == FORMAT_XLSX)]
+    rows_dir = tempfile.mkdtemp(prefix='export_', dir=output_dir) if combined_workbook else None
+
+    units = [(kind, str(year)) for kind in kinds for year in range(start_year, end_year + 1)]
+    workers = max_workers or min(len(units), os.cpu_count() or 1)
+
+    results = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_export_unit, database_settings, kind, year, unit_formats, output_dir, rows_dir): (kind, year)
+                for kind, year in units
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                kind, year = futures[future]
+                results[(kind, year)] = future.result()
+                logger.info(f"导出完成: {EXPORT_KINDS[kind][0]} {year}，共 {results[(kind, year)]['row_count']} 行")
+
+                if progress_callback:
+                    progress_callback(done, len(units), f"{EXPORT_KINDS[kind][0]} {year}")
+
+        # 按年份/类型顺序整理输出文件
+        files = [path for unit in units for path in results[unit]['files']]
+
+        if combined_workbook:
+            from openpyxl import Workbook
+
+            rows_paths = [(unit, results[unit]['rows_path']) for unit in units if results[unit]['rows_path']]
+            if rows_paths:
+                workbook = Workbook(write_only=True)
+                for (kind, year), rows_path in rows_paths:
+                    _append_rows_sheet(workbook, rows_path, f"{EXPORT_KINDS[kind][0]}{year}")
+
+                workbook_path = os.path.join(output_dir, f"football_export_{start_year}_{end_year}.xlsx")
+                workbook.save(workbook_path)
+                files.append(workbook_path)
+
+        return files
+
+    finally:
+        if rows_dir is not None:
+            shutil.rmtree(rows_dir, ignore_errors=True)
@@ -6,11 +6,17 @@
 import csv
 import os
 from io import StringIO
-from typing import Dict, List
-from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING, Iterator, List
+
+from sqlalchemy import Integer, cast
+from sqlalchemy.orm import Session, aliased
 
 from models import Match, Task, Team, DatabaseManager
-from utils import get_database_url
+from utils import get_database_settings
+from .csv_export import ProgressCallback, write_csv_rows
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def format_match_output(year: str) -> str:
@@ -18,15 +24,53 @@ def format_match_output(year: str) -> str:
     对外导出函数：根据年份查询赛程数据并返回 CSV 字符串。
     内部自行管理数据库会话。
     """
-    # 使用统一的数据库路径获取方式
-    db = DatabaseManager(get_database_url())
+    # 使用统一的数据库配置获取方式
+    db = DatabaseManager(**get_database_settings())
     with db.get_session() as session:
         return _format_match_output_with_session(session, year)
 
 
+def export_match_output(year: str, file_path: str, progress_callback: ProgressCallback = None) -> int:
+    """
+    对外导出函数：根据年份查询赛程数据并流式写入 CSV 文件（utf-8-sig）。
+    内部自行管理数据库会话。
+
+    Args:
+        year: 四位年份字符串，如 "2024"
+        file_path: 目标文件路径
+        progress_callback: 每完成一个任务调用一次（在导出线程中调用）
+
+    Returns:
+        int: 写入的行数，0 表示该年份没有数据（不会创建文件）
+    """
+    db = DatabaseManager(**get_database_settings())
+    with db.get_session() as session:
+        return write_csv_rows(file_path, iter_match_output_rows(session, year, progress_callback))
+
+
 def _format_match_output_with_session(session: Session, year: str) -> str:
     """
-    导出指定年份的所有赛程数据为 CSV 字符串。
+    导出指定年份的所有赛程数据为 CSV 字符串（行内容见 iter_match_output_rows）。
+
+    Args:
+        session: SQLAlchemy 会话
+        year: 四位年份字符串，如 "2024"
+
+    Returns:
+        str: CSV 内容字符串（UTF-8 文本）
+    """
+    output = StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerows(iter_match_output_rows(session, year))
+
+    csv_content = output.getvalue()
+    output.close()
+    return csv_content
+
+
+def iter_match_output_rows(session: Session, year: str, progress_callback: ProgressCallback = None) -> Iterator[list]:
+    """
+    逐行生成指定年份的所有赛程数据（含表头，空列表表示空行）。
 
     - 按任务分组，每个任务内按轮次分组
     - 每个轮次之间空一行
@@ -36,9 +80,10 @@ def _format_match_output_with_session(session: Session, year: str) -> str:
     Args:
         session: SQLAlchemy 会话
         year: 四位年份字符串，如 "2024"
+        progress_callback: 每完成一个任务调用一次
 
-    Returns:
-        str: CSV 内容字符串（UTF-8 文本）
+    Yields:
+        list: CSV 行；没有任务时不产生任何行
     """
     # 查找指定年份的所有任务。如果输入 2024，同时查询 2024-2025 赛季的任务
     tasks1 = session.query(Task).filter(Task.year == year).order_by(Task.id).all()
@@ -47,155 +92,155 @@ def _format_match_output_with_session(session: Session, year: str) -> str:
     tasks = tasks1 + tasks2
 
     if not tasks:
-        return ""
-
-    # CSV 输出缓冲区
-    output = StringIO()
-    writer = csv.writer(output, lineterminator='\n')
+        return
 
     # 表头
-    headers = [
+    yield [
         "比赛ID", "联赛", "赛季年份", "轮次", "大致日期",
         "比赛时间", "主队", "主队得分", "客队得分", "客队", "比赛状态"
     ]
-    writer.writerow(headers)
+
+    # 一次查询该年份全部比赛，转为列式数据后向量化计算
+    matches_df = _load_matches_frame(session, [task.id for task in tasks])
+    task_groups = {task_id: group for task_id, group in matches_df.groupby('task_id', sort=False)}
 
     for task_idx, task in enumerate(tasks):
-        # 查询该任务的所有比赛
-        matches = (
-            session.query(
-                Match,
-                Team.home_name_cn.label('home_team_name'),
-                Team.home_name_cn.label('away_team_name'),
-                Task.league,
-                Task.year
-            )
-            .join(Team, (Match.home_team_code == Team.team_code) & (Match.task_id == Team.task_id))
-            .join(Task, Match.task_id == Task.id)
-            .filter(Match.task_id == task.id)
-            .order_by(Match.round_num, Match.match_time)
-            .all()
-        )
+        task_matches = task_groups.get(task.id)
 
-        if not matches:
-            continue
-
-        # 计算每个轮次的"大致日期"
-        round_approximate_dates = _calculate_round_dates(matches)
-
-        # 按轮次分组
-        from collections import defaultdict
-        round_matches = defaultdict(list)
-        for match_data, home_team_name, away_team_name, league, year in matches:
-            round_matches[match_data.round_num].append(
-                (match_data, home_team_name, away_team_name, league, year)
-            )
-
-        # 按轮次升序输出
-        sorted_rounds = sorted(round_matches.keys())
-
-        for round_idx, round_num in enumerate(sorted_rounds):
-            round_match_list = round_matches[round_num]
-
-            # 获取该轮次的"大致日期"
-            approximate_date = round_approximate_dates.get(round_num, "")
-
-            # 输出该轮次的所有比赛
-            for match_data, home_team_name, away_team_name, league, year in round_match_list:
-                # 格式化比分 - 拆分为主分和客分
-                if match_data.full_score:
-                    try:
-                        # 解析比分格式 "5-2"
-                        if '-' in match_data.full_score:
-                            home_score, away_score = match_data.full_score.split('-', 1)
-                            home_score = home_score.strip()
-                            away_score = away_score.strip()
-                        else:
-                            home_score = match_data.full_score
-                            away_score = match_data.full_score
-                    except:
-                        home_score = match_data.full_score
-                        away_score = match_data.full_score
-                else:
-                    home_score = ""
-                    away_score = ""
-
-                # 格式化时间（match_time是字符串格式 "08-07 22:00"）
-                match_time = match_data.match_time if match_data.match_time else '待定'
-
-                # 状态判断
-                status = "已结束" if match_data.full_score else "未开始"
-
-                # 写入CSV行
-                writer.writerow([
-                    str(match_data.match_id),  # 比赛ID
-                    league or "",              # 联赛
-                    str(year) if year else "",  # 赛季年份
-                    str(match_data.round_num), # 轮次
-                    approximate_date,          # 大致日期
-                    match_time,               # 比赛时间
-                    home_team_name or f"队伍{match_data.home_team_code}",    # 主队
-                    home_score,               # 主队得分
-                    away_score,               # 客队得分
-                    away_team_name or f"队伍{match_data.away_team_code}",    # 客队
-                    status                    # 比赛状态
-                ])
-
-            # 轮次之间空一行（最后一轮不加）
-            if round_idx < len(sorted_rounds) - 1:
-                writer.writerow([])
-
-        # 任务之间空一行（最后一个任务不加）
-        if task_idx < len(tasks) - 1:
-            writer.writerow([])
+        if task_matches is not None:
+            round_groups = list(task_matches.groupby('round_num', sort=True))
 
-    csv_content = output.getvalue()
-    output.close()
-    return csv_content
+            for round_idx, (round_num, round_matches) in enumerate(round_groups):
+                # 输出该轮次的所有比赛
+                yield from round_matches[OUTPUT_COLUMNS].values.tolist()
 
+                # 轮次之间空一行（最后一轮不加）
+                if round_idx < len(round_groups) - 1:
+                    yield []
 
-def _calculate_round_dates(matches) -> Dict[int, str]:
+            # 任务之间空一行（最后一个任务不加）
+            if task_idx < len(tasks) - 1:
+                yield []
+
+        if progress_callback:
+            progress_callback(task_idx + 1, len(tasks), f"{task.league} {task.year}")
+
+
+# 导出列（与表头一一对应）
+OUTPUT_COLUMNS = [
+    'match_id', 'league_text', 'year_text', 'round_num', 'approximate_date',
+    'match_time_text', 'home_team_text', 'home_score', 'away_score', 'away_team_text', 'status',
+]
+
+
+def _load_matches_frame(session: Session, task_ids: List[int]) -> 'pd.DataFrame':
+    """
+    一次查询多个任务的全部比赛（主/客队分别关联队伍表），并生成导出所需的各列。
+
+    Args:
+        session: SQLAlchemy 会话
+        task_ids: 任务ID列表
+
+    Returns:
+        DataFrame: 按 (任务, 轮次, 比赛时间) 排序的比赛数据，包含 OUTPUT_COLUMNS 各列
+    """
+    import pandas as pd
+
+    home_team = aliased(Team)
+    away_team = aliased(Team)
+
+    query = (
+        session.query(
+            Match.task_id,
+            Match.match_id,
+            Match.round_num,
+            Match.match_time,
+            Match.home_team_code,
+            Match.away_team_code,
+            Match.full_score,
+            home_team.home_name_cn.label('home_team_name'),
+            away_team.home_name_cn.label('away_team_name'),
+            Task.league,
+            Task.year,
+        )
+        .join(Task, Match.task_id == Task.id)
+        # 比赛中的队伍编码转换为整数再与 Team.team_code 比较，联接可使用 (task_id, team_code) 索引
+        .outerjoin(home_team, (Match.task_id == home_team.task_id) & (home_team.team_code == cast(Match.home_team_code, Integer)))
+        .outerjoin(away_team, (Match.task_id == away_team.task_id) & (away_team.team_code == cast(Match.away_team_code, Integer)))
+        .filter(Match.task_id.in_(task_ids))
+        .order_by(Match.task_id, Match.round_num, Match.match_time, Match.match_id)
+    )
+    df = pd.DataFrame(query.all(), columns=[column['name'] for column in query.column_descriptions])
+    if df.empty:
+        return df
+
+    df['league_text'] = df['league'].fillna('')
+    df['year_text'] = df['year'].fillna('').astype(str)
+
+    # 格式化时间（match_time是字符串格式 "08-07 22:00"）
+    match_time = df['match_time'].where(df['match_time'].fillna('') != '')
+    df['match_time_text'] = match_time.fillna('待定')
+
+    # 队伍名称缺失时显示队伍编码
+    df['home_team_text'] = df['home_team_name'].where(df['home_team_name'].fillna('') != '', '队伍' + df['home_team_code'].astype(str))
+    df['away_team_text'] = df['away_team_name'].where(df['away_team_name'].fillna('') != '', '队伍' + df['away_team_code'].astype(str))
+
+    # 比分 "5-2" 拆分为主分和客分；没有 "-" 时两列都填原值
+    full_score = df['full_score'].fillna('')
+    has_score = full_score != ''
+    score_parts = full_score.str.split('-', n=1, expand=True).reindex(columns=[0, 1])
+    has_separator = full_score.str.contains('-', regex=False)
+    df['home_score'] = full_score.where(~has_separator, score_parts[0].str.strip())
+    df['away_score'] = full_score.where(~has_separator, score_parts[1].str.strip())
+    # 数字比分输出为整数（CSV 中内容不变，XLSX/Parquet 中为数值）
+    df['home_score'] = df['home_score'].map(_score_value)
+    df['away_score'] = df['away_score'].map(_score_value)
+
+    # 状态判断
+    df['status'] = has_score.map({True: '已结束', False: '未开始'})
+
+    df['approximate_date'] = _calculate_round_dates(df)
+    return df
+
+
+def _score_value(score: str):
+    """数字比分转为整数，其他内容（空、非数字）保持原样"""
+    return int(score) if score.isdigit() else score
+
+
+def _calculate_round_dates(df: 'pd.DataFrame') -> 'pd.Series':
     """
-    计算每个轮次的"大致日期"（出现次数最多的日期）
+    计算每个轮次的"大致日期"（出现次数最多的日期，次数相同取先出现的日期）
 
     Args:
-        matches: 查询到的所有Match对象列表，格式为 (match_data, home_name, away_name, league, year)
+        df: 已按 (任务, 轮次, 比赛时间) 排序的比赛数据
 
     Returns:
-        dict: {轮次号: 大致日期} 的映射
+        Series: 与 df 行对齐的大致日期，没有可用日期的轮次和轮次为空或 0 的比赛为 ""
     """
-    round_date_count = {}
-    round_approximate_date = {}
-
-    for match_data, home_name, away_name, league, year in matches:
-        round_num = match_data.round_num
-        if not round_num:
-            continue
-
-        # 提取日期部分（从 "08-07 22:00" 提取 "08-07"）
-        if match_data.match_time and isinstance(match_data.match_time, str):
-            try:
-                # 处理 "08-07 22:00" 格式
-                date_part = match_data.match_time.split()[0]
-            except:
-                date_part = None
-        else:
-            date_part = None
-
-        if date_part:
-            # 统计每个轮次的日期出现次数
-            if round_num not in round_date_count:
-                round_date_count[round_num] = {}
-            round_date_count[round_num][date_part] = round_date_count[round_num].get(date_part, 0) + 1
-
-    # 找出每个轮次出现次数最多的日期
-    for round_num, date_counts in round_date_count.items():
-        if date_counts:
-            # 按出现次数排序，取最多
-            most_common_date = max(date_counts.items(), key=lambda x: x[1])[0]
-            round_approximate_date[round_num] = most_common_date
-
-    return round_approximate_date
+    import pandas as pd
+
+    # 提取日期部分（从 "08-07 22:00" 提取 "08-07"）
+    dates = df['match_time'].where(df['match_time'].map(lambda value: isinstance(value, str)))
+    date_part = dates.str.split().str[0]
+    # 轮次为空或 0 的比赛不计算大致日期
+    date_part = date_part.where(df['round_num'].fillna(0).map(bool))
+
+    counts = (
+        df.assign(date_part=date_part)
+        .dropna(subset=['date_part'])
+        .groupby(['task_id', 'round_num', 'date_part'], sort=False)
+        .size()
+        .reset_index(name='count')
+    )
+    modal_dates = (
+        counts.sort_values('count', ascending=False, kind='stable')
+        .drop_duplicates(subset=['task_id', 'round_num'])
+        .set_index(['task_id', 'round_num'])['date_part']
+    )
+
+    round_keys = pd.MultiIndex.from_frame(df[['task_id', 'round_num']])
+    return pd.Series(modal_dates.reindex(round_keys).fillna('').values, index=df.index)
 
 
 def validate_year_format(year_str: str) -> bool:
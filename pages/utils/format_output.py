@@ -5,13 +5,17 @@
 
 import csv
 import os
+import threading
 from io import StringIO
+from itertools import groupby
 
+from sqlalchemy import case, func, insert, update
 from sqlalchemy.orm import Session
-from typing import Dict, Tuple, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from models import Match, Standings, Task, Team, DatabaseManager
-from utils import get_database_url
+from models import Match, Standings, StandingsExport, Task, Team, DatabaseManager
+from utils import get_database_settings
+from .csv_export import ProgressCallback, write_csv_rows
 
 
 def format_output(year: str) -> str:
@@ -19,88 +23,115 @@ def format_output(year: str) -> str:
     对外导出函数：根据年份查询数据并返回 CSV 字符串。
     内部自行管理数据库会话。
     """
-    # 使用统一的数据库路径获取方式
-    db = DatabaseManager(get_database_url())
+    # 使用统一的数据库配置获取方式
+    db = DatabaseManager(**get_database_settings())
     with db.get_session() as session:
         return _format_output_with_session(session, year)
 
 
-def _build_team_promotion_cache(session: Session, year: str) -> Dict[Tuple[str, str], str]:
+def export_output(year: str, file_path: str, progress_callback: ProgressCallback = None) -> int:
     """
-    构建球队升班马/降班马的缓存映射。
-    
+    对外导出函数：根据年份查询数据并流式写入 CSV 文件（utf-8-sig）。
+    内部自行管理数据库会话，导出过程中内存占用不随数据量增长。
+
     Args:
-        session: SQLAlchemy 会话
-        year: 基准年份（如 "2025"）
-        
+        year: 四位年份字符串，如 "2022"
+        file_path: 目标文件路径
+        progress_callback: 每完成一个任务调用一次（在导出线程中调用）
+
     Returns:
-        Dict: {(team_code, target_year): "升班马"/"降班马"/""} 的映射
+        int: 写入的行数，0 表示该年份没有数据（不会创建文件）
     """
-    cache = {}
-    
-    # 固定检查2025, 2024, 2023这三个年份
-    years_to_check = [2025, 2024, 2023]
-    
-    # 获取所有相关的team_code
-    all_team_codes = (
-        session.query(Team.team_code)
-        .distinct()
+    db = DatabaseManager(**get_database_settings())
+    with db.get_session() as session:
+        # 先补齐缺失的导出快照并提交，导出过程只做读取
+        ensure_standings_export(session, [task.id for task in get_year_tasks(session, year)])
+        session.commit()
+        return write_csv_rows(file_path, iter_output_rows(session, year, progress_callback))
+
+
+# 升降级缓存：{(数据库地址, 数据修订号): 映射}，数据未变化时重复导出直接复用
+_promotion_cache: Dict[Tuple[str, tuple], Dict[Tuple[str, str], str]] = {}
+_promotion_cache_lock = threading.Lock()
+
+
+def _get_data_revision(session: Session) -> tuple:
+    """
+    获取队伍/任务数据的修订号（行数、最大ID、最近更新时间），
+    任意新增、删除或修改都会改变该值。
+    """
+    team_revision = session.query(func.count(Team.id), func.max(Team.id), func.max(Team.updated_at)).one()
+    task_revision = session.query(func.count(Task.id), func.max(Task.id), func.max(Task.updated_at)).one()
+    return tuple(team_revision) + tuple(task_revision)
+
+
+def _compute_team_promotion_map(session: Session) -> Dict[Tuple[str, str], str]:
+    """
+    一次分组查询所有队伍在各赛季的级别，向量化比较相邻赛季得到升降级状态。
+
+    Returns:
+        Dict: {(team_code, 赛季起始年份): "升班马"/"降班马"/""}，只包含两个赛季都有数据的组合
+    """
+    rows = (
+        session.query(Team.team_code, Task.year, func.min(Task.level))
+        .join(Task, Team.task_id == Task.id)
+        .group_by(Team.team_code, Task.year)
         .all()
     )
+    if not rows:
+        return {}
+
+    import pandas as pd
+
+    df = pd.DataFrame(rows, columns=['team_code', 'year', 'level']).dropna()
+    df['team_code'] = df['team_code'].astype(str)
+    # 提取赛季起始年份（处理 2025-2026 -> 2025 的情况），无法解析的年份忽略
+    df['season'] = pd.to_numeric(df['year'].astype(str).str.split('-').str[0], errors='coerce')
+    df = df.dropna(subset=['season'])
+    df['season'] = df['season'].astype(int)
+
+    # 同一赛季出现在多个级别时取最高级别（level数字越小等级越高）
+    levels = df.groupby(['team_code', 'season'], as_index=False)['level'].min()
+
+    previous = levels.assign(season=levels['season'] + 1).rename(columns={'level': 'prev_level'})
+    merged = levels.merge(previous, on=['team_code', 'season'], how='inner')
+
+    merged['status'] = ''
+    merged.loc[merged['level'] < merged['prev_level'], 'status'] = '升班马'
+    merged.loc[merged['level'] > merged['prev_level'], 'status'] = '降班马'
+
+    return dict(zip(zip(merged['team_code'], merged['season'].astype(str)), merged['status']))
+
+
+def _build_team_promotion_cache(session: Session, year: str) -> Dict[Tuple[str, str], str]:
+    """
+    构建球队升班马/降班马的缓存映射（按数据修订号缓存，数据未变化时复用）。
     
-    for team_code_tuple in all_team_codes:
-        team_code = str(team_code_tuple[0])  # 确保转换为字符串
-        
-        # 获取该队伍在不同年份的level信息
-        team_year_levels = {}
-        
-        # 查询该team_code在所有任务中的level信息
-        team_tasks = (
-            session.query(Task.year, Task.level)
-            .join(Team, Team.task_id == Task.id)
-            .filter(Team.team_code == team_code)
-            .distinct()
-            .all()
-        )
-        
-        for task_year, task_level in team_tasks:
-            if task_year and task_level is not None:
-                # 提取年份（处理 2025-2026 -> 2025 的情况）
-                try:
-                    if '-' in task_year:
-                        extracted_year = int(task_year.split('-')[0])
-                    else:
-                        extracted_year = int(task_year)
-                    
-                    if extracted_year in years_to_check:
-                        team_year_levels[extracted_year] = task_level
-                except ValueError:
-                    continue
+    Args:
+        session: SQLAlchemy 会话
+        year: 基准年份（如 "2025"），映射包含所有赛季，不受该参数限制
         
-        # 为每个目标年份计算升降级状态
-        for target_year in years_to_check:
-            target_year_str = str(target_year)
-            prev_year = target_year - 1
-            
-            if target_year in team_year_levels and prev_year in team_year_levels:
-                current_level = team_year_levels[target_year]
-                prev_level = team_year_levels[prev_year]
-                
-                if current_level < prev_level:  # level数字越小等级越高
-                    cache[(team_code, target_year_str)] = "升班马"
-                elif current_level > prev_level:
-                    cache[(team_code, target_year_str)] = "降班马"
-                else:
-                    cache[(team_code, target_year_str)] = ""
-            else:
-                cache[(team_code, target_year_str)] = ""
-    
-    return cache
+    Returns:
+        Dict: {(team_code, target_year): "升班马"/"降班马"/""} 的映射，缺失的组合视为 ""
+    """
+    cache_key = (str(session.get_bind().url), _get_data_revision(session))
 
+    with _promotion_cache_lock:
+        cached = _promotion_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-def _format_output_with_session(session: Session, year: str) -> str:
+    promotion_map = _compute_team_promotion_map(session)
+
+    with _promotion_cache_lock:
+        _promotion_cache.clear()
+        _promotion_cache[cache_key] = promotion_map
+    return promotion_map
+
+
+def iter_output_rows(session: Session, year: str, progress_callback: ProgressCallback = None) -> Iterator[list]:
     """
-    导出指定年份的所有任务数据为 CSV 字符串。
+    逐行生成指定年份所有任务的导出数据（含表头，空列表表示空行）。
 
     - 按轮次从低到高导出
     - 每个轮次之间空一行
@@ -111,150 +142,305 @@ def _format_output_with_session(session: Session, year: str) -> str:
     Args:
         session: SQLAlchemy 会话
         year: 四位年份字符串，如 "2022"
+        progress_callback: 每完成一个任务调用一次
 
-    Returns:
-        str: CSV 内容字符串（UTF-8 文本；是否带 BOM 由写文件方决定）
+    Yields:
+        list: CSV 行；没有任务时不产生任何行
     """
 
-    # 查找指定年份的所有任务。如果输入 2024，同时查询 2024-2025 赛季的任务
-    tasks1 = session.query(Task).filter(Task.year == year).order_by(Task.id).all()
-    year2 = f"{year}-{int(year) + 1}"
-    tasks2 = session.query(Task).filter(Task.year == year2).order_by(Task.id).all()
-    tasks = tasks1 + tasks2
+    tasks = get_year_tasks(session, year)
 
     if not tasks:
-        return ""
+        return
     
     # 构建升班马/降班马缓存
     promotion_cache = _build_team_promotion_cache(session, year)
 
-    # CSV 输出缓冲区
-    output = StringIO()
-    writer = csv.writer(output, lineterminator='\n')
-
     # 表头
-    headers = [
+    yield [
         "联赛", "赛季", "年份", "等级", "球队名称", "排名",
         "赛/轮", "积分", "胜率", "得球数", "失球数", "净胜球",  # 总
         "赛/轮", "积分", "胜率", "得球数", "失球数", "净胜球",  # 主
         "赛/轮", "积分", "胜率", "得球数", "失球数", "净胜球",  # 客
         "2025队伍类型", "2024队伍类型", "2023队伍类型",  # 升降级信息
     ]
-    writer.writerow(headers)
 
-    for task in tasks:
-        # 取该任务的所有轮次，升序
-        rounds = (
-            session.query(Match.round_num)
-            .filter(Match.task_id == task.id)
-            .distinct()
-            .order_by(Match.round_num)
-            .all()
-        )
+    task_ids = [task.id for task in tasks]
+    snapshot_task_ids = _get_snapshot_task_ids(session, task_ids)
+
+    # 已有快照的任务按 (任务顺序, position) 一次顺序扫描
+    year_order = case((Task.year == year, 0), else_=1)
+    snapshot_rows = (
+        session.query(*StandingsExport.__table__.columns)
+        .join(Task, StandingsExport.task_id == Task.id)
+        .filter(StandingsExport.task_id.in_(sorted(snapshot_task_ids)))
+        .order_by(year_order, StandingsExport.task_id, StandingsExport.position)
+        .yield_per(1000)
+    )
+    snapshot_groups = groupby((row._mapping for row in snapshot_rows), key=lambda record: record['task_id'])
+
+    for task_index, task in enumerate(tasks, start=1):
+        if task.id in snapshot_task_ids:
+            _, records = next(snapshot_groups)
+        elif task.standings_export_built_at is not None:
+            # 快照已生成但为空
+            records = []
+        else:
+            # 快照缺失（如只读连接下尚未生成）时即时计算，不写入数据库
+            records = _build_task_export_records(session, task.id)
 
-        for idx, round_data in enumerate(rounds):
-            round_num = round_data[0]
-            if not round_num:
-                continue
+        for record in records:
+            yield _format_snapshot_row(record, task, base_year=year, promotion_cache=promotion_cache)
 
-            _export_round_data(writer, session, task, round_num, base_year=year, promotion_cache=promotion_cache)
+        if progress_callback:
+            progress_callback(task_index, len(tasks), f"{task.league} {task.year}")
 
-            # 轮次之间空一行（最后一轮不加）
-            if idx < len(rounds) - 1:
-                writer.writerow([])
+
+def get_year_tasks(session: Session, year: str) -> List[Task]:
+    """查找指定年份的所有任务。如果输入 2024，同时查询 2024-2025 赛季的任务"""
+    tasks1 = session.query(Task).filter(Task.year == year).order_by(Task.id).all()
+    year2 = f"{year}-{int(year) + 1}"
+    tasks2 = session.query(Task).filter(Task.year == year2).order_by(Task.id).all()
+    return tasks1 + tasks2
+
+
+def _format_output_with_session(session: Session, year: str) -> str:
+    """
+    导出指定年份的所有任务数据为 CSV 字符串（行内容见 iter_output_rows）。
+
+    Args:
+        session: SQLAlchemy 会话
+        year: 四位年份字符串，如 "2022"
+
+    Returns:
+        str: CSV 内容字符串（UTF-8 文本；是否带 BOM 由写文件方决定）
+    """
+    output = StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerows(iter_output_rows(session, year))
 
     csv_content = output.getvalue()
     output.close()
     return csv_content
 
 
-def _export_round_data(
-    writer: csv.writer, session: Session, task: Task, round_num: int, base_year: str, promotion_cache: Dict[Tuple[str, str], str]
-):
-    """
-    导出单个任务在某个轮次的三类积分榜（总/主/客）汇总到每队一行。
-    使用 Standings.rank 升序作为行顺序，球队名从 Team 表基于 (task_id, round_num) 获取。
+# 三类积分榜依次对应导出的三组指标：总/主/客
+STANDINGS_TYPES = ("total", "home", "away")
+
+# 快照表中的指标列（与表头中三组指标的顺序一致）
+METRIC_COLUMNS = [
+    f'{standings_type}_{metric}'
+    for standings_type in STANDINGS_TYPES
+    for metric in ('games', 'points', 'win_pct', 'goals_for', 'goals_against', 'goal_diff')
+]
+EMPTY_METRICS = {column: None for column in METRIC_COLUMNS}
+
+
+def _format_win_pct(wins: int, games: int) -> str:
+    """胜率百分比，与 Standings.win_pct 的格式保持一致"""
+    if games == 0:
+        return "0.0%"
+    return f"{(wins / games * 100):.1f}%"
+
+
+def _build_task_export_records(session: Session, task_id: int) -> List[dict]:
     """
+    生成单个任务的积分榜导出快照行（含轮次之间的空行标记）。
 
-    # 用三类类型补全三组指标
-    standings_types = ["total", "home", "away"]
+    每个任务只执行三次查询（轮次、队伍名称、全部积分榜），
+    三类积分榜在内存中按 (类型, 轮次, team_code) 透视，避免逐队逐类型查询。
 
-    # 总积分榜（决定排名与行数）：按 rank 升序
-    total_standings = (
-        session.query(Standings)
-        .filter(
-            Standings.task_id == task.id,
-            Standings.round_num == round_num,
-            Standings.standings_category == "total",
+    Returns:
+        list: StandingsExport 的字段字典列表，按 position 顺序排列
+    """
+    # 取该任务的所有轮次，升序
+    rounds = [
+        round_data[0]
+        for round_data in (
+            session.query(Match.round_num)
+            .filter(Match.task_id == task_id)
+            .distinct()
+            .order_by(Match.round_num)
+            .all()
         )
-        .order_by(Standings.rank.asc())
+    ]
+    if not rounds:
+        return []
+
+    # 队伍编码 -> 中文名
+    team_names = {
+        str(team_code): home_name_cn
+        for team_code, home_name_cn in (
+            session.query(Team.team_code, Team.home_name_cn)
+            .filter(Team.task_id == task_id)
+            .all()
+        )
+    }
+
+    # 一次取出该任务的全部积分榜，按 id 顺序保证同键取第一条
+    standings_rows = (
+        session.query(
+            Standings.standings_category,
+            Standings.round_num,
+            Standings.team_code,
+            Standings.rank,
+            Standings.games,
+            Standings.points,
+            Standings.wins,
+            Standings.goals_for,
+            Standings.goals_against,
+            Standings.goal_diff,
+        )
+        .filter(Standings.task_id == task_id)
+        .order_by(Standings.id)
         .all()
     )
 
-    if not total_standings:
-        return
+    # (类型, 轮次, team_code) -> 六项指标；轮次 -> 总积分榜行（决定排名与行数）
+    metrics: Dict[Tuple[str, int, str], dict] = {}
+    total_by_round: Dict[int, list] = {}
+    for standing in standings_rows:
+        team_code = str(standing.team_code)
+        category = standing.standings_category
+        key = (category, standing.round_num, team_code)
+        if key in metrics or category not in STANDINGS_TYPES:
+            continue
+        metrics[key] = {
+            f'{category}_games': standing.games or 0,                                # 赛/轮
+            f'{category}_points': standing.points or 0,                              # 积分
+            f'{category}_win_pct': _format_win_pct(standing.wins, standing.games),   # 胜率
+            f'{category}_goals_for': standing.goals_for or 0,                        # 得球数
+            f'{category}_goals_against': standing.goals_against or 0,                # 失球数
+            f'{category}_goal_diff': standing.goal_diff or 0,                        # 净胜球
+        }
+        if category == "total":
+            total_by_round.setdefault(standing.round_num, []).append((standing.rank, team_code))
+
+    records = []
+    for idx, round_num in enumerate(rounds):
+        if not round_num:
+            continue
+
+        # 总积分榜按 rank 升序（稳定排序，同名次保持入库顺序）
+        for rank, team_code in sorted(total_by_round.get(round_num, []), key=lambda item: item[0]):
+            record = dict(EMPTY_METRICS)
+            record.update(
+                task_id=task_id,
+                position=len(records),
+                round_num=round_num,
+                is_separator=False,
+                team_code=team_code,
+                team_name=team_names.get(team_code, ""),
+                rank=rank,
+            )
+            # 三类积分榜补齐指标（缺失的保持为空）
+            for standings_type in STANDINGS_TYPES:
+                record.update(metrics.get((standings_type, round_num, team_code), {}))
+            records.append(record)
+
+        # 轮次之间空一行（最后一轮不加）
+        if idx < len(rounds) - 1:
+            record = dict(EMPTY_METRICS)
+            record.update(
+                task_id=task_id, position=len(records), round_num=round_num, is_separator=True,
+                team_code=None, team_name=None, rank=None,
+            )
+            records.append(record)
 
-    # 按排名构建本轮的所有行，直接通过team_code匹配中文名
-    rows: list[list] = []
-    for total_standing in total_standings:
-        team_code = str(total_standing.team_code)
-        
-        # 通过team_code匹配中文名
-        team = (
-            session.query(Team)
-            .filter(Team.task_id == task.id, Team.team_code == team_code)
-            .first()
+    return records
+
+
+def refresh_standings_export(session: Session, task_id: int) -> int:
+    """
+    重新生成单个任务的积分榜导出快照（在任务爬取完成、提交事务前调用）
+
+    同时记录任务的快照生成时间，没有积分榜的任务快照为空，也不会在导出时重复生成。
+
+    Args:
+        session: SQLAlchemy 会话
+        task_id: 任务ID
+
+    Returns:
+        int: 快照行数
+    """
+    session.query(StandingsExport).filter(StandingsExport.task_id == task_id).delete(synchronize_session=False)
+    records = _build_task_export_records(session, task_id)
+    if records:
+        session.execute(insert(StandingsExport), records)
+    _mark_standings_export_built(session, [task_id])
+    return len(records)
+
+
+def _mark_standings_export_built(session: Session, task_ids: List[int]):
+    """记录任务的快照生成时间（不改变任务的 updated_at）"""
+    tasks = Task.__table__
+    session.execute(
+        update(tasks)
+        .where(tasks.c.id.in_(task_ids))
+        .values(standings_export_built_at=func.current_timestamp(), updated_at=tasks.c.updated_at)
+    )
+
+
+def _get_snapshot_task_ids(session: Session, task_ids: List[int]) -> set:
+    """获取已有导出快照的任务ID集合"""
+    if not task_ids:
+        return set()
+    return {
+        task_id
+        for (task_id,) in (
+            session.query(StandingsExport.task_id)
+            .filter(StandingsExport.task_id.in_(task_ids))
+            .distinct()
+            .all()
         )
-        team_name = team.home_name_cn if team else ""
-
-        # 基本信息（直接填入球队名称）
-        row = [
-            task.league or "",            # 联赛
-            task.year or "",              # 赛季（原始）
-            base_year or "",              # 年份（输入的年份）
-            str(task.level) if task.level is not None else "",  # 等级
-            team_name,                    # 球队名称（直接匹配）
-            total_standing.rank or "",    # 排名
-        ]
-
-        # 三类积分榜补齐指标
-        for standings_type in standings_types:
-            standing = (
-                session.query(Standings)
-                .filter(
-                    Standings.task_id == task.id,
-                    Standings.round_num == round_num,
-                    Standings.standings_category == standings_type,
-                    Standings.team_code == team_code,
-                )
-                .first()
-            )
+    }
 
-            if standing:
-                row.extend(
-                    [
-                        standing.games or 0,           # 赛/轮
-                        standing.points or 0,          # 积分
-                        standing.win_pct,              # 胜率（模型返回字符串）
-                        standing.goals_for or 0,       # 得球数
-                        standing.goals_against or 0,   # 失球数
-                        standing.goal_diff or 0,       # 净胜球
-                    ]
-                )
-            else:
-                row.extend(["", "", "", "", "", ""])
-        
-        # 添加升降级信息（固定三个年份的队伍类型）
-        for target_year_str in ["2025", "2024", "2023"]:
-            team_type = promotion_cache.get((team_code, target_year_str), "")
-            row.append(team_type)
 
-        rows.append(row)
+def ensure_standings_export(session: Session, task_ids: List[int]) -> int:
+    """
+    为尚未生成快照的任务生成导出快照（如快照表建立前已爬取的任务）
 
-    # 输出所有行
-    for row in rows:
-        writer.writerow(row)
+    按任务的快照生成时间判断，快照为空（从未爬取或没有积分榜）的任务生成一次后不再重复生成。
+
+    Returns:
+        int: 本次生成快照的任务数
+    """
+    if not task_ids:
+        return 0
+    missing_task_ids = [
+        task_id
+        for (task_id,) in (
+            session.query(Task.id)
+            .filter(Task.id.in_(task_ids), Task.standings_export_built_at.is_(None))
+            .order_by(Task.id)
+            .all()
+        )
+    ]
+    for task_id in missing_task_ids:
+        refresh_standings_export(session, task_id)
+    return len(missing_task_ids)
+
+
+def _format_snapshot_row(record, task: Task, base_year: str, promotion_cache: Dict[Tuple[str, str], str]) -> list:
+    """将快照行转换为 CSV 行（联赛/赛季/等级取自任务，升降级信息导出时匹配）"""
+    if record['is_separator']:
+        return []
+
+    row = [
+        task.league or "",                                   # 联赛
+        task.year or "",                                     # 赛季（原始）
+        base_year or "",                                     # 年份（输入的年份）
+        str(task.level) if task.level is not None else "",   # 等级
+        record['team_name'] or "",                           # 球队名称
+        record['rank'] or "",                                # 排名
+    ]
+    row.extend("" if record[column] is None else record[column] for column in METRIC_COLUMNS)
 
+    # 添加升降级信息（固定三个年份的队伍类型）
+    team_code = record['team_code']
+    for target_year_str in ["2025", "2024", "2023"]:
+        row.append(promotion_cache.get((team_code, target_year_str), ""))
+    return row
 
 
 def validate_year_format(year_str: str) -> bool:
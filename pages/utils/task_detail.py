@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+任务详情加载 - 数据管理页面选中任务后，在后台线程中查询赛程、积分榜和统计信息
+
+任务的完整赛程和全部类型、全部轮次的积分榜以紧凑形式（TaskDetailData）加载一次，
+按 (任务ID, 最后爬取时间, 任务更新时间) 放入任务详情缓存；切换轮次和积分榜类型时只在内存中过滤。
+赛程通过两次别名联接 Team 同时取得主队和客队名称，统计信息用一条带标量子查询的语句取得。
+Match/Standings 中的队伍编码为字符串，转换为整数后与 Team.team_code 比较，联接可按 (task_id, team_code) 查找索引。
+"""
+
+import sys
+from collections import Counter, defaultdict, namedtuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, cast, func, select
+from sqlalchemy.orm import aliased
+
+from models import Match, Standings, Task, Team
+from .task_detail_cache import task_detail_cache
+
+
+# 积分榜类型（界面显示名称 -> standings_category）
+STANDINGS_CATEGORIES = {
+    "总积分榜": "total",
+    "主场积分榜": "home",
+    "客场积分榜": "away"
+}
+
+# 缓存的赛程行
+CachedMatch = namedtuple('CachedMatch', [
+    'match_id', 'round_num', 'match_time', 'full_score',
+    'home_team_code', 'away_team_code', 'home_name', 'away_name'
+])
+
+# 缓存的积分榜行
+CachedStanding = namedtuple('CachedStanding', [
+    'team_code', 'team_name', 'games', 'wins', 'draws', 'losses',
+    'goals_for', 'goals_against', 'goal_diff', 'points'
+])
+
+
+class DetailLoadCancelled(Exception):
+    """加载已被更新的请求取代"""
+
+
+def query_task_summary(session, task_id: int) -> Optional[Dict]:
+    """
+    查询任务信息和统计（一条语句）
+
+    Returns:
+        dict: {'league', 'year', 'link', 'link_second', 'last_crawl_time', 'updated_at',
+               'team_count', 'match_count', 'finished_count', 'last_update'}，任务不存在时返回 None
+    """
+    def task_scalar(column, *conditions):
+        return select(column).where(*conditions).scalar_subquery()
+
+    row = session.execute(
+        select(
+            Task.league,
+            Task.year,
+            Task.link,
+            Task.link_second,
+            Task.last_crawl_time,
+            Task.updated_at,
+            task_scalar(func.count(Team.id), Team.task_id == task_id).label('team_count'),
+            task_scalar(func.count(Match.match_id), Match.task_id == task_id).label('match_count'),
+            task_scalar(func.count(Match.match_id), Match.task_id == task_id,
+                        Match.full_score.isnot(None)).label('finished_count'),
+            task_scalar(func.max(Match.updated_at), Match.task_id == task_id).label('last_update'),
+        ).where(Task.id == task_id)
+    ).first()
+
+    return dict(row._mapping) if row else None
+
+
+def query_matches(session, task_id: int) -> List[CachedMatch]:
+    """
+    查询任务的全部赛程（含主客队名称），按轮次、比赛时间排序
+
+    主队使用内联接（没有对应队伍的比赛不显示），客队使用外联接，名称缺失时显示队伍编码。
+    """
+    home_team = aliased(Team, name='home_team')
+    away_team = aliased(Team, name='away_team')
+
+    statement = select(
+        Match.match_id, Match.round_num, Match.match_time, Match.full_score,
+        Match.home_team_code, Match.away_team_code,
+        home_team.home_name_cn, away_team.home_name_cn
+    ).join(
+        home_team, and_(Match.task_id == home_team.task_id, home_team.team_code == cast(Match.home_team_code, Integer))
+    ).outerjoin(
+        away_team, and_(Match.task_id == away_team.task_id, away_team.team_code == cast(Match.away_team_code, Integer))
+    ).where(
+        Match.task_id == task_id
+    ).order_by(Match.round_num, Match.match_time)
+
+    return [CachedMatch(*row) for row in session.execute(statement)]
+
+
+def query_standings(session, task_id: int) -> Dict[str, Dict[int, List[CachedStanding]]]:
+    """
+    查询任务全部类型、全部轮次的积分榜
+
+    Returns:
+        dict: {积分榜类型: {轮次: [积分榜行（按积分、净胜球降序）]}}
+    """
+    statement = select(
+        Standings.standings_category, Standings.round_num,
+        Standings.team_code, Team.home_name_cn, Standings.games, Standings.wins, Standings.draws, Standings.losses,
+        Standings.goals_for, Standings.goals_against, Standings.goal_diff, Standings.points
+    ).join(
+        Team, (Standings.task_id == Team.task_id) & (Team.team_code == cast(Standings.team_code, Integer))
+    ).where(
+        Standings.task_id == task_id
+    ).order_by(Standings.points.desc(), Standings.goal_diff.desc())
+
+    standings = defaultdict(lambda: defaultdict(list))
+    for row in session.execute(statement):
+        standings[row[0]][row[1]].append(CachedStanding(*row[2:]))
+    return {category: dict(rounds) for category, rounds in standings.items()}
+
+
+def calculate_round_dates(matches: List[CachedMatch]) -> Dict[int, str]:
+    """
+    计算每个轮次的“大致日期”（出现次数最多的日期）
+
+    Returns:
+        dict: {轮次号: 大致日期}
+    """
+    date_counts = defaultdict(Counter)
+    for match in matches:
+        if not match.round_num or not isinstance(match.match_time, str):
+            continue
+        # 从 "08-07 22:00" 提取 "08-07"
+        parts = match.match_time.split()
+        if parts:
+            date_counts[match.round_num][parts[0]] += 1
+
+    return {
+        round_num: max(counts.items(), key=lambda item: item[1])[0]
+        for round_num, counts in date_counts.items()
+    }
+
+
+def split_score(full_score: Optional[str]) -> Tuple[str, str]:
+    """将比分 "5-2" 拆分为主分和客分"""
+    if not full_score:
+        return "", ""
+    if '-' in full_score:
+        home_score, away_score = full_score.split('-', 1)
+        return home_score.strip(), away_score.strip()
+    return full_score, full_score
+
+
+def format_match_time(match_time) -> str:
+    """比赛时间只显示月日时分：从 "2023-08-25 23:59" 提取 "08-25 23:59" """
+    if not match_time:
+        return '待定'
+    if isinstance(match_time, str) and len(match_time) >= 16:
+        return match_time[5:]
+    return str(match_time)
+
+
+def format_win_pct(wins: int, games: int) -> str:
+    """胜率百分比（与 Standings.win_pct 一致）"""
+    if games == 0:
+        return "0.0%"
+    return f"{(wins / games * 100):.1f}%"
+
+
+def _estimate_size(value) -> int:
+    """估算嵌套容器及其元素的内存占用（字节）"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_size(key) + _estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(item) for item in value)
+    return size
+
+
+class TaskDetailData:
+    """
+    任务的完整赛程和积分榜（紧凑形式），提供按轮次和积分榜类型过滤后的 Treeview 行
+
+    Args:
+        league: 联赛名称
+        year: 赛季年份
+        matches: 全部赛程行
+        standings: {积分榜类型: {轮次: [积分榜行]}}
+    """
+
+    __slots__ = ('league', 'year', 'matches', 'standings', 'rounds', 'round_dates', 'size')
+
+    def __init__(self, league: Optional[str], year, matches: List[CachedMatch],
+                 standings: Dict[str, Dict[int, List[CachedStanding]]]):
+        self.league = league or ""
+        self.year = str(year) if year else ""
+        self.matches = matches
+        self.standings = standings
+        self.rounds = sorted({match.round_num for match in matches if match.round_num})
+        self.round_dates = calculate_round_dates(matches)
+        self.size = _estimate_size(matches) + _estimate_size(standings)
+
+    def match_values(self, round_num: Optional[int] = None) -> List[tuple]:
+        """赛程表 values（round_num 为 None 时为全部轮次）"""
+        values = []
+        for match in self.matches:
+            if round_num and match.round_num != round_num:
+                continue
+            home_score, away_score = split_score(match.full_score)
+            values.append((
+                str(match.match_id),
+                self.league,
+                self.year,
+                str(match.round_num),
+                self.round_dates.get(match.round_num, ""),
+                format_match_time(match.match_time),
+                match.home_name or f"队伍{match.home_team_code}",
+                home_score,
+                away_score,
+                match.away_name or f"队伍{match.away_team_code}",
+                "已结束" if match.full_score else "未开始"
+            ))
+        return values
+
+    def standings_values(self, standings_category: str, round_num: Optional[int] = None) -> List[tuple]:
+        """积分榜 values（round_num 为 None 时取该类型的最新轮次，排名按积分、净胜球排序后的位置）"""
+        rounds = self.standings.get(standings_category, {})
+        if not round_num:
+            round_num = max(rounds) if rounds else None
+
+        return [
+            (
+                self.league,
+                self.year,
+                rank,
+                standing.team_name or f"队伍{standing.team_code}",
+                standing.games,
+                standing.wins,
+                standing.draws,
+                standing.losses,
+                standing.goals_for,
+                standing.goals_against,
+                standing.goal_diff,
+                standing.points,
+                format_win_pct(standing.wins, standing.games)
+            )
+            for rank, standing in enumerate(rounds.get(round_num, []), 1)
+        ]
+
+
+def load_task_detail(session, task_id: int,
+                     is_cancelled: Optional[Callable[[], bool]] = None) -> Tuple[Optional[Dict], Optional[TaskDetailData]]:
+    """
+    加载任务统计信息和详情数据（在后台线程中调用）
+
+    详情数据优先从任务详情缓存读取，未命中时查询全部赛程和积分榜并放入缓存。
+    查询前记录缓存版本号，查询期间任务被爬取或修改（缓存被移除）时结果不放入缓存。
+
+    Args:
+        session: 数据库会话
+        task_id: 任务ID
+        is_cancelled: 每步查询前检查，返回 True 时抛出 DetailLoadCancelled
+
+    Returns:
+        tuple: (query_task_summary 的结果, TaskDetailData)，任务不存在时均为 None
+    """
+    def check_cancelled():
+        if is_cancelled and is_cancelled():
+            raise DetailLoadCancelled()
+
+    check_cancelled()
+    version = task_detail_cache.version(task_id)
+    summary = query_task_summary(session, task_id)
+    if summary is None:
+        return None, None
+
+    # 重新爬取或修改任务（编辑、批量导入）都会改变缓存键
+    cache_key = (task_id, summary['last_crawl_time'], summary['updated_at'])
+    detail = task_detail_cache.get(cache_key)
+    if detail is None:
+        check_cancelled()
+        matches = query_matches(session, task_id)
+        check_cancelled()
+        standings = query_standings(session, task_id)
+        detail = TaskDetailData(summary['league'], summary['year'], matches, standings)
+        task_detail_cache.put(cache_key, detail, version)
+
+    return summary, detail
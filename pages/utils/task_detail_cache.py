@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+任务详情缓存 - 按 (任务ID, 最后爬取时间, 任务更新时间) 缓存任务的完整赛程和积分榜，按内存预算做 LRU 淘汰
+
+数据管理页面切换轮次和积分榜类型时直接在缓存的数据中过滤，不再查询数据库；
+任务重新爬取或被修改后缓存键变化，旧的缓存项不会再被命中；爬取、编辑、删除和批量导入任务时也会主动移除。
+每个任务有一个版本号，移除时递增；加载前记录版本号，放入时版本号已变化（加载期间数据被修改）则丢弃。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+from loguru import logger
+
+
+# 缓存占用的内存预算（字节，按缓存项估算的大小累计）
+TASK_DETAIL_CACHE_BUDGET = 64 * 1024 * 1024
+
+# 缓存键：(任务ID, 最后爬取时间, 任务更新时间)
+TaskDetailKey = Tuple[int, Hashable, Hashable]
+
+# 任务缓存版本号：(全部清空的次数, 该任务被移除的次数)
+TaskDetailVersion = Tuple[int, int]
+
+
+class TaskDetailCache:
+    """
+    任务详情 LRU 缓存（线程安全，进程内共享）
+
+    缓存值需提供 size 属性（估算的内存占用字节数）。
+
+    Args:
+        budget: 内存预算（字节），超出时淘汰最久未使用的项（至少保留最新放入的一项）
+    """
+
+    def __init__(self, budget: int = TASK_DETAIL_CACHE_BUDGET):
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[TaskDetailKey, object]" = OrderedDict()
+        self._size = 0
+        self._generation = 0
+        self._versions: Dict[int, int] = {}
+
+    @property
+    def size(self) -> int:
+        """当前缓存项估算的内存占用（字节）"""
+        return self._size
+
+    def version(self, task_id: int) -> TaskDetailVersion:
+        """任务当前的缓存版本号（在查询数据库之前获取，放入缓存时传给 put）"""
+        with self._lock:
+            return self._generation, self._versions.get(task_id, 0)
+
+    def get(self, key: TaskDetailKey):
+        """读取缓存项，未命中时返回 None"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: TaskDetailKey, data, version: Optional[TaskDetailVersion] = None):
+        """
+        放入缓存项，同一任务旧版本的缓存项会被替换
+
+        Args:
+            key: 缓存键
+            data: 缓存值
+            version: 加载前获取的版本号，与当前版本号不同时（加载期间任务被移除）丢弃该项
+        """
+        with self._lock:
+            if version is not None and version != (self._generation, self._versions.get(key[0], 0)):
+                logger.debug(f"任务 {key[0]} 的详情在加载期间已失效，不放入缓存")
+                return
+            self._remove_where(lambda cached_key: cached_key[0] == key[0])
+            self._entries[key] = data
+            self._size += data.size
+
+            while self._size > self.budget and len(self._entries) > 1:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                logger.debug(f"任务详情缓存超出预算，淘汰任务 {evicted_key[0]}")
+
+    def invalidate(self, task_ids: Optional[Iterable[int]] = None):
+        """
+        移除任务的缓存项（任务被爬取、修改或删除后调用）
+
+        Args:
+            task_ids: 任务ID，None 表示清空全部缓存
+        """
+        with self._lock:
+            if task_ids is None:
+                self._entries.clear()
+                self._size = 0
+                self._generation += 1
+                return
+            task_ids = set(task_ids)
+            for task_id in task_ids:
+                self._versions[task_id] = self._versions.get(task_id, 0) + 1
+            self._remove_where(lambda cached_key: cached_key[0] in task_ids)
+
+    def _remove_where(self, predicate):
+        """移除满足条件的缓存项（调用方持有锁）"""
+        for cached_key in [cached_key for cached_key in self._entries if predicate(cached_key)]:
+            self._size -= self._entries.pop(cached_key).size
+
+
+# 全局任务详情缓存
+task_detail_cache = TaskDetailCache()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+任务批量导入工具 - 按 (league, year, group) 集合化地新增/更新任务
+"""
+
+from typing import Dict, List, Tuple
+
+import pandas as pd
+from sqlalchemy import bindparam, func, insert, tuple_, update
+from sqlalchemy.orm import Session
+
+from models import JsDataRaw, Standings, StandingsExport, Task, Team
+
+
+# 导入涉及的任务字段（同时也是判断"重要更新"的核心字段）
+TASK_FIELDS = ['level', 'event', 'country', 'league', 'type', 'year', 'group', 'link', 'link_second']
+
+# 分组为空时使用的默认分组
+DEFAULT_GROUP = '默认组'
+
+# 每条 IN 查询的参数数量上限（SQLite 默认最多 999 个绑定参数）
+IN_CHUNK_SIZE = 300
+
+
+def _chunks(items: list, size: int = IN_CHUNK_SIZE):
+    """按固定大小切分列表"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _optional_text(column: pd.Series) -> pd.Series:
+    """可选文本列：空值和空字符串统一为 None"""
+    text = column.astype(object).where(column.notna(), None)
+    text = text.map(lambda value: None if value is None else str(value))
+    return text.where(text != '', None)
+
+
+def normalize_import_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[dict]]:
+    """
+    将导入数据转换为写入数据库的字段值（向量化处理）
+
+    Args:
+        df: 已标准化列名并通过验证的导入数据
+
+    Returns:
+        tuple: (规范化后的数据（含 row 行号列）, 无法转换的行的错误详情)
+    """
+    normalized = pd.DataFrame(index=df.index)
+    normalized['row'] = df.index + 1
+
+    level = pd.to_numeric(df['level'], errors='coerce')
+    for field in ('event', 'country', 'league', 'type', 'year'):
+        normalized[field] = df[field].astype(str)
+
+    # 处理 group 字段默认值
+    if 'group' in df.columns:
+        group = df['group'].astype(object)
+        group_empty = group.isna() | group.astype(str).str.strip().eq('')
+        normalized['group'] = group.astype(str).where(~group_empty, DEFAULT_GROUP)
+    else:
+        normalized['group'] = DEFAULT_GROUP
+
+    # 处理 link 字段
+    for field in ('link', 'link_second'):
+        normalized[field] = _optional_text(df[field]) if field in df.columns else None
+
+    error_mask = level.isna()
+    error_details = [
+        {
+            'row': row['row'],
+            'league': row['league'],
+            'year': row['year'],
+            'group': row['group'],
+            'error': f"level无法转换为数字: {df.at[index, 'level']}"
+        }
+        for index, row in normalized[error_mask].iterrows()
+    ]
+
+    normalized = normalized[~error_mask].copy()
+    normalized['level'] = level[~error_mask].astype('int64')
+    return normalized, error_details
+
+
+def load_existing_tasks(session: Session, keys: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], dict]:
+    """
+    按 (league, year, group) 批量加载已有任务
+
+    Returns:
+        dict: {(league, year, group): {'id': ..., 字段: 值}}
+    """
+    columns = [Task.id] + [getattr(Task, field) for field in TASK_FIELDS]
+    existing = {}
+    for key_chunk in _chunks(sorted(set(keys))):
+        rows = (
+            session.query(*columns)
+            .filter(tuple_(Task.league, Task.year, Task.group).in_(key_chunk))
+            .all()
+        )
+        for row in rows:
+            existing[(row.league, row.year, row.group)] = dict(row._mapping)
+    return existing
+
+
+def clear_related_data(session: Session, task_ids: List[int]):
+    """清空指定任务的关联数据（队伍、原始JS数据、积分榜及其导出快照），导出快照需重新生成"""
+    for id_chunk in _chunks(sorted(set(task_ids))):
+        for model in (Team, JsDataRaw, Standings, StandingsExport):
+            session.query(model).filter(model.task_id.in_(id_chunk)).delete(synchronize_session=False)
+        session.query(Task).filter(Task.id.in_(id_chunk)).update(
+            {Task.standings_export_built_at: None}, synchronize_session=False
+        )
+
+
+def import_tasks(session: Session, df: pd.DataFrame) -> Dict[str, list]:
+    """
+    集合化导入任务：一次加载文件涉及的所有已有任务，在内存中分类后批量写入
+
+    - 新增：库中和文件前面的行都没有该 (league, year, group)
+    - 重要更新：核心字段有变化，清空关联数据并更新任务
+    - 一般更新：核心字段没有变化，无需写入
+    文件内的重复组合按行顺序依次处理，最终以最后一行为准。
+
+    Args:
+        session: SQLAlchemy 会话（由调用方提交）
+        df: 已标准化列名并通过验证的导入数据
+
+    Returns:
+        dict: {'insert_details', 'major_update_details', 'minor_update_details', 'error_details'}
+    """
+    normalized, error_details = normalize_import_frame(df)
+
+    records = normalized.to_dict('records')
+    keys = [(record['league'], record['year'], record['group']) for record in records]
+    existing = load_existing_tasks(session, keys)
+
+    insert_details, major_update_details, minor_update_details = [], [], []
+    pending_inserts = {}    # key -> 待新增任务的字段值
+    pending_updates = {}    # 任务ID -> 更新后的字段值
+    current_values = {key: task for key, task in existing.items()}
+
+    for key, record in zip(keys, records):
+        values = {field: record[field] for field in TASK_FIELDS}
+        detail = {'row': record['row'], 'league': record['league'], 'year': record['year'], 'group': record['group']}
+
+        if key not in current_values:
+            pending_inserts[key] = values
+            current_values[key] = values
+            insert_details.append(detail)
+            continue
+
+        current = current_values[key]
+        changes = [
+            f"{field}: '{current[field]}' -> '{values[field]}'"
+            for field in TASK_FIELDS
+            if current[field] != values[field]
+        ]
+        if not changes:
+            minor_update_details.append(detail)
+            continue
+
+        if key in pending_inserts:
+            # 文件内重复：更新尚未写入的新增任务
+            pending_inserts[key] = values
+            current_values[key] = values
+        else:
+            task_id = existing[key]['id']
+            pending_updates[task_id] = values
+            current_values[key] = dict(values, id=task_id)
+        major_update_details.append(dict(detail, changes=changes))
+
+    if pending_updates:
+        # 重要更新：先清空关联数据，再批量更新任务字段
+        clear_related_data(session, list(pending_updates))
+        statement = (
+            update(Task.__table__)
+            .where(Task.__table__.c.id == bindparam('task_id'))
+            .values(
+                **{field: bindparam(f'new_{field}') for field in TASK_FIELDS},
+                updated_at=func.current_timestamp()
+            )
+        )
+        session.execute(statement, [
+            dict({f'new_{field}': values[field] for field in TASK_FIELDS}, task_id=task_id)
+            for task_id, values in pending_updates.items()
+        ])
+
+    if pending_inserts:
+        session.execute(insert(Task), list(pending_inserts.values()))
+
+    return {
+        'insert_details': insert_details,
+        'major_update_details': major_update_details,
+        'minor_update_details': minor_update_details,
+        'error_details': error_details,
+    }
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+任务年份滚动工具 - 基于现有任务批量生成目标年份的任务
+"""
+
+import re
+from typing import Dict
+
+import pandas as pd
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from models import Task
+
+
+# 复制到新任务的字段
+ROLLOVER_FIELDS = ['level', 'event', 'country', 'league', 'type', 'year', 'group', 'link', 'link_second']
+
+# year 字段：单年格式 "2023"、跨年格式 "2022-2023"
+YEAR_SINGLE_PATTERN = re.compile(r'\d{4}')
+YEAR_RANGE_PATTERN = re.compile(r'\d{4}-\d{4}')
+
+# 链接中的年份路径段：单年格式 /2023/、跨年格式 /2022-2023/
+URL_SINGLE_PATTERN = re.compile(r'/\d{4}/')
+URL_RANGE_PATTERN = re.compile(r'/\d{4}-\d{4}/')
+
+
+def transform_years(years: pd.Series, target_year: int) -> pd.Series:
+    """
+    转换 year 字段：空值和单年格式替换为目标年份，跨年格式替换为 "目标年份-下一年"，其他格式保持不变
+    """
+    text = years.fillna('').astype(str).str.strip()
+    result = text.mask(text.eq('') | text.str.fullmatch(YEAR_SINGLE_PATTERN), str(target_year))
+    return result.mask(text.str.fullmatch(YEAR_RANGE_PATTERN), f"{target_year}-{target_year + 1}")
+
+
+def transform_urls(urls: pd.Series, target_year: int) -> pd.Series:
+    """
+    转换链接中的年份：包含单年路径段时只替换单年，否则替换跨年路径段；空链接保持原值
+    """
+    urls = urls.astype(object)
+    present = urls.notna() & urls.astype(str).str.strip().ne('')
+    stripped = urls.where(present).str.strip()
+
+    has_single = stripped.str.contains(URL_SINGLE_PATTERN, na=False)
+    single = stripped.str.replace(URL_SINGLE_PATTERN, f'/{target_year}/', regex=True)
+    ranged = stripped.str.replace(URL_RANGE_PATTERN, f'/{target_year}-{target_year + 1}/', regex=True)
+
+    result = single.where(has_single, ranged).where(present, urls)
+    return result.where(result.notna(), None)
+
+
+def plan_year_rollover(session: Session, target_year: int) -> Dict:
+    """
+    计算年份滚动需要新增的任务（只读，不写入数据库）
+
+    已存在相同 (league, year, group) 的任务跳过；多个任务转换后组合相同时只保留 ID 最小的一条。
+
+    Returns:
+        dict: {'total': 现有任务数, 'new_tasks': 待新增任务字段列表, 'skip_count': 跳过数量}
+    """
+    columns = [getattr(Task, field) for field in ROLLOVER_FIELDS]
+    rows = session.execute(select(*columns).order_by(Task.id)).all()
+    if not rows:
+        return {'total': 0, 'new_tasks': [], 'skip_count': 0}
+
+    tasks = pd.DataFrame(rows, columns=ROLLOVER_FIELDS)
+    existing_keys = pd.MultiIndex.from_frame(tasks[['league', 'year', 'group']])
+
+    generated = tasks.copy()
+    generated['year'] = transform_years(tasks['year'], target_year)
+    for field in ('link', 'link_second'):
+        generated[field] = transform_urls(tasks[field], target_year)
+
+    generated_keys = pd.MultiIndex.from_frame(generated[['league', 'year', 'group']])
+    keep = ~generated_keys.isin(existing_keys) & ~generated_keys.duplicated(keep='first')
+    new_tasks = generated[keep]
+
+    return {
+        'total': len(tasks),
+        'new_tasks': new_tasks.astype(object).where(new_tasks.notna(), None).to_dict('records'),
+        'skip_count': len(tasks) - len(new_tasks),
+    }
+
+
+def rollover_tasks(session: Session, target_year: int, dry_run: bool = False) -> Dict:
+    """
+    为目标年份批量生成任务：一次读取现有任务，在内存中转换后用一条 executemany 写入
+
+    Args:
+        session: SQLAlchemy 会话（由调用方提交）
+        target_year: 目标年份
+        dry_run: 只统计数量，不写入数据库
+
+    Returns:
+        dict: {'total': 现有任务数, 'insert_count': 新增数量, 'skip_count': 已存在跳过数量}
+    """
+    plan = plan_year_rollover(session, target_year)
+    if plan['new_tasks'] and not dry_run:
+        session.execute(insert(Task), plan['new_tasks'])
+
+    return {'total': plan['total'], 'insert_count': len(plan['new_tasks']), 'skip_count': plan['skip_count']}
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+任务搜索索引 - 一次加载所有任务的可搜索文本，按输入内容在内存中过滤
+
+索引按任务列表的显示顺序 (created_at desc, id desc) 保存任务ID和预先转为小写的搜索文本，
+输入内容在上一次输入的基础上追加时，只在上一次的结果中继续过滤。
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from models import Task
+
+
+# 各字段文本之间的分隔符，避免搜索内容跨字段匹配
+FIELD_SEPARATOR = '\x1f'
+
+
+class TaskSearchIndex:
+    """
+    任务搜索索引
+
+    Args:
+        search_columns: 参与搜索的 Task 列
+    """
+
+    def __init__(self, search_columns: List):
+        self.search_columns = list(search_columns)
+        self.task_ids: List[int] = []
+        self.texts: List[str] = []
+        self.is_built = False
+
+        # 上一次搜索的内容和结果位置，用于增量过滤
+        self._last_query: Optional[str] = None
+        self._last_positions: List[int] = []
+
+    def build(self, session):
+        """从数据库加载所有任务的搜索文本"""
+        rows = session.execute(
+            select(Task.id, *self.search_columns).order_by(Task.created_at.desc(), Task.id.desc())
+        ).all()
+
+        self.task_ids = [row[0] for row in rows]
+        self.texts = [
+            FIELD_SEPARATOR.join('' if value is None else str(value) for value in row[1:]).lower()
+            for row in rows
+        ]
+        self.is_built = True
+        self._last_query = None
+        self._last_positions = []
+
+    def invalidate(self):
+        """任务数据变化后使索引失效，下次搜索时重新加载"""
+        self.task_ids = []
+        self.texts = []
+        self.is_built = False
+        self._last_query = None
+        self._last_positions = []
+
+    def search(self, text: str) -> List[int]:
+        """
+        搜索任务（不区分大小写的包含匹配）
+
+        Returns:
+            list: 匹配的任务ID，按列表显示顺序排列；搜索内容为空时返回全部任务
+        """
+        query = text.strip().lower()
+        if not query:
+            return list(self.task_ids)
+
+        if self._last_query and self._last_query in query:
+            # 新的搜索内容包含上一次的内容，结果必然是上一次结果的子集
+            candidates = self._last_positions
+        else:
+            candidates = range(len(self.texts))
+
+        texts = self.texts
+        positions = [position for position in candidates if query in texts[position]]
+
+        self._last_query = query
+        self._last_positions = positions
+        return [self.task_ids[position] for position in positions]
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+任务统计缓存 - 缓存任务总数及按年份/类型/国家的数量，任务数据写入后失效
+
+各页面的统计信息栏在选择变化时只读取缓存，不再每次查询数据库；
+导入、删除、生成、编辑任务及爬取完成后调用 invalidate，下次读取时重新统计。
+"""
+
+import threading
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import func, select
+
+from models import Task
+
+
+class TaskStatsCache:
+    """任务统计缓存（线程安全，进程内共享）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Optional[Dict] = None
+        self._generation = 0
+
+    def invalidate(self):
+        """任务数据已变化，丢弃缓存的统计"""
+        with self._lock:
+            self._stats = None
+            self._generation += 1
+
+    def peek(self) -> Optional[Dict]:
+        """读取缓存的统计，缓存失效时返回 None（不访问数据库）"""
+        with self._lock:
+            return self._stats
+
+    def get(self, session_factory: Callable) -> Dict:
+        """
+        读取统计，缓存失效时重新统计
+
+        Args:
+            session_factory: 返回数据库会话上下文管理器的函数，如 page.get_db_session
+
+        Returns:
+            dict: {'total': 任务总数, 'by_year': {年份: 数量}, 'by_type': {类型: 数量}, 'by_country': {国家: 数量}}
+        """
+        with self._lock:
+            if self._stats is not None:
+                return self._stats
+            generation = self._generation
+
+        with session_factory() as session:
+            stats = {
+                field: dict(session.execute(
+                    select(getattr(Task, column), func.count()).group_by(getattr(Task, column))
+                ).all())
+                for field, column in (('by_year', 'year'), ('by_type', 'type'), ('by_country', 'country'))
+            }
+        stats['total'] = sum(stats['by_year'].values())
+
+        with self._lock:
+            # 统计期间数据又发生变化时不缓存，避免保存过期结果
+            if self._generation == generation:
+                self._stats = stats
+        return stats
+
+
+# 全局统计缓存
+task_stats_cache = TaskStatsCache()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+界面事件总线 - 后台线程投递界面更新事件，Tk 主循环按固定帧率批量处理
+
+Tkinter 不是线程安全的，爬取等后台线程不能直接修改控件。
+后台线程只调用 post 把事件放入队列，主线程的 after 定时器每帧取出全部事件：
+- 合并类事件（进度、状态文本）同一帧内只处理最后一个值
+- 其他事件（如日志）按投递顺序整批交给处理函数，一帧只渲染一次
+- call 投递的函数在主线程按顺序执行，用于按钮状态恢复、弹出提示框等一次性操作
+"""
+
+import queue
+from typing import Callable, Dict, Tuple
+
+from loguru import logger
+
+
+# 渲染间隔（毫秒），约 20 帧/秒
+FRAME_INTERVAL_MS = 50
+
+# 每帧最多处理的事件数，超出部分留到下一帧，避免单帧阻塞主循环
+MAX_EVENTS_PER_FRAME = 5000
+
+
+class UIEventBus:
+    """
+    线程安全的界面事件队列
+
+    Args:
+        widget: 用于注册 after 定时器的 Tk 控件
+        interval_ms: 渲染间隔（毫秒）
+    """
+
+    def __init__(self, widget, interval_ms: int = FRAME_INTERVAL_MS):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self._queue: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+        # 事件类型 -> (处理函数, 是否合并)
+        self._handlers: Dict[str, Tuple[Callable, bool]] = {}
+        self._after_id = None
+
+    def register(self, kind: str, handler: Callable, coalesce: bool = False):
+        """
+        注册事件处理函数
+
+        Args:
+            kind: 事件类型
+            handler: 合并事件调用 handler(最后一个数据)，其他事件调用 handler(本帧数据列表)
+            coalesce: 同一帧内是否只保留最后一个事件
+        """
+        self._handlers[kind] = (handler, coalesce)
+
+    def post(self, kind: str, data=None):
+        """投递事件（可在任意线程调用）"""
+        self._queue.put((kind, data))
+
+    def call(self, func: Callable, *args, **kwargs):
+        """在主线程中调用函数（可在任意线程调用，按投递顺序执行）"""
+        self._queue.put((None, (func, args, kwargs)))
+
+    def start(self):
+        """启动渲染定时器"""
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.interval_ms, self._on_frame)
+
+    def stop(self):
+        """停止渲染定时器（队列中剩余的事件保留）"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _on_frame(self):
+        """定时器回调：处理本帧事件后预约下一帧"""
+        self._after_id = None
+        try:
+            self.drain()
+        finally:
+            try:
+                self._after_id = self.widget.after(self.interval_ms, self._on_frame)
+            except Exception:
+                # 控件已销毁，停止渲染
+                self._after_id = None
+
+    def drain(self) -> int:
+        """
+        取出队列中的事件并分派（必须在主线程调用）
+
+        主线程调用（call）把事件分隔为若干段，段与段之间按投递顺序处理；
+        同一段内每类事件只分派一次：合并事件取最后一个值，其他事件整批交给处理函数。
+
+        Returns:
+            int: 本次处理的事件数
+        """
+        count = 0
+        # 当前段：事件类型 -> 数据列表（字典保持首次出现的顺序）
+        segment: Dict[str, list] = {}
+        while count < MAX_EVENTS_PER_FRAME:
+            try:
+                kind, data = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            count += 1
+            if kind is None:
+                self._dispatch(segment)
+                segment = {}
+                self._invoke(*data)
+            else:
+                segment.setdefault(kind, []).append(data)
+
+        self._dispatch(segment)
+        return count
+
+    def _dispatch(self, segment: Dict[str, list]):
+        """分派一段事件"""
+        for kind, items in segment.items():
+            handler = self._handlers.get(kind)
+            if handler is None:
+                logger.warning(f"未注册的界面事件: {kind}")
+                continue
+            handler_func, coalesce = handler
+            try:
+                handler_func(items[-1] if coalesce else items)
+            except Exception as e:
+                logger.error(f"处理界面事件失败 ({kind}): {e}")
+
+    @staticmethod
+    def _invoke(func: Callable, args: tuple, kwargs: dict):
+        """执行主线程调用"""
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"主线程调用失败 ({getattr(func, '__name__', func)}): {e}")
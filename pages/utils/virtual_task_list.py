@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+虚拟化任务列表 - 按 (created_at, id) 键集分页加载任务，滚动到底部时再加载下一页
+
+列表刷新只查询第一页和任务总数，刷新耗时与数据库中的任务数量无关；
+全选、全量爬取等需要全部任务的操作可调用 load_all 一次性加载剩余任务。
+搜索使用内存中的搜索索引（首次搜索时加载），输入防抖后只把结果的差异应用到 Treeview。
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import String, and_, func, or_, select, tuple_, type_coerce
+
+from models import Task
+from .task_search import TaskSearchIndex
+
+
+# 每页加载的任务数
+PAGE_SIZE = 200
+
+# 滚动条下沿超过该比例时加载下一页
+LOAD_MORE_THRESHOLD = 0.9
+
+# 搜索输入防抖时间（毫秒）
+SEARCH_DEBOUNCE_MS = 250
+
+# 按ID批量查询任务时每条 IN 语句的参数数量
+FETCH_CHUNK_SIZE = 500
+
+# 分页游标使用数据库中的原始 created_at 值：SQLite 以文本保存时间，
+# 转换为 datetime 后再作为参数传回会带上微秒，与原值比较的结果不一致
+CURSOR_CREATED_AT = type_coerce(Task.created_at, String)
+
+
+class VirtualTaskList:
+    """
+    Treeview 任务列表的分页加载器
+
+    两种加载方式：
+    - 未搜索且搜索索引尚未加载时，按 (created_at, id) 键集分页查询
+    - 搜索索引加载后，按索引给出的任务ID列表分页，按ID查询尚未缓存的任务
+
+    Args:
+        tree: 显示任务的 ttk.Treeview
+        scrollbar: 纵向滚动条（由本类接管 yscrollcommand）
+        session_factory: 返回数据库会话上下文管理器的函数，如 page.get_db_session
+        columns: 需要查询的 Task 列（id 和 created_at 会自动补充）
+        format_row: 将查询结果行转换为 Treeview values 的函数
+        search_columns: 参与搜索的 Task 列（不区分大小写的包含匹配）
+        page_size: 每页加载的任务数
+    """
+
+    def __init__(self, tree, scrollbar, session_factory: Callable, columns: List, format_row: Callable,
+                 search_columns: Optional[List] = None, page_size: int = PAGE_SIZE):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.session_factory = session_factory
+        self.format_row = format_row
+        self.page_size = page_size
+        self.search_index = TaskSearchIndex(search_columns or [])
+
+        column_keys = {column.key for column in columns}
+        self.columns = list(columns) + [column for column in (Task.id, Task.created_at) if column.key not in column_keys]
+        self.columns.append(CURSOR_CREATED_AT.label('cursor_created_at'))
+
+        # 行缓存：任务ID -> 查询结果行（刷新前保留，搜索切换时复用）
+        self.row_cache: Dict[int, object] = {}
+        # 已显示的项目：Treeview 项目ID -> 查询结果行，任务ID -> Treeview 项目ID
+        self.rows: Dict[str, object] = {}
+        self.task_items: Dict[int, str] = {}
+
+        self.search_text = ''
+        self.matched_count = 0
+        self.has_more = False
+        self._cursor = None
+        self._load_scheduled = False
+
+        # 搜索结果（任务ID列表），None 表示使用键集分页
+        self._match_ids: Optional[List[int]] = None
+        self._match_offset = 0
+        self._search_after_id = None
+
+        self.tree.configure(yscrollcommand=self._on_yscroll)
+
+    @property
+    def loaded_count(self) -> int:
+        """已加载到列表中的任务数"""
+        return len(self.rows)
+
+    def refresh(self, search_text: Optional[str] = None) -> int:
+        """
+        重新加载列表（只加载第一页），任务数据变化后调用
+
+        Args:
+            search_text: 新的搜索内容，None 表示沿用当前搜索
+
+        Returns:
+            int: 匹配的任务总数
+        """
+        if search_text is not None:
+            self.search_text = search_text
+        self._cancel_pending_search()
+
+        self.tree.delete(*self.tree.get_children())
+        self.rows.clear()
+        self.task_items.clear()
+        self.row_cache.clear()
+        self.search_index.invalidate()
+        self._match_ids = None
+        self._cursor = None
+        self.has_more = True
+
+        if self.search_text.strip():
+            self._apply_search()
+            return self.matched_count
+
+        with self.session_factory() as session:
+            self.matched_count = session.execute(select(func.count()).select_from(Task)).scalar()
+
+        self.load_next_page()
+        return self.matched_count
+
+    def search(self, search_text: str, on_applied: Optional[Callable] = None):
+        """
+        搜索任务（防抖：停止输入 SEARCH_DEBOUNCE_MS 毫秒后才执行）
+
+        Args:
+            search_text: 搜索内容
+            on_applied: 搜索结果应用到列表后的回调
+        """
+        self.search_text = search_text
+        self._cancel_pending_search()
+
+        def apply():
+            self._search_after_id = None
+            try:
+                self._apply_search()
+            except Exception as e:
+                logger.error(f"搜索任务失败: {e}")
+                return
+            if on_applied:
+                on_applied()
+
+        self._search_after_id = self.tree.after(SEARCH_DEBOUNCE_MS, apply)
+
+    def _cancel_pending_search(self):
+        """取消尚未执行的搜索"""
+        if self._search_after_id is not None:
+            self.tree.after_cancel(self._search_after_id)
+            self._search_after_id = None
+
+    def _apply_search(self):
+        """在搜索索引中过滤，并把结果第一页与当前列表的差异应用到 Treeview"""
+        if not self.search_index.is_built:
+            with self.session_factory() as session:
+                self.search_index.build(session)
+
+        self._match_ids = self.search_index.search(self.search_text)
+        self.matched_count = len(self._match_ids)
+
+        target_ids = self._match_ids[:self.page_size]
+        target_set = set(target_ids)
+
+        # 删除不在结果中的项目（一次调用），保留的项目在 Treeview 中的相对顺序不变
+        removed_items = [item for task_id, item in self.task_items.items() if task_id not in target_set]
+        if removed_items:
+            self.tree.delete(*removed_items)
+            for item in removed_items:
+                row = self.rows.pop(item)
+                del self.task_items[row.id]
+
+        # 按结果顺序插入缺少的项目：新旧列表都是同一全局顺序的子序列，插入位置即结果中的位置
+        self._fetch_rows(target_ids)
+        for index, task_id in enumerate(target_ids):
+            if task_id not in self.task_items:
+                self._insert_row(self.row_cache[task_id], index)
+
+        self._match_offset = len(target_ids)
+        self.has_more = self._match_offset < len(self._match_ids)
+
+    def _fetch_rows(self, task_ids: List[int]):
+        """按ID查询尚未缓存的任务"""
+        missing_ids = [task_id for task_id in task_ids if task_id not in self.row_cache]
+        if not missing_ids:
+            return
+
+        with self.session_factory() as session:
+            for start in range(0, len(missing_ids), FETCH_CHUNK_SIZE):
+                id_chunk = missing_ids[start:start + FETCH_CHUNK_SIZE]
+                for row in session.execute(select(*self.columns).where(Task.id.in_(id_chunk))):
+                    self.row_cache[row.id] = row
+
+    def _insert_row(self, row, index='end'):
+        """在 Treeview 中插入一行"""
+        item_id = self.tree.insert('', index, values=self.format_row(row))
+        self.rows[item_id] = row
+        self.task_items[row.id] = item_id
+
+    def _after_cursor(self):
+        """键集分页条件：排在上一页最后一行之后（created_at 为空的行排在最后）"""
+        created_at, task_id = self._cursor
+        if created_at is None:
+            return and_(Task.created_at.is_(None), Task.id < task_id)
+        return or_(
+            tuple_(CURSOR_CREATED_AT, Task.id) < tuple_(type_coerce(created_at, String), task_id),
+            Task.created_at.is_(None)
+        )
+
+    def load_next_page(self) -> int:
+        """加载下一页，返回本次加载的任务数"""
+        self._load_scheduled = False
+        return self._load(self.page_size)
+
+    def load_all(self) -> int:
+        """一次性加载剩余的全部匹配任务，返回本次加载的任务数"""
+        return self._load(None)
+
+    def _load(self, limit: Optional[int]) -> int:
+        """从当前位置继续加载任务（limit 为 None 时加载全部剩余任务）"""
+        if not self.has_more:
+            return 0
+
+        if self._match_ids is not None:
+            end = len(self._match_ids) if limit is None else self._match_offset + limit
+            page_ids = self._match_ids[self._match_offset:end]
+            self._fetch_rows(page_ids)
+            for task_id in page_ids:
+                self._insert_row(self.row_cache[task_id])
+            self._match_offset += len(page_ids)
+            self.has_more = self._match_offset < len(self._match_ids)
+            return len(page_ids)
+
+        statement = select(*self.columns).order_by(Task.created_at.desc(), Task.id.desc())
+        if self._cursor is not None:
+            statement = statement.where(self._after_cursor())
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        with self.session_factory() as session:
+            rows = session.execute(statement).all()
+
+        for row in rows:
+            self.row_cache[row.id] = row
+            self._insert_row(row)
+
+        if rows:
+            self._cursor = (rows[-1].cursor_created_at, rows[-1].id)
+        self.has_more = limit is not None and len(rows) == limit
+        return len(rows)
+
+    def _on_yscroll(self, first, last):
+        """滚动时同步滚动条，接近底部时加载下一页"""
+        self.scrollbar.set(first, last)
+        if self.has_more and not self._load_scheduled and float(last) >= LOAD_MORE_THRESHOLD:
+            self._load_scheduled = True
+            self.tree.after_idle(self.load_next_page)
+
+    def get_row(self, item_id: str):
+        """获取已加载项目对应的查询结果行"""
+        return self.rows.get(item_id)
+
+    def get_item(self, task_id: int) -> Optional[str]:
+        """获取任务对应的 Treeview 项目ID（任务尚未加载时返回 None）"""
+        return self.task_items.get(task_id)
@@ -4,5 +4,9 @@
 """
 
 from .path_helper import get_executable_dir, get_database_path, get_database_url
+from .db_config import get_config_path, get_database_settings
+from .csv_ingest import detect_encoding, read_csv_file
+from .startup_timing import StartupTimer, startup_timer
 
-__all__ = ['get_executable_dir', 'get_database_path', 'get_database_url']
\ No newline at end of file
+__all__ = ['get_executable_dir', 'get_database_path', 'get_database_url', 'get_config_path', 'get_database_settings',
+           'detect_encoding', 'read_csv_file', 'StartupTimer', 'startup_timer']
\ No newline at end of file
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+CSV 读取工具 - 一次读取文件字节，按样本识别编码后只解码、解析一次
+"""
+
+import codecs
+import io
+import mmap
+import os
+
+
+# 超过该大小的文件使用内存映射读取，避免额外复制一份文件内容
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# 编码识别使用的样本大小
+SNIFF_SIZE = 64 * 1024
+
+# 带 BOM 的编码（按 BOM 长度从长到短检查）
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# 无 BOM 时依次尝试的编码：gb18030 兼容 gbk/gb2312/cp936，latin-1 可解码任意字节
+FALLBACK_ENCODINGS = ['utf-8', 'gb18030', 'latin-1']
+
+
+def _sample_decodes(sample, encoding):
+    """样本能否用指定编码解码（样本末尾被截断的多字节字符不算错误）"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        decoder.decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def detect_encoding(data):
+    """
+    根据 BOM 或文件开头的样本识别编码
+
+    Args:
+        data: 文件内容（bytes 或内存映射对象）
+
+    Returns:
+        str: 编码名称
+    """
+    head = bytes(data[:4])
+    for bom, encoding in BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+
+    sample = bytes(data[:SNIFF_SIZE])
+    for encoding in FALLBACK_ENCODINGS:
+        if _sample_decodes(sample, encoding):
+            return encoding
+    return FALLBACK_ENCODINGS[-1]
+
+
+def decode_bytes(data):
+    """
+    解码文件内容：优先使用识别出的编码，样本之后出现无法解码的内容时再依次尝试其他编码
+
+    Returns:
+        tuple: (文本内容, 实际使用的编码)
+    """
+    detected = detect_encoding(data)
+    candidates = [detected] + [encoding for encoding in FALLBACK_ENCODINGS if encoding != detected]
+
+    for encoding in candidates:
+        try:
+            # str() 可直接解码内存映射对象，不需要先复制为 bytes
+            return str(data, encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"无法识别文件编码，已尝试: {', '.join(candidates)}")
+
+
+def read_text_file(file_path):
+    """
+    一次性读取并解码文本文件（大文件使用内存映射）
+
+    Returns:
+        tuple: (文本内容, 编码)
+    """
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        if file_size < MMAP_THRESHOLD:
+            return decode_bytes(f.read())
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode_bytes(mapped)
+
+
+def read_csv_file(file_path, **read_csv_kwargs):
+    """
+    读取 CSV 文件：文件只读取、解码一次，再交给 pandas 解析
+
+    Args:
+        file_path: CSV 文件路径
+        **read_csv_kwargs: 传给 pandas.read_csv 的参数（如 dtype、na_filter）
+
+    Returns:
+        tuple: (DataFrame, 编码)
+    """
+    # pandas 导入耗时较长，只在实际解析 CSV 时导入
+    import pandas as pd
+
+    text, encoding = read_text_file(file_path)
+    df = pd.read_csv(io.StringIO(text), **read_csv_kwargs)
+    return df, encoding
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+启动计时工具 - 记录模块导入、页面创建和首次绘制的耗时，生成启动耗时报告
+"""
+
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+class StartupTimer:
+    """
+    启动计时器
+
+    计时起点为创建实例的时间（即首次导入本模块的时间）。
+    """
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        # 计时记录：(名称, 耗时秒数)
+        self.records: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def measure(self, name: str):
+        """记录代码块的耗时"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append((name, time.perf_counter() - begin))
+
+    def mark(self, name: str) -> float:
+        """记录从计时起点到现在的耗时，返回秒数"""
+        elapsed = time.perf_counter() - self.start_time
+        self.records.append((name, elapsed))
+        return elapsed
+
+    def format_report(self, records: Optional[List[Tuple[str, float]]] = None, title: str = "启动耗时报告") -> str:
+        """将计时记录格式化为文本报告（默认为全部记录）"""
+        records = self.records if records is None else records
+        width = max((len(name) for name, _ in records), default=0)
+        lines = [f"{title}:"]
+        lines.extend(f"  {name.ljust(width)}  {seconds * 1000:8.1f} ms" for name, seconds in records)
+        return "\n".join(lines)
+
+
+# 全局启动计时器
+startup_timer = StartupTimer()